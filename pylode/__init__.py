@@ -1,10 +1,5 @@
-from rdflib.plugin import register, Serializer
-register("json-ld", Serializer, "rdflib_jsonld.serializer", "JsonLDSerializer")
 __version__ = "2.10.0"
 
-from .common import *
-from .profiles import OntDoc, Prof, VocPub, NMPF, PROFILES, RDF_MEDIA_TYPES
-
 __all__ = [
     "__version__",
     "OntDoc",
@@ -15,3 +10,35 @@ __all__ = [
     "RDF_MEDIA_TYPES",
     "MakeDocco"
 ]
+
+# the modules names are imported from, on first use, so that 'import pylode', e.g. for the CLI's -v & -lp, doesn't
+# import rdflib, Jinja2 etc. (PEP 562)
+_LAZY = {
+    "OntDoc": "pylode.profiles",
+    "Prof": "pylode.profiles",
+    "VocPub": "pylode.profiles",
+    "NMPF": "pylode.profiles",
+    "PROFILES": "pylode.profiles",
+    "RDF_MEDIA_TYPES": "pylode.profiles",
+    "MakeDocco": "pylode.common",
+    "get_rdf": "pylode.common",
+    "APP_DIR": "pylode.common",
+    "TEMPLATES_DIR": "pylode.common",
+    "STYLE_DIR": "pylode.common",
+    "RDF_FILE_EXTENSIONS": "pylode.common",
+    "RDF_SERIALIZER_MAP": "pylode.common",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'pylode' has no attribute '{}'".format(name))
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_LAZY.keys()))
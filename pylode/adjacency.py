@@ -0,0 +1,34 @@
+class AdjacencyIndex:
+    """The edges of a graph's nodes, e.g. its Classes & Properties, read from it once, so extracting their details
+    is dictionary reads, not store lookups
+
+    A node's outgoing edges, (predicate, object) pairs, are read in one lookup, the first time they're asked for, and
+    kept in the graph's order, which profiles rely on, e.g. keeping the last of several titles. Incoming edges, the
+    subjects of each object, are read for the given predicates only, in one scan per predicate, when the index is made.
+    """
+    def __init__(self, g, incoming=()):
+        self.g = g
+        self._out = {}  # node -> [(predicate, object), ...]
+        self._in = {}  # predicate -> {object: [subject, ...]}
+        for p in incoming:
+            subjects = self._in[p] = {}
+            for s, o in g.subject_objects(p):
+                if o in subjects:
+                    subjects[o].append(s)
+                else:
+                    subjects[o] = [s]
+
+    def predicate_objects(self, s):
+        """The predicates & objects of all of s' outgoing edges, as G.predicate_objects(s)"""
+        edges = self._out.get(s)
+        if edges is None:
+            edges = self._out[s] = list(self.g.predicate_objects(s))
+        return edges
+
+    def objects(self, s, p):
+        """The objects of s' outgoing p edges, as G.objects(s, p)"""
+        return [o for p2, o in self.predicate_objects(s) if p2 == p]
+
+    def subjects(self, p, o):
+        """The subjects of p edges to o, as G.subjects(p, o). p must be one of the incoming predicates indexed"""
+        return self._in[p].get(o, [])
@@ -0,0 +1,182 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import path
+
+from pylode.common import MakeDocco
+
+
+def _is_url(input_):
+    return input_.startswith("http://") or input_.startswith("https://")
+
+
+def make_jobs(inputs, profiles=("ontdoc",), formats=("html",)):
+    """Makes a batch job, documenting in all the given profiles & formats, for each input file, file glob or URL"""
+    jobs = []
+    for i in inputs:
+        files = sorted(glob.glob(i)) if glob.has_magic(i) and not _is_url(i) else [i]
+        for f in files:
+            jobs.append({"input": f, "profiles": list(profiles), "formats": list(formats)})
+
+    return jobs
+
+
+def load_manifest(manifest_file):
+    """Loads batch jobs from a JSON manifest: a list of {"input": ..., "profiles": [...], "formats": [...]} objects.
+    Inputs may be globs and are relative to the manifest's directory. profiles defaults to ["ontdoc"] and formats to
+    ["html"]"""
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    base_dir = path.dirname(path.abspath(manifest_file))
+    jobs = []
+    for entry in manifest:
+        jobs.extend(make_jobs(
+            [entry["input"] if _is_url(entry["input"]) else path.join(base_dir, entry["input"])],
+            profiles=entry.get("profiles", ["ontdoc"]),
+            formats=entry.get("formats", ["html"]),
+        ))
+
+    return jobs
+
+
+def _output_stem(input_file, output_dir=None):
+    if _is_url(input_file):
+        stem = path.join(output_dir or ".", path.splitext(input_file.split("?")[0].rstrip("/").split("/")[-1])[0])
+    else:
+        stem = path.splitext(input_file)[0]
+    if output_dir is not None:
+        stem = path.join(output_dir, path.basename(stem))
+    return stem
+
+
+def output_file_name(input_file, profile, outputformat, output_dir=None, suffix=""):
+    """Names an output document after its input: x.ttl -> x.html for OntDoc, else x.<profile>.html, e.g.
+    x.vocpub.html. Documents of URLs are named after the URL's last path segment & written to output_dir, or the
+    current directory. suffix, if given, follows the input's name, e.g. x-2.html"""
+    stem = _output_stem(input_file, output_dir) + suffix
+    if profile == "ontdoc":
+        return "{}.{}".format(stem, outputformat)
+    return "{}.{}.{}".format(stem, profile, outputformat)
+
+
+def _disambiguate(jobs, output_dir=None):
+    """Returns the jobs with a suffix for any whose documents would be named the same as an earlier job's, e.g. for
+    a/x.ttl & b/x.ttl with one output_dir, or x.ttl & x.owl, so none overwrites another's: x.html, x-2.html"""
+    used = set()
+    disambiguated = []
+    for job in jobs:
+        stem = path.normcase(path.abspath(_output_stem(job["input"], output_dir)))
+        suffix = ""
+        n = 1
+        while stem + suffix in used:
+            n += 1
+            suffix = "-{}".format(n)
+        used.add(stem + suffix)
+        disambiguated.append(dict(job, suffix=suffix))
+
+    return disambiguated
+
+
+def _run_job(job, output_dir=None, cache_dir=None):
+    """Documents one input in each of its profiles, writing the documents to files. The input is only parsed once.
+    Returns a result per profile. Runs in a worker process"""
+    results = []
+    start = time.perf_counter()
+    try:
+        if _is_url(job["input"]):
+            m = MakeDocco(input_uri=job["input"], cache_dir=cache_dir)
+        else:
+            m = MakeDocco(input_data_file=job["input"], cache_dir=cache_dir)
+    except Exception as e:
+        return [{
+            "input": job["input"],
+            "profile": p,
+            "formats": job["formats"],
+            "outputs": [],
+            "seconds": time.perf_counter() - start,
+            "error": repr(e),
+        } for p in job["profiles"]]
+    parse_seconds = time.perf_counter() - start
+
+    for i, profile in enumerate(job["profiles"]):
+        start = time.perf_counter()
+        result = {"input": job["input"], "profile": profile, "formats": job["formats"], "outputs": [], "error": None}
+        try:
+            docs = m.document_many(formats=job["formats"], profiles=[profile])
+            for (p, fmt), doc in docs.items():
+                output_file = output_file_name(job["input"], p, fmt, output_dir, job.get("suffix", ""))
+                with open(output_file, "w", encoding="utf-8") as f:
+                    f.write(doc)
+                result["outputs"].append(output_file)
+        except Exception as e:
+            result["error"] = repr(e)
+        # the parse is shared by all profiles but attributed to the first
+        result["seconds"] = time.perf_counter() - start + (parse_seconds if i == 0 else 0)
+        results.append(result)
+
+    return results
+
+
+def _input_size(job):
+    try:
+        return path.getsize(job["input"])
+    except OSError:
+        return 0
+
+
+def run_batch(jobs, workers=None, output_dir=None, cache_dir=None, progress=print):
+    """Runs batch jobs, from make_jobs() or load_manifest(), over a pool of worker processes
+
+    :param workers: The number of worker processes. Default is the number of CPUs
+    :param output_dir: The directory to write documents to. Default is each input's directory. Documents that would
+                       be named the same, e.g. those of a/x.ttl & b/x.ttl, are numbered: x.html, x-2.html
+    :param cache_dir: A document cache directory, see MakeDocco
+    :param progress: Called with a line of text as each result is completed, or None for no progress reporting
+    :return: A result per input & profile: input, profile, formats, outputs (file names), seconds & error (or None)
+    :rtype: list of dicts
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # in the order given, so the first of several inputs of the same name keeps it
+    jobs = _disambiguate(jobs, output_dir)
+    # start the largest inputs first, so a big one doesn't start last & leave the other workers idle
+    jobs = sorted(jobs, key=_input_size, reverse=True)
+    total = sum(len(j["profiles"]) for j in jobs)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_job, job, output_dir, cache_dir) for job in jobs]
+        for future in as_completed(futures):
+            for result in future.result():
+                results.append(result)
+                if progress is not None:
+                    progress("[{}/{}] {} {} {} {:.2f}s{}".format(
+                        len(results),
+                        total,
+                        result["input"],
+                        result["profile"],
+                        ",".join(result["formats"]),
+                        result["seconds"],
+                        "" if result["error"] is None else " FAILED: " + result["error"]
+                    ))
+
+    return sorted(results, key=lambda r: (r["input"], r["profile"]))
+
+
+def summarise(results):
+    """A plain text summary of batch results: the slowest documents first, then any failures"""
+    lines = ["{:>8}  {}".format("seconds", "input (profile)")]
+    for r in sorted(results, key=lambda r: r["seconds"], reverse=True):
+        lines.append("{:8.2f}  {} ({})".format(r["seconds"], r["input"], r["profile"]))
+
+    failures = [r for r in results if r["error"] is not None]
+    lines.append("")
+    lines.append("{} documented, {} failed, {:.2f}s total".format(
+        len(results) - len(failures), len(failures), sum(r["seconds"] for r in results)))
+    for r in failures:
+        lines.append("FAILED {} ({}): {}".format(r["input"], r["profile"], r["error"]))
+
+    return "\n".join(lines)
@@ -0,0 +1,4 @@
+"""Benchmarks of pyLODE's performance: see suite.py, and synth.py for generated ontologies of any size
+
+Run with 'python -m pylode.bench -h'.
+"""
@@ -0,0 +1,116 @@
+import argparse
+import sys
+from sys import exit
+
+from pylode.bench.suite import (
+    SYNTH_SIZES, PROFILE_FORMATS, example_cases, synth_cases, run_suite, compare, save_results, load_results
+)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pylode.bench",
+        description="Benchmark pyLODE: the wall time & peak memory of parsing, preparing (expanding the graph & "
+                    "extracting the model) and rendering, for each RDF source, profile & format",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-s",
+        "--suites",
+        help="The suites to run: the bundled example ontologies and/or synthetic ontologies, vocabularies & profiles.",
+        nargs="+",
+        choices=["examples", "synth"],
+        default=["examples", "synth"],
+    )
+    parser.add_argument(
+        "-e",
+        "--examples",
+        help="The example files to benchmark, e.g. om.ttl. Default is all of them.",
+        nargs="+",
+        default=None,
+    )
+    parser.add_argument(
+        "-n",
+        "--sizes",
+        help="The numbers of terms in the synthetic ontologies, vocabularies & profiles.",
+        nargs="+",
+        type=int,
+        default=SYNTH_SIZES,
+    )
+    parser.add_argument(
+        "-p",
+        "--profiles",
+        help="The profiles to benchmark. Default is every profile that applies to each source.",
+        nargs="+",
+        choices=list(PROFILE_FORMATS.keys()),
+        default=None,
+    )
+    parser.add_argument(
+        "-f",
+        "--outputformats",
+        help="The output formats to benchmark. Default is every format of each profile.",
+        nargs="+",
+        choices=["html", "md", "adoc"],
+        default=None,
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        help="The number of timed runs of each benchmark, of which the fastest is recorded.",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--no-memory",
+        help="Don't measure peak memory, which takes a separate, much slower, run of each benchmark.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="A file to save the results to, as JSON, e.g. to use as a baseline later.",
+        default=None,
+    )
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        help="A results file to compare with. Regressions are listed and the exit code is 1 if there are any.",
+        default=None,
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        help="The ratio of a phase's time, or peak memory, to its baseline's above which it's a regression.",
+        type=float,
+        default=1.25,
+    )
+    args = parser.parse_args(args)
+
+    cases = []
+    if "examples" in args.suites:
+        cases += example_cases(names=args.examples, profiles=args.profiles, formats=args.outputformats)
+    if "synth" in args.suites:
+        cases += synth_cases(sizes=args.sizes, profiles=args.profiles, formats=args.outputformats)
+
+    results = run_suite(cases, repeat=args.repeat, measure_memory=not args.no_memory)
+
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if args.baseline is not None:
+        regressions = compare(load_results(args.baseline), results, threshold=args.threshold)
+        for case_id, phase, metric, before, after in regressions:
+            if metric == "error":
+                print("REGRESSION {}: {}".format(case_id, after))
+            elif metric == "time":
+                print("REGRESSION {} {} time: {:.3f}s -> {:.3f}s".format(case_id, phase, before, after))
+            else:
+                print("REGRESSION {} {} peak memory: {:.1f}MB -> {:.1f}MB".format(
+                    case_id, phase, before / 2 ** 20, after / 2 ** 20))
+        print("{} regressions against {}".format(len(regressions), args.baseline))
+        if len(regressions) > 0:
+            exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
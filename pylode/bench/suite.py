@@ -0,0 +1,211 @@
+import glob
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from os import path
+from rdflib import Graph, util
+from rdflib.namespace import OWL, PROF, RDF, SKOS
+
+from pylode import __version__
+from pylode.common import APP_DIR
+from pylode.profiles import OntDoc, NMPF, VocPub, Prof
+from pylode.bench.synth import make_ontology, make_vocabulary, make_profile
+
+EXAMPLES_DIR = path.join(APP_DIR, "examples")
+SYNTH_SIZES = [1000, 10000, 100000]
+PROFILE_CLASSES = {"ontdoc": OntDoc, "nmpf": NMPF, "vocpub": VocPub, "prof": Prof}
+# the output formats each profile has templates for
+PROFILE_FORMATS = {
+    "ontdoc": ["html", "md", "adoc"],
+    "nmpf": ["html", "md"],
+    "vocpub": ["html", "md"],
+    "prof": ["html", "md"],
+}
+PHASES = ["parse", "prepare", "render"]
+
+
+def applicable_profiles(g):
+    """The profiles that can document a graph: OWL for OntDoc & NMPF, SKOS for VocPub, PROF for Prof"""
+    profiles = []
+    if (None, RDF.type, OWL.Ontology) in g or (None, RDF.type, OWL.Class) in g:
+        profiles += ["ontdoc", "nmpf"]
+    if (None, RDF.type, SKOS.ConceptScheme) in g:
+        profiles.append("vocpub")
+    if (None, RDF.type, PROF.Profile) in g:
+        profiles.append("prof")
+    return profiles
+
+
+class Case:
+    """A benchmark: documenting one RDF source with one profile in one format"""
+    def __init__(self, source, data, rdf_format, profile, outputformat):
+        self.source = source
+        self.data = data  # RDF text, so parsing can be timed
+        self.rdf_format = rdf_format
+        self.profile = profile
+        self.outputformat = outputformat
+
+    @property
+    def id(self):
+        return "{}:{}:{}".format(self.source, self.profile, self.outputformat)
+
+
+def _filter(profiles, formats, profile, outputformat):
+    return (profiles is None or profile in profiles) and (formats is None or outputformat in formats)
+
+
+def example_cases(names=None, profiles=None, formats=None):
+    """Cases for the bundled example ontologies, all of them or those named, with every profile that applies to
+    each and every format those profiles make"""
+    files = sorted(glob.glob(path.join(EXAMPLES_DIR, "*.ttl")))
+    if names is not None:
+        files = [f for f in files if path.basename(f) in names]
+
+    cases = []
+    for f in files:
+        with open(f, encoding="utf-8") as fh:
+            data = fh.read()
+        rdf_format = util.guess_format(f)
+        for profile in applicable_profiles(Graph().parse(data=data, format=rdf_format)):
+            for outputformat in PROFILE_FORMATS[profile]:
+                if _filter(profiles, formats, profile, outputformat):
+                    cases.append(Case(path.basename(f), data, rdf_format, profile, outputformat))
+    return cases
+
+
+def synth_cases(sizes=SYNTH_SIZES, profiles=None, formats=None):
+    """Cases for synthetic ontologies, documented with OntDoc & NMPF, vocabularies, documented with VocPub, and
+    profiles, documented with Prof, of each number of terms in sizes"""
+    cases = []
+    for n in sizes:
+        for name, make, synth_profiles in [
+            ("synth-ontology-{}".format(n), make_ontology, ["ontdoc", "nmpf"]),
+            ("synth-vocabulary-{}".format(n), make_vocabulary, ["vocpub"]),
+            ("synth-profile-{}".format(n), make_profile, ["prof"]),
+        ]:
+            wanted = [
+                (p, f) for p in synth_profiles for f in PROFILE_FORMATS[p] if _filter(profiles, formats, p, f)
+            ]
+            if len(wanted) > 0:
+                data = make(n).serialize(format="nt")
+                for p, f in wanted:
+                    cases.append(Case(name, data, "nt", p, f))
+    return cases
+
+
+def _run_phases(case, measure_memory):
+    """Runs a case once, returning each phase's wall time or, if measure_memory, its peak memory allocation"""
+    results = {}
+
+    def phase(name, fn):
+        if measure_memory:
+            tracemalloc.start()
+            value = fn()
+            results[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            value = fn()
+            results[name] = time.perf_counter() - start
+        return value
+
+    g = phase("parse", lambda: Graph().parse(data=case.data, format=case.rdf_format))
+
+    def prepare():
+        p = PROFILE_CLASSES[case.profile](
+            g,
+            (case.source, case.rdf_format),
+            outputformat=case.outputformat,
+            default_language="en",
+        )
+        p._prepare()
+        return p
+    p = phase("prepare", prepare)
+    phase("render", p.generate_document)
+
+    return results
+
+
+def run_case(case, repeat=3, measure_memory=True):
+    """Benchmarks a case: the wall time of each phase is the fastest of repeat runs. Peak memory is measured, with
+    tracemalloc, in a separate run as tracing slows everything down, unless measure_memory is False
+
+    :return: {"phases": {phase: {"time": seconds, "peak": bytes or None}}, "time": seconds} or {"error": message}
+    :rtype: dict
+    """
+    try:
+        times = [_run_phases(case, False) for _ in range(repeat)]
+        peaks = _run_phases(case, True) if measure_memory else {ph: None for ph in PHASES}
+    except Exception as e:
+        return {"error": "{}: {}".format(type(e).__name__, e)}
+
+    phases = {ph: {"time": min(t[ph] for t in times), "peak": peaks[ph]} for ph in PHASES}
+    return {"phases": phases, "time": sum(v["time"] for v in phases.values())}
+
+
+def _describe(result):
+    if "error" in result:
+        return "ERROR {}".format(result["error"])
+
+    s = "{:.3f}s".format(result["time"])
+    for ph, v in result["phases"].items():
+        s += " {} {:.3f}s".format(ph, v["time"])
+        if v["peak"] is not None:
+            s += " {:.1f}MB".format(v["peak"] / 2 ** 20)
+    return s
+
+
+def run_suite(cases, repeat=3, measure_memory=True, progress=print):
+    """Runs benchmark cases, returning the results with details of the environment they were run in"""
+    results = {}
+    for case in cases:
+        results[case.id] = run_case(case, repeat=repeat, measure_memory=measure_memory)
+        if progress is not None:
+            progress("{} {}".format(case.id, _describe(results[case.id])))
+    return {
+        "pylode_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=1.25, min_time=0.01):
+    """Compares results with a baseline's, returning the regressions: phases of cases that take more than threshold
+    times the time, or peak memory, they did. Phases taking under min_time seconds are too noisy to compare for time
+
+    :return: (case id, phase, "time" or "peak", baseline value, current value) for each regression
+    :rtype: list of tuples
+    """
+    regressions = []
+    for case_id, result in sorted(current["results"].items()):
+        base = baseline["results"].get(case_id)
+        if base is None or "error" in base:
+            continue
+        if "error" in result:
+            regressions.append((case_id, None, "error", None, result["error"]))
+            continue
+        for ph, values in result["phases"].items():
+            base_values = base["phases"].get(ph)
+            if base_values is None:
+                continue
+            if base_values["time"] >= min_time and values["time"] > base_values["time"] * threshold:
+                regressions.append((case_id, ph, "time", base_values["time"], values["time"]))
+            if base_values["peak"] and values["peak"] is not None and \
+                    values["peak"] > base_values["peak"] * threshold:
+                regressions.append((case_id, ph, "peak", base_values["peak"], values["peak"]))
+    return regressions
+
+
+def save_results(results, file_path):
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(file_path):
+    with open(file_path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,315 @@
+"""Generates reproducible OWL ontologies, SKOS vocabularies & PROF profiles of any size, for benchmarking
+
+Each generator takes the numbers of each kind of thing to make, the languages to label them in and the number of
+namespaces to spread them over, or just a total number of terms, n_terms, which is split between the kinds in fixed
+proportions. The same arguments & seed always make the same graph.
+
+Run with 'python -m pylode.bench.synth -h' to write one to a file.
+"""
+import argparse
+import random
+import sys
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import DCTERMS, OWL, PROF, RDF, RDFS, SDO, SKOS, XSD
+
+EX = Namespace("http://example.org/synth/")
+ROLE = Namespace("http://www.w3.org/ns/dx/prof/role/")
+
+PROPERTY_TYPES = [OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, OWL.FunctionalProperty]
+DATATYPES = [XSD.string, XSD.integer, XSD.decimal, XSD.boolean, XSD.date, XSD.anyURI]
+RESTRICTION_TYPES = [
+    OWL.someValuesFrom,
+    OWL.allValuesFrom,
+    OWL.hasValue,
+    OWL.minCardinality,
+    OWL.maxCardinality,
+    OWL.qualifiedCardinality,
+]
+ROLES = [ROLE.specification, ROLE.guidance, ROLE.validation, ROLE.example, ROLE.vocabulary, ROLE.schema]
+FORMATS = ["text/html", "text/turtle", "application/pdf", "application/ld+json"]
+
+
+def _namespaces(g, namespaces):
+    """Binds & returns the namespaces to spread terms over: EX, then EX's sub-namespaces ns1/, ns2/ etc.
+
+    All are bound so that pyLODE never has to look their prefixes up online.
+    """
+    nss = [EX] + [Namespace("{}ns{}/".format(EX, i)) for i in range(1, max(1, namespaces))]
+    g.bind("ex", EX)
+    for i, ns in enumerate(nss[1:], start=1):
+        g.bind("ex{}".format(i), ns)
+    return nss
+
+
+def _term(nss, name, i):
+    return nss[i % len(nss)]["{}{}".format(name, i)]
+
+
+def _label(g, s, p, text, languages):
+    """Adds text as the value of s' p in each language, marked with the language for all but the first"""
+    for j, lang in enumerate(languages):
+        g.add((s, p, Literal(text if j == 0 else "{} ({})".format(text, lang), lang=lang)))
+
+
+def _split(n_terms, given, proportions):
+    """The counts of each kind of thing: those given or, for those not, their proportion of n_terms"""
+    return {k: given[k] if given[k] is not None else int(n_terms * v) for k, v in proportions.items()}
+
+
+def make_ontology(
+    n_terms=100,
+    seed=0,
+    classes=None,
+    properties=None,
+    restrictions=None,
+    collections=None,
+    individuals=None,
+    languages=("en",),
+    namespaces=1,
+):
+    """Returns a reproducible OWL ontology, for benchmarking
+
+    Classes are in a random hierarchy. Properties are, in turn, Object, Datatype, Annotation & Functional ones, all
+    but Annotation ones with a domain & range. Restrictions, of each kind in turn, are on random Classes' Properties.
+    Collections alternate between owl:unionOf & owl:intersectionOf lists of Classes, equivalent to a Class or the range
+    of an Object Property. Named Individuals each have a Class. Every term has a label & description in each language.
+
+    Any number not given is its share of n_terms: 20% properties, 10% individuals, the rest classes, and restrictions
+    & collections of 6.5% & 3.25%, so that make_ontology(n) has n terms (Classes, Properties & Named Individuals).
+    """
+    n = _split(
+        n_terms,
+        {
+            "properties": properties,
+            "restrictions": restrictions,
+            "collections": collections,
+            "individuals": individuals,
+        },
+        {"properties": 0.2, "restrictions": 0.065, "collections": 0.0325, "individuals": 0.1},
+    )
+    # Properties, Restrictions etc. need a Class
+    n["classes"] = max(1, classes if classes is not None else n_terms - n["properties"] - n["individuals"])
+    rnd = random.Random(seed)
+    g = Graph()
+    nss = _namespaces(g, namespaces)
+    ont = URIRef(str(EX))
+    g.add((ont, RDF.type, OWL.Ontology))
+    _label(g, ont, DCTERMS.title, "Synthetic Ontology", languages)
+    _label(g, ont, DCTERMS.description, "A generated ontology for benchmarking pyLODE.", languages)
+
+    classes = [_term(nss, "Class", i) for i in range(n["classes"])]
+    properties = [_term(nss, "property", i) for i in range(n["properties"])]
+    individuals = [_term(nss, "individual", i) for i in range(n["individuals"])]
+
+    for i, c in enumerate(classes):
+        g.add((c, RDF.type, OWL.Class))
+        _label(g, c, RDFS.label, "Class {}".format(i), languages)
+        _label(g, c, DCTERMS.description, "The description of Class {}.".format(i), languages)
+        if i > 0:
+            g.add((c, RDFS.subClassOf, classes[rnd.randrange(i)]))
+
+    object_properties = []
+    for i, p in enumerate(properties):
+        prop_type = PROPERTY_TYPES[i % len(PROPERTY_TYPES)]
+        g.add((p, RDF.type, prop_type))
+        _label(g, p, RDFS.label, "property {}".format(i), languages)
+        _label(g, p, DCTERMS.description, "The description of property {}.".format(i), languages)
+        if prop_type == OWL.FunctionalProperty:
+            g.add((p, RDF.type, OWL.ObjectProperty))
+        if prop_type in [OWL.ObjectProperty, OWL.FunctionalProperty]:
+            object_properties.append(p)
+            g.add((p, RDFS.domain, rnd.choice(classes)))
+            g.add((p, RDFS.range, rnd.choice(classes)))
+        elif prop_type == OWL.DatatypeProperty:
+            g.add((p, RDFS.domain, rnd.choice(classes)))
+            g.add((p, RDFS.range, rnd.choice(DATATYPES)))
+
+    for i, ni in enumerate(individuals):
+        g.add((ni, RDF.type, OWL.NamedIndividual))
+        g.add((ni, RDF.type, rnd.choice(classes)))
+        _label(g, ni, RDFS.label, "individual {}".format(i), languages)
+
+    restricted = object_properties or properties
+    for i in range(n["restrictions"] if len(restricted) > 0 else 0):
+        r = BNode()
+        g.add((r, RDF.type, OWL.Restriction))
+        g.add((r, OWL.onProperty, rnd.choice(restricted)))
+        restriction_type = RESTRICTION_TYPES[i % len(RESTRICTION_TYPES)]
+        if restriction_type == OWL.hasValue and len(individuals) == 0:
+            restriction_type = OWL.someValuesFrom
+        if restriction_type in [OWL.someValuesFrom, OWL.allValuesFrom]:
+            g.add((r, restriction_type, rnd.choice(classes)))
+        elif restriction_type == OWL.hasValue:
+            g.add((r, restriction_type, rnd.choice(individuals)))
+        else:
+            g.add((r, restriction_type, Literal(rnd.randint(1, 3), datatype=XSD.nonNegativeInteger)))
+            if restriction_type == OWL.qualifiedCardinality:
+                g.add((r, OWL.onClass, rnd.choice(classes)))
+        g.add((rnd.choice(classes), RDFS.subClassOf, r))
+
+    for i in range(n["collections"]):
+        col = BNode()
+        members = rnd.sample(classes, min(len(classes), rnd.randint(2, 4)))
+        lst = BNode()
+        Collection(g, lst, members)
+        g.add((col, OWL.unionOf if i % 2 == 0 else OWL.intersectionOf, lst))
+        if i % 4 < 2 or len(object_properties) == 0:
+            g.add((rnd.choice(classes), OWL.equivalentClass, col))
+        else:
+            g.add((rnd.choice(object_properties), RDFS.range, col))
+
+    return g
+
+
+def make_vocabulary(
+    n_terms=100,
+    seed=0,
+    concepts=None,
+    collections=None,
+    top_concepts=None,
+    languages=("en",),
+    namespaces=1,
+):
+    """Returns a reproducible SKOS vocabulary, for benchmarking
+
+    The Concepts not top Concepts of the ConceptScheme are in a random hierarchy below them. Collections each have a
+    random few Concepts as members. Every Concept & Collection has a preferred label & definition in each language.
+
+    Any number not given is its share of n_terms: all Concepts, of which 1% are top Concepts, and no Collections, so
+    that make_vocabulary(n) has n Concepts.
+    """
+    n = _split(
+        n_terms,
+        {"concepts": concepts, "collections": collections},
+        {"concepts": 1, "collections": 0},
+    )
+    n_top = top_concepts if top_concepts is not None else max(1, n["concepts"] // 100)
+    rnd = random.Random(seed)
+    g = Graph()
+    nss = _namespaces(g, namespaces)
+    cs = EX["vocab"]
+    g.add((cs, RDF.type, SKOS.ConceptScheme))
+    _label(g, cs, SKOS.prefLabel, "Synthetic Vocabulary", languages)
+    _label(g, cs, SKOS.definition, "A generated vocabulary for benchmarking pyLODE.", languages)
+
+    concepts = [_term(nss, "concept", i) for i in range(n["concepts"])]
+    for i, c in enumerate(concepts):
+        g.add((c, RDF.type, SKOS.Concept))
+        g.add((c, SKOS.inScheme, cs))
+        _label(g, c, SKOS.prefLabel, "Concept {}".format(i), languages)
+        _label(g, c, SKOS.definition, "The definition of Concept {}.".format(i), languages)
+        if i < max(1, n_top):
+            g.add((cs, SKOS.hasTopConcept, c))
+            g.add((c, SKOS.topConceptOf, cs))
+        else:
+            parent = concepts[rnd.randrange(i)]
+            g.add((c, SKOS.broader, parent))
+            g.add((parent, SKOS.narrower, c))
+
+    for i in range(n["collections"]):
+        col = _term(nss, "collection", i)
+        g.add((col, RDF.type, SKOS.Collection))
+        _label(g, col, SKOS.prefLabel, "Collection {}".format(i), languages)
+        _label(g, col, SKOS.definition, "The definition of Collection {}.".format(i), languages)
+        for c in rnd.sample(concepts, min(len(concepts), rnd.randint(2, 10))):
+            g.add((col, SKOS.member, c))
+
+    return g
+
+
+def make_profile(n_terms=10, seed=0, resources=None, languages=("en",), namespaces=1):
+    """Returns a reproducible PROF Profile with Resource Descriptors, for benchmarking
+
+    Each Resource Descriptor has, in turn, one of a few roles & formats, an artifact, the standard it conforms to and a
+    label & description in each language. Any number not given is n_terms: make_profile(n) has n Resource Descriptors.
+    """
+    n = _split(n_terms, {"resources": resources}, {"resources": 1})
+    rnd = random.Random(seed)
+    g = Graph()
+    nss = _namespaces(g, namespaces)
+    g.bind("prof", PROF)
+    g.bind("role", ROLE)
+    profile = EX["profile"]
+    org = EX["org"]
+    g.add((profile, RDF.type, PROF.Profile))
+    _label(g, profile, SKOS.prefLabel, "Synthetic Profile", languages)
+    _label(g, profile, SKOS.definition, "A generated profile for benchmarking pyLODE.", languages)
+    g.add((profile, DCTERMS.created, Literal("2020-01-01", datatype=XSD.date)))
+    g.add((profile, DCTERMS.creator, org))
+    g.add((profile, DCTERMS.publisher, org))
+    g.add((profile, PROF.isProfileOf, URIRef("https://www.w3.org/TR/skos-reference/")))
+    g.add((org, RDF.type, SDO.Organization))
+    g.add((org, SDO.name, Literal("Synthetic Organisation")))
+
+    for i in range(n["resources"]):
+        rd = _term(nss, "resource", i)
+        g.add((profile, PROF.hasResource, rd))
+        g.add((rd, RDF.type, PROF.ResourceDescriptor))
+        _label(g, rd, SKOS.prefLabel, "Resource {}".format(i), languages)
+        _label(g, rd, DCTERMS.description, "The description of Resource {}.".format(i), languages)
+        g.add((rd, PROF.hasRole, ROLES[i % len(ROLES)]))
+        g.add((rd, DCTERMS.format, Literal(FORMATS[i % len(FORMATS)])))
+        g.add((rd, PROF.hasArtifact, URIRef("{}artifacts/{}".format(EX, i))))
+        g.add((rd, DCTERMS.conformsTo, URIRef("https://example.org/standard/{}".format(rnd.randrange(10)))))
+
+    return g
+
+
+GENERATORS = {"ontology": make_ontology, "vocabulary": make_vocabulary, "profile": make_profile}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pylode.bench.synth",
+        description="Generate a reproducible synthetic OWL ontology, SKOS vocabulary or PROF profile, for "
+                    "benchmarking pyLODE. Counts not given are shares of the number of terms.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("kind", help="What to generate.", choices=list(GENERATORS.keys()))
+    parser.add_argument("-n", "--terms", help="The number of terms.", type=int, default=100)
+    parser.add_argument("--seed", help="The random seed.", type=int, default=0)
+    for count, kinds in [
+        ("classes", "ontology"),
+        ("properties", "ontology"),
+        ("restrictions", "ontology"),
+        ("collections", "ontology & vocabulary"),
+        ("individuals", "ontology"),
+        ("concepts", "vocabulary"),
+        ("top-concepts", "vocabulary"),
+        ("resources", "profile"),
+    ]:
+        parser.add_argument(
+            "--" + count, help="The number of {} ({} only).".format(count.replace("-", " "), kinds), type=int
+        )
+    parser.add_argument("-l", "--languages", help="The languages of labels.", nargs="+", default=["en"])
+    parser.add_argument("--namespaces", help="The number of namespaces to spread terms over.", type=int, default=1)
+    parser.add_argument("-f", "--format", help="The RDF format to write.", default="turtle")
+    parser.add_argument("-o", "--output", help="A file to write to. Default is stdout.", default=None)
+    args = parser.parse_args(args)
+
+    counts = {
+        "ontology": ["classes", "properties", "restrictions", "collections", "individuals"],
+        "vocabulary": ["concepts", "collections", "top_concepts"],
+        "profile": ["resources"],
+    }[args.kind]
+    for k in ["classes", "properties", "restrictions", "collections", "individuals", "concepts", "top_concepts",
+              "resources"]:
+        if getattr(args, k) is not None and k not in counts:
+            parser.error("--{} doesn't apply to a {}".format(k.replace("_", "-"), args.kind))
+
+    g = GENERATORS[args.kind](
+        args.terms,
+        seed=args.seed,
+        languages=args.languages,
+        namespaces=args.namespaces,
+        **{k: getattr(args, k) for k in counts}
+    )
+    if args.output is not None:
+        g.serialize(destination=args.output, format=args.format)
+    else:
+        sys.stdout.write(g.serialize(format=args.format))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,173 @@
+import hashlib
+import os
+from os import path
+
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024  # bytes
+CACHE_FILE_EXTENSION = ".doc"
+
+
+class _CyclicBNodes(Exception):
+    pass
+
+
+def _term_hash(g, term, bnode_hashes):
+    """Hashes a term. A Blank Node is hashed by its properties, those of any Blank Nodes it has as objects included,
+    so the hash doesn't depend on its ID
+
+    Blank Nodes are hashed bottom-up from an explicit stack, not recursively, so long RDF lists, which nest a Blank
+    Node per member, can be hashed.
+    """
+    from rdflib import BNode
+
+    if type(term) != BNode:
+        return term.n3()
+
+    stack = [term]
+    visiting = set()  # the Blank Nodes whose objects are being hashed, i.e. the path to the top of the stack
+    while len(stack) > 0:
+        node = stack[-1]
+        if node in bnode_hashes:
+            stack.pop()
+        elif node not in visiting:
+            visiting.add(node)
+            for o in g.objects(node):
+                if type(o) == BNode and o not in bnode_hashes:
+                    if o in visiting:
+                        raise _CyclicBNodes()
+                    stack.append(o)
+        else:
+            # all its Blank Node objects are hashed now
+            bnode_hashes[node] = hashlib.sha256(
+                "\n".join(sorted(
+                    p.n3() + " " + (o.n3() if type(o) != BNode else "_:" + bnode_hashes[o])
+                    for p, o in g.predicate_objects(node)
+                )).encode()
+            ).hexdigest()
+            visiting.discard(node)
+            stack.pop()
+
+    return "_:" + bnode_hashes[term]
+
+
+def graph_hash(g):
+    """Returns a canonical hash of a graph's triples: isomorphic graphs - ones only differing in Blank Node IDs or
+    triple order - have the same hash
+
+    Triples with Blank Node subjects are covered by their Blank Node's hash. Blank Nodes in cycles can't be hashed this
+    way, nor reached at all if only other Blank Nodes have them as objects, so, if there are any, the slower rdflib
+    canonicalisation is used instead
+    """
+    from rdflib import BNode
+    from rdflib.compare import to_canonical_graph
+
+    bnode_hashes = {}
+    bnode_subjects = set()
+    try:
+        lines = []
+        for s, p, o in g:
+            if type(s) == BNode:
+                bnode_subjects.add(s)
+                # only top-level Blank Nodes, not ones within others, get their own line
+                if (None, None, s) not in g:
+                    lines.append(_term_hash(g, s, bnode_hashes))
+            else:
+                lines.append(" ".join([s.n3(), p.n3(), _term_hash(g, o, bnode_hashes)]))
+        if any(s not in bnode_hashes for s in bnode_subjects):
+            raise _CyclicBNodes()
+    except _CyclicBNodes:
+        lines = to_canonical_graph(g).serialize(format="nt").splitlines()
+
+    h = hashlib.sha256()
+    for line in sorted(lines):
+        h.update(line.encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class DocumentCache:
+    """An on-disk cache of generated documents, keyed by the hash of their RDF & the options used to make them
+
+    The least recently used documents are evicted once the cache is larger than max_size bytes.
+    """
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(digest, **options):
+        """Makes a cache key from a graph's graph_hash() and the options, e.g. profile, used to document it"""
+        from pylode import __version__
+
+        h = hashlib.sha256(digest.encode())
+        for k, v in sorted(options.items()):
+            h.update("\n{}={}".format(k, v).encode())
+        h.update("\npylode={}".format(__version__).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return path.join(self.cache_dir, key + CACHE_FILE_EXTENSION)
+
+    def _entries(self):
+        """Returns (path, size, last use time) for each cached document"""
+        entries = []
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(CACHE_FILE_EXTENSION):
+                try:
+                    st = os.stat(path.join(self.cache_dir, f))
+                except FileNotFoundError:  # removed by another process
+                    continue
+                entries.append((path.join(self.cache_dir, f), st.st_size, st.st_mtime))
+        return entries
+
+    def get(self, key):
+        """Returns a cached document, or None if it isn't cached"""
+        p = self._path(key)
+        try:
+            with open(p, encoding="utf-8") as f:
+                doc = f.read()
+        except FileNotFoundError:
+            return None
+
+        # record the use, for LRU eviction
+        os.utime(p)
+        return doc
+
+    def put(self, key, doc):
+        p = self._path(key)
+        # write then rename so a concurrent get() never sees a partial document
+        tmp = "{}.{}.tmp".format(p, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(doc)
+        os.replace(tmp, p)
+        self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(e[1] for e in entries)
+        while total > self.max_size and len(entries) > 0:
+            p, size, _ = entries.pop(0)
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "cache_dir": self.cache_dir,
+            "entries": len(entries),
+            "size": sum(e[1] for e in entries),
+            "max_size": self.max_size,
+        }
+
+    def clear(self):
+        """Removes all cached documents and returns how many there were"""
+        entries = self._entries()
+        for p, _, _ in entries:
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        return len(entries)
@@ -4,6 +4,8 @@ import sys
 from os.path import dirname, realpath
 sys.path.insert(0, dirname(dirname(realpath(__file__))))
 from pylode import RDF_FILE_EXTENSIONS, MakeDocco
+from pylode.cache import DocumentCache, DEFAULT_MAX_SIZE
+import json
 import logging
 
 
@@ -27,7 +29,121 @@ class RdfGraphError(Exception):
     pass
 
 
+def cache_main(args):
+    parser = argparse.ArgumentParser(
+        prog="pylode cache",
+        description="Show statistics for, or clear, a pyLODE document cache",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "action",
+        help="'stats' to show the number & total size of cached documents, 'clear' to remove them all",
+        choices=["stats", "clear"],
+    )
+    parser.add_argument(
+        "-cd",
+        "--cachedir",
+        help="The document cache directory.",
+        required=True,
+    )
+    args = parser.parse_args(args)
+
+    cache = DocumentCache(args.cachedir)
+    if args.action == "stats":
+        stats = cache.stats()
+        print("Cache directory: {}".format(stats["cache_dir"]))
+        print("Documents: {}".format(stats["entries"]))
+        print("Size: {:.1f} MB".format(stats["size"] / (1024 * 1024)))
+    else:
+        print("Removed {} cached documents".format(cache.clear()))
+
+
+def batch_main(args):
+    from pylode.batch import make_jobs, load_manifest, run_batch, summarise
+
+    parser = argparse.ArgumentParser(
+        prog="pylode batch",
+        description="Document many RDF files, in several profiles & formats, in parallel",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "inputs",
+        help="RDF files, or globs of them such as 'ontologies/*.ttl', to document.",
+        nargs="*",
+    )
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        help="A JSON file listing the inputs to document, as objects with an 'input' file or glob and optional "
+             "'profiles' & 'formats' lists. Inputs are relative to the manifest's directory.",
+        default=None,
+    )
+    parser.add_argument(
+        "-p",
+        "--profiles",
+        help="The profiles to document the inputs with.",
+        nargs="+",
+        default=["ontdoc"],
+    )
+    parser.add_argument(
+        "-f",
+        "--outputformats",
+        help="The output formats to make.",
+        nargs="+",
+        choices=["html", "md", "adoc"],
+        default=["html"],
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="The number of worker processes. Default is the number of CPUs.",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-od",
+        "--outputdir",
+        help="The directory to write documents to. Default is each input file's directory.",
+        default=None,
+    )
+    parser.add_argument(
+        "-cd",
+        "--cachedir",
+        help="A document cache directory. See 'pylode -h'.",
+        default=None,
+    )
+    parser.add_argument(
+        "-s",
+        "--summary",
+        help="A file to write per-document timings & failures to, as JSON.",
+        default=None,
+    )
+    args = parser.parse_args(args)
+
+    jobs = make_jobs(args.inputs, profiles=args.profiles, formats=args.outputformats)
+    if args.manifest is not None:
+        jobs.extend(load_manifest(args.manifest))
+    if len(jobs) == 0:
+        parser.error("No inputs given: supply input files or globs and/or a manifest (-m)")
+
+    results = run_batch(jobs, workers=args.workers, output_dir=args.outputdir, cache_dir=args.cachedir)
+    print(summarise(results))
+
+    if args.summary is not None:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if any(r["error"] is not None for r in results):
+        exit(1)
+
+
 def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    if len(args) > 0 and args[0] == "cache":
+        return cache_main(args[1:])
+    if len(args) > 0 and args[0] == "batch":
+        return batch_main(args[1:])
+
     # read the input ontology file into a graph
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     overarching_group = parser.add_mutually_exclusive_group()
@@ -120,6 +236,39 @@ def main(args=None):
         default="en",
     )
 
+    parser.add_argument(
+        "-cd",
+        "--cachedir",
+        help="A directory in which to cache documents. The cached document is reused if the same RDF is documented "
+             "again with the same options. See 'pylode cache -h' to show statistics for, or clear, the cache.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "-cm",
+        "--cachemaxsize",
+        help="The size, in MB, above which the least recently used documents are removed from the cache.",
+        type=int,
+        default=DEFAULT_MAX_SIZE // (1024 * 1024),
+    )
+
+    parser.add_argument(
+        "-inc",
+        "--incremental",
+        help="A directory in which to keep each entity's rendered fragment between runs, so only the entities that "
+             "have changed since the RDF was last documented are rendered again.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--timings",
+        help="Report the wall time, call counts (templates, SPARQL queries & graph lookups) and peak memory of each "
+             "phase of documenting, as JSON, to this file or, if no file is given, to stderr.",
+        nargs="?",
+        const="-",
+        default=None,
+    )
+
     parser.add_argument(
         "-v",
         "--version",
@@ -127,7 +276,7 @@ def main(args=None):
         action="store_true"
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(args)
 
     if args.loglevel:
         if args.loglevel == "debug":
@@ -169,6 +318,10 @@ def main(args=None):
                 language=args.language,
                 use_curies_stored=use_curies_stored,
                 get_curies_online=get_curies_online,
+                cache_dir=args.cachedir,
+                cache_max_size=args.cachemaxsize * 1024 * 1024,
+                fragments_dir=args.incremental,
+                instrument=args.timings is not None,
             )
         elif args.url:
             logger.log(logging.DEBUG, f"args.url: {args.url.name}")
@@ -180,6 +333,10 @@ def main(args=None):
                 language=args.language,
                 use_curies_stored=use_curies_stored,
                 get_curies_online=get_curies_online,
+                cache_dir=args.cachedir,
+                cache_max_size=args.cachemaxsize * 1024 * 1024,
+                fragments_dir=args.incremental,
+                instrument=args.timings is not None,
             )
         else:
             # we have neither an input file or a URI supplied
@@ -207,8 +364,19 @@ def main(args=None):
         h.document(destination=output_file_name)
 
         print("Finished. {} documentation in {}".format(args.profile, output_file_name))
+        if args.incremental is not None:
+            print("Rendered {rendered} entities, reused {reused} unchanged ones".format(**h.fragment_stats))
     else:
-        print(h.document())
+        # stream to stdout, so output starts before the whole document is made
+        h.document(destination=sys.stdout)
+        print()
+
+    if args.timings is not None:
+        if args.timings == "-":
+            print(h.instrument.to_json(), file=sys.stderr)
+        else:
+            with open(args.timings, "w", encoding="utf-8") as f:
+                f.write(h.instrument.to_json())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
+import hashlib
+import os
+from contextlib import nullcontext
 from os import path
-from urllib import request
-from rdflib import util, Graph
 import sys
 import logging
 
@@ -33,7 +34,61 @@ RDF_SERIALIZER_MAP = {
     "text/plain": "nt",  # text/plain is the old/deprecated mimetype for n-triples
 }
 
-from .profiles import OntDoc, Prof, VocPub, NMPF, PROFILES
+
+
+def get_rdf(uri, etag=None, last_modified=None):
+    """Gets RDF from a URI, using Content Negotiation
+
+    If the ETag and/or Last-Modified header values of a previous response are given, the request is conditional and
+    None is returned if the RDF hasn't changed since then.
+
+    Uses the shared, pooled, HttpClient. Raises requests.RequestException if the RDF can't be got.
+
+    :return: The RDF, its rdflib format and the response's ETag & Last-Modified header values (or None)
+    :rtype: tuple
+    """
+    from .httpclient import get_client
+
+    headers = {"Accept": ", ".join(RDF_SERIALIZER_MAP.keys())}
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+    resp = get_client().get(uri, headers=headers)
+    if resp.status_code == 304:
+        return None
+    resp.raise_for_status()
+
+    # get RDF format from Media Type
+    media_type = resp.headers.get("Content-Type", "").split(";")[0]  # splitting off any ;charset=...
+    if RDF_SERIALIZER_MAP.get(media_type):
+        fmt = RDF_SERIALIZER_MAP.get(media_type)
+    else:
+        fmt = (
+            "json-ld"
+            if media_type == "application/ld+json"
+            or media_type == "application/json"
+            else None
+        )
+
+    if fmt is None:
+        raise Exception(
+            "Could not parse the supplied URI. The RDF format could not be determined from Media Type "
+            "({} was given) or from a file extension".format(media_type)
+        )
+
+    return resp.content.decode(), fmt, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
+# rdflib, the profile classes etc. are imported where they're used, so importing this module, e.g. for the CLI's -lp, is
+# quick
+from .profiles import PROFILES
+from .cache import DocumentCache, DEFAULT_MAX_SIZE, graph_hash
+
+
+def _register_plugins():
+    from rdflib.plugin import register, Serializer
+    register("json-ld", Serializer, "rdflib_jsonld.serializer", "JsonLDSerializer")
 
 
 class MakeDocco:
@@ -47,7 +102,11 @@ class MakeDocco:
             use_curies_stored: bool = True,
             get_curies_online: bool = False,
             profile: str = "ontdoc",
-            language: str = "en"
+            language: str = "en",
+            cache_dir: str = None,
+            cache_max_size: int = DEFAULT_MAX_SIZE,
+            fragments_dir: str = None,
+            instrument=False
     ):
         """This class receives all of the variables needed to specify how to make documentation from an input RDF source
 
@@ -68,6 +127,18 @@ class MakeDocco:
         :type profile: string (one of "ontdoc", "skosp" or "prof")
         :param language: ISO 639 code for the desired output language
         :type language: string
+        :param cache_dir: A directory in which to cache documents. If given, documents are only generated if the same
+                          RDF hasn't already been documented with the same options
+        :type cache_dir: path (string)
+        :param cache_max_size: The size, in bytes, above which least recently used documents are evicted from the cache
+        :type cache_max_size: int
+        :param fragments_dir: A directory in which to keep each entity's rendered fragment, e.g. a Class' HTML. If
+                              given, only entities that have changed since the RDF was last documented are re-rendered
+        :type fragments_dir: path (string)
+        :param instrument: Whether (True) or not (False, default) to record the wall time, call counts & peak memory of
+                           each phase of parsing & documenting the RDF, reported by self.instrument.report(). An
+                           Instrument may be given instead, e.g. Instrument(memory=False)
+        :type instrument: boolean or pylode.instrument.Instrument
         """
         self.profile_selected = profile
 
@@ -80,6 +151,16 @@ class MakeDocco:
         self.use_curies_stored = use_curies_stored
         self.get_curies_online = get_curies_online
         self.language = language
+        self.cache = DocumentCache(cache_dir, cache_max_size) if cache_dir is not None else None
+        self._graph_hash = None
+        self._language_views = {}  # language -> a read-only view of G shared by its profiles, see _language_view()
+        self.fragments_dir = fragments_dir
+        self.fragment_stats = {"rendered": 0, "reused": 0}
+        if instrument is True:
+            from .instrument import Instrument
+            self.instrument = Instrument()
+        else:
+            self.instrument = instrument if instrument else None
 
         if profile not in PROFILES.keys():
             print("The profile you've selected, {}, is not recognised so the default profile, {} is being used. "
@@ -88,17 +169,25 @@ class MakeDocco:
         else:
             self.profile_selected = profile
 
+        _register_plugins()
+
         # shared variables
-        if input_data_file is not None:
-            self._parse_input_data_file(input_data_file)
-        elif input_uri is not None:
-            self._parse_input_uri(input_uri)
-        elif data is not None:
-            self._parse_data(data)
-        else:
-            raise Exception("You must supply either an input file or a URI for your ontology's RDF")
+        with self._phase("parse"):
+            if input_data_file is not None:
+                self._parse_input_data_file(input_data_file)
+            elif input_uri is not None:
+                self._parse_input_uri(input_uri)
+            elif data is not None:
+                self._parse_data(data)
+            else:
+                raise Exception("You must supply either an input file or a URI for your ontology's RDF")
+
+    def _phase(self, name):
+        return self.instrument.phase(name) if self.instrument is not None else nullcontext()
 
     def _parse_input_data_file(self, input_data_file):
+        from rdflib import util, Graph
+
         if hasattr(input_data_file, "name"):
             file_name = str(input_data_file.name)
         elif input_data_file is not None:
@@ -122,30 +211,15 @@ class MakeDocco:
             self.source_info = (file_name, fmt)
 
     def _parse_input_uri(self, uri):
-        headers = {"Accept": ", ".join(RDF_SERIALIZER_MAP.keys())}
-        resp = request.urlopen(request.Request(uri, None, headers))
-        # get RDF format from Media Type
-        media_type = resp.headers["Content-Type"].split(";")[0]  # splitting off any ;charset=...
-        if RDF_SERIALIZER_MAP.get(media_type):
-            fmt = RDF_SERIALIZER_MAP.get(media_type)
-        else:
-            fmt = (
-                "json-ld"
-                if media_type == "application/ld+json"
-                or media_type == "application/json"
-                else None
-            )
-
-        if fmt is None:
-            raise Exception(
-                "Could not parse the supplied URI. The RDF format could not be determined from Media Type "
-                "({} was given) or from a file extension".format(media_type)
-            )
+        from rdflib import Graph
 
-        self.G = Graph().parse(data=resp.read().decode(), format=fmt)
+        data, fmt, _, _ = get_rdf(uri)
+        self.G = Graph().parse(data=data, format=fmt)
         self.source_info = (uri, fmt)
 
     def _parse_data(self, data):
+        from rdflib import Graph
+
         if type(data) == Graph:
             self.G = data
         elif type(data) == str:
@@ -170,58 +244,162 @@ class MakeDocco:
 
         return is_supported
 
-    def document(self, destination=None):
-        if self.profile_selected == "prof":
-            p = Prof(
-                self.G,
-                self.source_info,
-                outputformat=self.outputformat,
-                include_css=self.include_css,
-                default_language=self.language,
-                use_curies_stored=self.use_curies_stored,
-                get_curies_online=self.get_curies_online
-            )
-        elif self.profile_selected == "vocpub":
-            p = VocPub(
-                self.G,
-                self.source_info,
-                outputformat=self.outputformat,
-                include_css=self.include_css,
-                default_language=self.language,
-                use_curies_stored=self.use_curies_stored,
-                get_curies_online=self.get_curies_online
-            )
-        elif self.profile_selected == "nmpf":
-            p = NMPF(
-                self.G,
-                self.source_info,
-                outputformat=self.outputformat,
-                include_css=self.include_css,
-                default_language="en",
-                use_curies_stored=self.use_curies_stored,
-                get_curies_online=self.get_curies_online
-            )
+    def _language_view(self, language):
+        from .graph import language_view
+
+        # made once per language: checking G for Literals in other languages reads all of it
+        if language not in self._language_views:
+            self._language_views[language] = language_view(self.G, language)
+        return self._language_views[language]
+
+    def _make_profile(self, profile, outputformat):
+        from .profiles import OntDoc, Prof, VocPub, NMPF
+        from .fragments import FragmentStore
+
+        if profile == "prof":
+            cls = Prof
+        elif profile == "vocpub":
+            cls = VocPub
+        elif profile == "nmpf":
+            cls = NMPF
         else:
-            p = OntDoc(
-                self.G,
+            cls = OntDoc
+
+        # mostly checking for Literals in other languages, to filter out
+        language = "en" if profile == "nmpf" else self.language
+        with self._phase("init_profile"):
+            p = cls(
+                self._language_view(language),
                 self.source_info,
-                outputformat=self.outputformat,
+                outputformat=outputformat,
                 include_css=self.include_css,
-                default_language=self.language,
+                default_language=language,
                 use_curies_stored=self.use_curies_stored,
                 get_curies_online=self.get_curies_online
             )
+        p.instrument = self.instrument
+        if self.fragments_dir is not None:
+            # one fragment file per RDF source & profile
+            name = "{}.{}.json".format(hashlib.sha256(str(self.source_info[0]).encode()).hexdigest()[:16], profile)
+            p.fragments = FragmentStore(path.join(self.fragments_dir, name))
+
+        return p
+
+    def _save_fragments(self, p):
+        if p.fragments is not None:
+            p.fragments.save()
+            self.fragment_stats["rendered"] += p.fragments.rendered
+            self.fragment_stats["reused"] += p.fragments.reused
+
+    def _cache_key(self, profile, outputformat):
+        if self._graph_hash is None:
+            self._graph_hash = graph_hash(self.G)
 
-        if destination is not None:
-            doc = p.generate_document()
-            try:
-                with open(destination, "w", encoding="utf-8") as f:
-                    f.write(doc)
-            except Exception as e:
-                print(e)
-                raise Exception(
-                    "The file you specified as 'destination' could not be written to. You specified {}."
-                                .format(destination))
+        return DocumentCache.make_key(
+            self._graph_hash,
+            source_info=self.source_info,
+            profile=profile,
+            outputformat=outputformat,
+            include_css=self.include_css,
+            language=self.language,
+            use_curies_stored=self.use_curies_stored,
+            get_curies_online=self.get_curies_online,
+        )
 
+    def document_many(self, formats=None, profiles=None):
+        """Makes documentation in several output formats and/or profiles from the one parsed RDF source
+
+        Each profile expands the graph and extracts its namespaces once only and then just extracts and renders
+        its model per format.
+
+        :param formats: The output formats to make, any of "html", "md" & "adoc". Default is this instance's
+                        outputformat
+        :type formats: list of strings
+        :param profiles: The profiles to document with. Default is this instance's profile
+        :type profiles: list of strings
+        :return: The documents, keyed by (profile, format)
+        :rtype: dict
+        """
+        formats = formats if formats is not None else [self.outputformat]
+        profiles = profiles if profiles is not None else [self.profile_selected]
+        for f in formats:
+            if f not in ["html", "md", "adoc"]:
+                raise Exception("Unknown output format {}. Known formats are: html, md, adoc".format(f))
+        for profile in profiles:
+            if profile not in PROFILES.keys():
+                raise Exception("Unknown profile {}. Known profiles are: {}".format(profile, ", ".join(PROFILES.keys())))
+
+        docs = {}
+        for profile in profiles:
+            if self.cache is not None:
+                for f in formats:
+                    doc = self.cache.get(self._cache_key(profile, f))
+                    if doc is not None:
+                        docs[(profile, f)] = doc
+            todo = [f for f in formats if (profile, f) not in docs]
+            if len(todo) == 0:
+                continue
+
+            p = self._make_profile(profile, todo[0])
+            for f, doc in p.generate_documents(todo).items():
+                docs[(profile, f)] = doc
+                if self.cache is not None:
+                    self.cache.put(self._cache_key(profile, f), doc)
+            self._save_fragments(p)
+
+        return docs
+
+    def _make_document(self):
+        p = self._make_profile(self.profile_selected, self.outputformat)
+        doc = p.generate_document()
+        self._save_fragments(p)
+        return doc
+
+    def _generate_document(self):
+        if self.cache is not None:
+            key = self._cache_key(self.profile_selected, self.outputformat)
+            doc = self.cache.get(key)
+            if doc is None:
+                doc = self._make_document()
+                self.cache.put(key, doc)
+            return doc
+
+        return self._make_document()
+
+    def stream(self):
+        """Generates the document in pieces, which are made as they're consumed, so a large document can be written
+        out without ever being held in memory in full. Cached documents are generated whole"""
+        if self.cache is not None:
+            yield self._generate_document()
         else:
-            return p.generate_document()
+            p = self._make_profile(self.profile_selected, self.outputformat)
+            yield from p.stream_document()
+            self._save_fragments(p)
+
+    def document(self, destination=None):
+        """Returns the document or, if given a destination file name or writable file-like object, e.g. sys.stdout,
+        streams it there"""
+        if destination is None:
+            return self._generate_document()
+
+        if hasattr(destination, "write"):
+            for piece in self.stream():
+                destination.write(piece)
+            return
+
+        try:
+            f = open(destination, "w", encoding="utf-8")
+        except Exception as e:
+            print(e)
+            raise Exception(
+                "The file you specified as 'destination' could not be written to. You specified {}."
+                            .format(destination))
+
+        try:
+            with f:
+                for piece in self.stream():
+                    f.write(piece)
+        except BaseException:
+            # don't leave a partial document behind
+            os.remove(destination)
+            raise
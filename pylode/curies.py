@@ -2206,3 +2206,53 @@ CURIES = {
     "zoomaterms": "http://rdf.ebi.ac.uk/vocabulary/zooma/",
     "zr": "http://explain.z3950.org/dtd/2.0/",
 }
+
+
+class PrefixRegistry:
+    """Hash map lookups between the CURIE prefixes and namespaces in CURIES
+
+    The maps are built on first use. Where several prefixes share a namespace, the first one listed in CURIES is
+    used, as per a linear scan of CURIES.
+    """
+    def __init__(self, curies):
+        self._curies = curies
+        self._prefix_to_namespace = None
+        self._namespace_to_prefix = None
+        self._normalised_namespace_to_prefix = None
+
+    @staticmethod
+    def normalise(namespace):
+        """Strips trailing hashes & slashes so that http://example.com/x# matches http://example.com/x/"""
+        return namespace.rstrip("#/")
+
+    def _build(self):
+        namespace_to_prefix = {}
+        normalised_namespace_to_prefix = {}
+        for prefix, namespace in self._curies.items():
+            namespace_to_prefix.setdefault(namespace, prefix)
+            normalised_namespace_to_prefix.setdefault(self.normalise(namespace), prefix)
+        self._namespace_to_prefix = namespace_to_prefix
+        self._normalised_namespace_to_prefix = normalised_namespace_to_prefix
+        self._prefix_to_namespace = dict(self._curies)
+
+    def prefix_for(self, namespace, normalised=False):
+        """Returns the prefix for the given namespace or None if it's not known
+
+        If normalised is True, the namespace is matched ignoring any trailing hashes or slashes"""
+        if self._namespace_to_prefix is None:
+            self._build()
+        if normalised:
+            return self._normalised_namespace_to_prefix.get(self.normalise(namespace))
+        return self._namespace_to_prefix.get(namespace)
+
+    def namespace_for(self, prefix):
+        """Returns the namespace for the given prefix or None if it's not known"""
+        if self._prefix_to_namespace is None:
+            self._build()
+        return self._prefix_to_namespace.get(prefix)
+
+    def __contains__(self, namespace):
+        return self.prefix_for(namespace) is not None
+
+
+PREFIXES = PrefixRegistry(CURIES)
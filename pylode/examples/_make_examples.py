@@ -1,8 +1,8 @@
 # this file runs pyLODe against the ontology, vocabulary and profile files in this dir
-from pylode.common import MakeDocco
+from pylode.batch import run_batch, summarise
 
 
-def main():
+def main(workers=None):
     # OntDoc
     ontdoc_file = [
         "agrif-notitle.ttl",
@@ -37,13 +37,6 @@ def main():
         "sosa.ttl",
         "ssn.ttl"
     ]
-    for f in sorted(ontdoc_file):
-        print("making ontdoc for {}".format(f))
-        h = MakeDocco(input_data_file=f)
-        h.document(destination=f.replace(".ttl", ".html"))
-        h = MakeDocco(input_data_file=f, outputformat="md")
-        h.document(destination=f.replace(".ttl", ".md"))
-
 
     # for these files, make a vocpub html & md output
     vocpub_files = [
@@ -55,24 +48,20 @@ def main():
         'earth-science-data-category.ttl',
         'iso19115-1-RoleCodes.ttl'
     ]
-    for f in sorted(vocpub_files):
-        print("making vocpub for {}".format(f))
-        h = MakeDocco(input_data_file=f, profile="vocpub")
-        h.document(destination=f.replace(".ttl", ".vocpub.html"))
-        h = MakeDocco(input_data_file=f, profile="vocpub", outputformat="md")
-        h.document(destination=f.replace(".ttl", ".vocpub.md"))
-
 
     prof_files = [
         "ga-skos.ttl",
         "geo.profile.ttl",
     ]
-    for f in sorted(prof_files):
-        print("making prof for {}".format(f))
-        h = MakeDocco(input_data_file=f, profile="prof")
-        h.document(destination=f.replace(".ttl", ".prof.html"))
-        h = MakeDocco(input_data_file=f, profile="prof", outputformat="md")
-        h.document(destination=f.replace(".ttl", ".prof.md"))
+
+    # a job per file, so files in several profiles are only parsed once, run over all CPUs
+    profiles = {}
+    for files, profile in [(ontdoc_file, "ontdoc"), (vocpub_files, "vocpub"), (prof_files, "prof")]:
+        for f in files:
+            profiles.setdefault(f, []).append(profile)
+    jobs = [{"input": f, "profiles": p, "formats": ["html", "md"]} for f, p in sorted(profiles.items())]
+
+    print(summarise(run_batch(jobs, workers=workers)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+import collections
+from rdflib import BNode
+from rdflib.namespace import DC, DCTERMS, RDF, SDO
+
+
+class Rule:
+    """A graph expansion rule: the triples it adds, and removes, for each triple it matches
+
+    A rule matches triples with any of its predicates or, if it has types, rdf:type triples with any of its types as
+    object. Rules are declared by profiles, e.g. OntDoc.EXPANSION_RULES, and applied by expand().
+    """
+    def __init__(self, name, predicates=None, types=None):
+        self.name = name
+        self.predicates = predicates or []
+        self.types = types or []
+
+    @property
+    def keys(self):
+        """The (predicate, object) patterns of the triples this rule matches, object None for any"""
+        return [(p, None) for p in self.predicates] + [(RDF.type, t) for t in self.types]
+
+    @property
+    def targets(self):
+        """Abstract method: the (predicate, object) patterns of the triples this rule adds, object None for any"""
+
+    def apply(self, s, p, o):
+        """Abstract method: returns the triples to add & to remove for a matched triple"""
+
+
+class Copy(Rule):
+    """(s, source, o) -> (s, target, o) for each source predicate, e.g. rdfs:label -> dcterms:title. Triples with Blank
+    Node objects are skipped if uri_objects_only"""
+    def __init__(self, name, sources, target, uri_objects_only=False):
+        super().__init__(name, predicates=sources)
+        self.target = target
+        self.uri_objects_only = uri_objects_only
+
+    @property
+    def targets(self):
+        return [(self.target, None)]
+
+    def apply(self, s, p, o):
+        if self.uri_objects_only and type(o) == BNode:
+            return (), ()
+        return [(s, self.target, o)], ()
+
+
+class Move(Copy):
+    """As Copy but the source triple is removed, e.g. sdo:creator -> dcterms:creator"""
+    def apply(self, s, p, o):
+        return [(s, self.target, o)], [(s, p, o)]
+
+
+class Inverse(Copy):
+    """(s, source, o) -> (o, target, s) for each source predicate, e.g. skos:broader -> skos:narrower"""
+    def apply(self, s, p, o):
+        if self.uri_objects_only and type(o) == BNode:
+            return (), ()
+        return [(o, self.target, s)], ()
+
+
+class InferType(Rule):
+    """(s, rdf:type, source) -> (s, rdf:type, target) for each source type, e.g. owl:Class -> rdfs:Class"""
+    def __init__(self, name, sources, target):
+        super().__init__(name, types=sources)
+        self.target = target
+
+    @property
+    def targets(self):
+        return [(RDF.type, self.target)]
+
+    def apply(self, s, p, o):
+        return [(s, RDF.type, self.target)], ()
+
+
+class SubjectType(Rule):
+    """(s, predicate, o) -> (s, rdf:type, type), e.g. s owl:onProperty ... -> s a owl:Restriction"""
+    def __init__(self, name, predicate, type):
+        super().__init__(name, predicates=[predicate])
+        self.type = type
+
+    @property
+    def targets(self):
+        return [(RDF.type, self.type)]
+
+    def apply(self, s, p, o):
+        return [(s, RDF.type, self.type)], ()
+
+
+class ObjectType(SubjectType):
+    """(s, predicate, o) -> (o, rdf:type, type), e.g. ... prof:hasResource o -> o a prof:ResourceDescriptor"""
+    def apply(self, s, p, o):
+        return [(o, RDF.type, self.type)], ()
+
+
+# the Agent normalisation all profiles make: Dublin Core Elements & schema.org Agents to Dublin Core Terms
+AGENT_RULES = [
+    Move("creator", [DC.creator, SDO.creator, SDO.author], DCTERMS.creator),  # conflate SDO.author with creator
+    Move("contributor", [DC.contributor, SDO.contributor], DCTERMS.contributor),
+    Move("publisher", [DC.publisher, SDO.publisher], DCTERMS.publisher),
+]
+
+
+def expand(g, rules):
+    """Applies rules to a graph in one pass over the triples they match, found by predicate & type, then adds &
+    removes the triples they make in batches
+
+    Triples rules add are matched against the rules too, so rules may build on each other's, e.g. skos:broader
+    triples from rdfs:subClassOf ones then skos:narrower ones from those, in any order. A triple one rule adds and
+    another removes isn't added.
+
+    :return: {rule name: the number of triples it matched}
+    :rtype: dict
+    """
+    index = {}
+    for rule in rules:
+        for key in rule.keys:
+            index.setdefault(key, []).append(rule)
+    stats = {rule.name: 0 for rule in rules}
+
+    to_add = {}  # a dict, not a set, to add triples in the order rules make them, which profiles may rely on
+    to_remove = set()
+
+    # the triples to match: first those in g, then those rules make that other rules may match, each once, so chains
+    # end without looking triples up in g. Only triples rules may make are remembered as matched
+    targets = set(key for rule in rules for key in rule.targets)
+    worklist = collections.deque()
+    matched = set()
+    for key, rules_matched in index.items():
+        for triple in g.triples((None, *key)):
+            worklist.append((triple, rules_matched))
+            if key in targets or (triple[1], None) in targets:
+                matched.add(triple)
+
+    while len(worklist) > 0:
+        triple, rules_matched = worklist.popleft()
+        for rule in rules_matched:
+            stats[rule.name] += 1
+            adds, removes = rule.apply(*triple)
+            for t in removes:
+                to_add.pop(t, None)
+                to_remove.add(t)
+            for t in adds:
+                if t in to_add:
+                    continue
+                to_add[t] = None
+                if t not in matched:
+                    rules_next = index.get((t[1], None), []) + (index.get(t[1:], []) if t[1] == RDF.type else [])
+                    if len(rules_next) > 0:
+                        matched.add(t)
+                        worklist.append((t, rules_next))
+
+    for t in to_remove:
+        g.remove(t)
+    g.addN((s, p, o, g) for s, p, o in to_add)
+
+    return stats
@@ -0,0 +1,81 @@
+def _remove_non_ascii_chars(s):
+    return "".join(j for j in s if ord(j) < 128).replace("&", "")
+
+
+def _fid_from_uri(uri):
+    """The last segment of a URI, after any '#', or None if it has no path segments or ends in '/' or '#'"""
+    segments = uri.split("/")
+    # return None for empty string - URI ends in slash
+    if len(segments[-1]) < 1:
+        return None
+
+    # return None for domains, i.e. ['http:', '', '{domain}'] - no path segments
+    if len(segments) < 4:
+        return None
+
+    # split out hash URIs
+    # remove any training hashes
+    if segments[-1].endswith("#"):
+        return None
+
+    return (
+        segments[-1].split("#")[-1]
+        if segments[-1].split("#")[-1] != ""
+        else segments[-1].split("#")[-2]
+    )
+
+
+class FidAllocator:
+    """Allocates the fragment IDs, unique within a document, of its entities, e.g. a Class's '#Person'
+
+    An entity's ID is made from its title or, if that's already in use, the last segment of its URI or, if that's in
+    use too, that followed by the lowest number not in use: 'Person1', 'Person2' etc. So the IDs depend only on the
+    order entities are allocated them in.
+
+    The IDs are kept, by URI, in fids, e.g. a profile's FIDS, and in a set, so checking whether one is in use doesn't
+    scan them all.
+    """
+    def __init__(self, fids=None):
+        self.fids = fids if fids is not None else {}
+        self._used = set(self.fids.values())
+        self._next_suffix = {}  # ID -> the lowest number that might not be in use after it
+
+    def _take(self, uri, fid):
+        self.fids[uri] = fid
+        self._used.add(fid)
+        return fid
+
+    def allocate(self, title, uri):
+        """Returns the ID of the entity with this title & URI, allocating it if the URI hasn't one already, or None if
+        neither its title nor its URI can make one"""
+        # does this URI already have a fid?
+        existing_fid = self.fids.get(uri)
+        if existing_fid is not None:
+            return existing_fid
+
+        # try creating an ID from label, removing spaces & non-ASCII chars
+        if title is not None:
+            fid = _remove_non_ascii_chars(title.replace(" ", ""))
+            if fid not in self._used:
+                return self._take(uri, fid)
+
+        # the title's ID is already in use so generate a new one from the URI instead
+        fid = _fid_from_uri(uri)
+        if fid is None:
+            return None
+        if fid not in self._used:
+            return self._take(uri, fid)
+
+        n = self._next_suffix.get(fid, 1)
+        while fid + str(n) in self._used:
+            n += 1
+        self._next_suffix[fid] = n + 1
+        return self._take(uri, fid + str(n))
+
+    def allocate_all(self, entities):
+        """Allocates the IDs of many entities, in order, from (title, URI) pairs
+
+        :return: {URI: ID} for each entity, the ID being None if one couldn't be made
+        :rtype: dict
+        """
+        return {uri: self.allocate(title, uri) for title, uri in entities}
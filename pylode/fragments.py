@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+from os import path
+from rdflib import BNode, Literal
+
+
+def canonical(value, ordered=False):
+    """Returns a JSON-serialisable form of a model value, e.g. a Class' dict, that is the same in every run, for
+    hashing. RDF terms keep their types
+
+    Lists are compared as sets, since their order comes from iterating over the graph, which varies between runs,
+    unless they are within a tuple: an RDF collection's members, as (type, [members]), are in order.
+    """
+    if isinstance(value, dict):
+        return [[canonical(k), canonical(v)] for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))]
+    if isinstance(value, tuple):
+        return [canonical(v, ordered=True) for v in value]
+    if isinstance(value, (list, set, frozenset)):
+        items = [canonical(v) for v in value]
+        return items if ordered and isinstance(value, list) else sorted(items, key=json.dumps)
+    if isinstance(value, Literal):
+        return ["Literal", str(value), value.language, value.datatype]
+    if isinstance(value, BNode):
+        return ["BNode", str(value)]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return [type(value).__name__, str(value)]
+
+
+def make_key(*parts):
+    """Returns a hash of model values, see canonical()"""
+    return hashlib.sha256(json.dumps(canonical(parts)).encode()).hexdigest()
+
+
+class FragmentStore:
+    """Rendered entity fragments, e.g. each Class' HTML, kept in a JSON file between runs for incremental regeneration
+
+    A fragment is stored under a key hashing everything its rendering depends on (see
+    BaseProfile._make_fragment()), so an entity is only rendered again if it, or something it links to, has changed.
+    When saved, only the fragments used in this run are kept for each output format made, so the file doesn't grow as
+    an ontology is edited.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._stored = self._load()
+        self._used = {}  # outputformat -> {key: fragment}
+        self.reused = 0
+        self.rendered = 0
+
+    def _load(self):
+        try:
+            with open(self.file_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):  # no, or a corrupt, store
+            return {}
+
+    def get(self, outputformat, key, render):
+        """Returns the fragment stored under key for outputformat or, if there's none, renders it with render()"""
+        used = self._used.setdefault(outputformat, {})
+        fragment = used.get(key)
+        if fragment is None:
+            fragment = self._stored.get(outputformat, {}).get(key)
+            if fragment is not None:
+                self.reused += 1
+            else:
+                fragment = render()
+                self.rendered += 1
+            used[key] = fragment
+        return fragment
+
+    def save(self):
+        fragments = dict(self._stored, **self._used)
+        os.makedirs(path.dirname(path.abspath(self.file_path)), exist_ok=True)
+        tmp = "{}.{}.tmp".format(self.file_path, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fragments, f)
+        os.replace(tmp, self.file_path)
+        self._stored = fragments
@@ -0,0 +1,173 @@
+from rdflib import Graph, Literal
+from rdflib.graph import ModificationException
+from rdflib.plugins.stores.memory import Memory
+from rdflib.store import Store
+
+# running totals of reads through all OverlayStores, i.e. by profiles, reported per phase by pylode.instrument
+COUNTS = {"lookups": 0, "queries": 0}
+
+
+def has_other_languages(g, language):
+    """Returns True if any Literal in g has a language tag other than language, i.e. if filtering g by language
+    would hide anything. Stops at the first such Literal found"""
+    for o in g.objects():
+        if type(o) is Literal and o.language and o.language != language:
+            return True
+    return False
+
+
+class LanguageFilteredStore(Store):
+    """A read-only Store view over an existing Graph that hides Literals tagged with a language other than language
+
+    Nothing is copied from the base Graph: reads are passed through to it and filtered as they go, and only if
+    filtering, i.e. if the base Graph has Literals in other languages. The view can't be changed, so one can be
+    shared by all the profiles, formats and threads documenting the one graph, each changing it through its own
+    OverlayStore.
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, base, language=None, filtering=True):
+        super().__init__()
+        self.base = base
+        self.language = language
+        self.filtering = filtering and language is not None
+        self._namespaces = Memory()
+
+    def _visible(self, o):
+        return not self.filtering or type(o) is not Literal or not o.language or o.language == self.language
+
+    def add(self, triple, context, quoted=False):
+        raise ModificationException()
+
+    def remove(self, triple, context=None):
+        raise ModificationException()
+
+    def triples(self, triple_pattern, context=None):
+        if not self.filtering:
+            for t in self.base.triples(triple_pattern):
+                yield t, iter(())
+            return
+        for t in self.base.triples(triple_pattern):
+            if self._visible(t[2]):
+                yield t, iter(())
+
+    def __len__(self, context=None):
+        return sum(1 for _ in self.triples((None, None, None)))
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    # namespace bindings belong to the view, not the base Graph
+    def bind(self, prefix, namespace, override=True):
+        self._namespaces.bind(prefix, namespace, override=override)
+
+    def namespace(self, prefix):
+        return self._namespaces.namespace(prefix)
+
+    def prefix(self, namespace):
+        return self._namespaces.prefix(namespace)
+
+    def namespaces(self):
+        return self._namespaces.namespaces()
+
+
+class OverlayStore(Store):
+    """A copy-on-write Store over an existing Graph: reads are passed through to it but changes are kept here
+
+    Triples added are kept in a small private Memory store and triples of the base Graph removed are recorded as
+    removed, as tombstones, so the base Graph, e.g. a shared LanguageFilteredStore view, is never modified and a
+    profile can expand the overlay as it would a copy of it.
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+        self._added = Memory()
+        self._removed = set()
+
+    def add(self, triple, context, quoted=False):
+        if triple in self._removed:
+            # the base Graph's triple becomes visible again
+            self._removed.discard(triple)
+        elif triple not in self.base:
+            self._added.add(triple, None)
+
+    def remove(self, triple, context=None):
+        for t in list(self.base.triples(triple)):
+            self._removed.add(t)
+        if len(self._added) > 0:
+            self._added.remove(triple, None)
+
+    def triples(self, triple_pattern, context=None):
+        COUNTS["lookups"] += 1
+        removed = self._removed
+        if removed:
+            for t in self.base.triples(triple_pattern):
+                if t not in removed:
+                    yield t, iter(())
+        else:
+            for t in self.base.triples(triple_pattern):
+                yield t, iter(())
+        if len(self._added) > 0:
+            for t, _ in self._added.triples(triple_pattern, None):
+                yield t, iter(())
+
+    def query(self, query, initNs, initBindings, queryGraph, **kwargs):
+        COUNTS["queries"] += 1
+        # have rdflib evaluate the query over triples()
+        raise NotImplementedError
+
+    def __len__(self, context=None):
+        return sum(1 for _ in self.triples((None, None, None)))
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    # namespace bindings belong to the overlay, not the base Graph
+    def bind(self, prefix, namespace, override=True):
+        self._added.bind(prefix, namespace, override=override)
+
+    def namespace(self, prefix):
+        return self._added.namespace(prefix)
+
+    def prefix(self, namespace):
+        return self._added.prefix(namespace)
+
+    def namespaces(self):
+        return self._added.namespaces()
+
+
+def _bind_namespaces(view, g):
+    for k, v in g.namespaces():
+        view.bind(k, v)
+    return view
+
+
+def language_view(g, language):
+    """Returns a read-only Graph that reads through to g, hiding Literals in languages other than language, without
+    copying g. If g has no competing language tags, no filtering is done on read at all. If g is already such a view,
+    for language, it is returned as is, so a view made once can be shared"""
+    if type(g.store) is LanguageFilteredStore and g.store.language == language:
+        return g
+    return _bind_namespaces(Graph(store=LanguageFilteredStore(g, language, has_other_languages(g, language))), g)
+
+
+def overlay(g):
+    """Returns a Graph that reads through to g but keeps any changes to itself, leaving g unchanged"""
+    base = g
+    if type(g.store) is LanguageFilteredStore and not g.store.filtering:
+        base = g.store.base  # the view hides nothing so read g's base directly
+    return _bind_namespaces(Graph(store=OverlayStore(base)), g)
+
+
+def language_filtered_view(g, language):
+    """Returns a Graph that reads through to g, hiding Literals in languages other than language, and can be changed,
+    e.g. expanded by a profile, without copying or changing g"""
+    return overlay(language_view(g, language))
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# defaults, which may be overridden by these env vars
+DEFAULT_TIMEOUT = float(os.getenv("PYLODE_HTTP_TIMEOUT", 30))  # seconds, to connect & between bytes read
+DEFAULT_RETRIES = int(os.getenv("PYLODE_HTTP_RETRIES", 2))
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("PYLODE_HTTP_MAX_CONNECTIONS", 10))  # per host
+
+
+class HttpClient:
+    """A pooled HTTP client: connections are kept alive & reused across requests and threads
+
+    Connection failures and 429, 502, 503 & 504 responses are retried, with exponential backoff, up to retries times.
+    """
+    def __init__(
+            self,
+            timeout=DEFAULT_TIMEOUT,
+            retries=DEFAULT_RETRIES,
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            backoff_factor=0.5
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_connections,
+            pool_maxsize=max_connections,
+            pool_block=True,  # wait for a free connection rather than exceed max_connections
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False,  # return the last response, for the caller to handle
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """GETs url, returning a requests Response. Raises requests.RequestException if no response is received"""
+        return self.session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpClient:
+    """An asyncio interface to an HttpClient, for fetching many URLs concurrently from a coroutine
+
+    Requests run in a thread pool sized to the HttpClient's connection limit, so they share its pooled connections.
+    """
+    def __init__(self, client=None):
+        self.client = client if client is not None else get_client()
+        self._executor = ThreadPoolExecutor(max_workers=self.client.max_connections)
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: self.client.get(url, params=params, headers=headers, timeout=timeout)
+        )
+
+    async def get_many(self, urls, headers=None):
+        """GETs all the URLs concurrently. Returns a Response, or the exception raised, for each"""
+        return await asyncio.gather(*[self.get(url, headers=headers) for url in urls], return_exceptions=True)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the HttpClient shared by all of pyLODE's HTTP requests in this process"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def configure_client(**kwargs):
+    """Replaces the shared HttpClient with one made with these HttpClient arguments, e.g. timeout"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(**kwargs)
+        return _client
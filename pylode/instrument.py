@@ -0,0 +1,79 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from pylode import graph
+from pylode.templating import TEMPLATES
+
+
+def _counts():
+    return {
+        "templates": TEMPLATES.template_requests,
+        "queries": graph.COUNTS["queries"],
+        "lookups": graph.COUNTS["lookups"],
+    }
+
+
+class Instrument:
+    """Records the wall time, call counts & peak memory of each phase of making documents, e.g. expand_graph
+
+    Counts are of templates loaded for rendering, SPARQL queries and triple pattern lookups on profiles' graphs. Peak
+    memory is the most allocated, as traced by tracemalloc, above that allocated when the phase started. It's only
+    measured if memory is True, as tracing slows everything down.
+
+    Phases may be nested, e.g. a profile's extract_classes within extract_model, and include those within them. A
+    phase run more than once, e.g. render for several output formats, is reported once with its totals.
+    """
+    def __init__(self, memory=True):
+        self.memory = memory and hasattr(tracemalloc, "reset_peak")  # Python 3.9+
+        self._phases = {}
+        self._stack = []  # [start memory, peak memory] of each phase entered
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        p = self._phases.setdefault(
+            name, {"time": 0.0, "calls": 0, "templates": 0, "queries": 0, "lookups": 0, "peak": None}
+        )
+        if self.memory:
+            if len(self._stack) == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current = tracemalloc.get_traced_memory()[0]
+            if len(self._stack) > 0:
+                # fold the peak so far into the enclosing phase's
+                self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._stack.append([current, current])
+        else:
+            self._stack.append(None)
+        counts = _counts()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            p["time"] += time.perf_counter() - start
+            p["calls"] += 1
+            for k, v in _counts().items():
+                p[k] += v - counts[k]
+
+            memory = self._stack.pop()
+            if memory is not None:
+                start_memory, peak = memory
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                p["peak"] = max(p["peak"] or 0, peak - start_memory)
+                if len(self._stack) > 0:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                    tracemalloc.reset_peak()
+                elif self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+
+    def report(self):
+        """Returns each phase's totals, in the order the phases were first run: {phase: {"time": seconds, "calls": n,
+        "templates": n, "queries": n, "lookups": n, "peak": bytes or None}}"""
+        return {k: dict(v) for k, v in self._phases.items()}
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2)
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import requests
+
+from pylode.httpclient import get_client
+
+# prefix.cc's reverse lookup API, or a local mirror of it: GET {url}?uri={namespace}&format=txt returns
+# "{prefix}\t{namespace}" as text/plain for a known namespace
+DEFAULT_LOOKUP_URL = os.getenv("PYLODE_PREFIX_LOOKUP_URL", "http://prefix.cc/reverse")
+DEFAULT_CACHE_FILE = os.getenv(
+    "PYLODE_PREFIX_CACHE",
+    path.join(path.expanduser("~"), ".cache", "pylode", "prefixes.json")
+)
+FOUND_TTL = 30 * 24 * 60 * 60  # seconds
+NOT_FOUND_TTL = 24 * 60 * 60  # seconds, shorter as namespaces may be registered at any time
+
+
+class PrefixCache:
+    """A file of online prefix lookup results, including namespaces with no prefix, which expire after a TTL"""
+    def __init__(self, cache_file=None, found_ttl=None, not_found_ttl=None):
+        self.cache_file = cache_file if cache_file is not None else DEFAULT_CACHE_FILE
+        self.found_ttl = found_ttl if found_ttl is not None else FOUND_TTL
+        self.not_found_ttl = not_found_ttl if not_found_ttl is not None else NOT_FOUND_TTL
+        self._entries = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):  # no, or a corrupt, cache
+            return {}
+
+    def get(self, namespace):
+        """Returns (True, prefix or None) for a namespace looked up within its TTL, else (False, None)"""
+        entry = self._entries.get(namespace)
+        if entry is None:
+            return False, None
+        prefix, looked_up = entry
+        ttl = self.found_ttl if prefix is not None else self.not_found_ttl
+        if time.time() - looked_up > ttl:
+            return False, None
+        return True, prefix
+
+    def put(self, namespace, prefix):
+        with self._lock:
+            self._entries[namespace] = [prefix, time.time()]
+
+    def save(self):
+        """Writes the cache, merged with any entries written to the file by others since it was loaded"""
+        with self._lock:
+            entries = self._load()
+            entries.update(self._entries)
+            self._entries = entries
+            os.makedirs(path.dirname(path.abspath(self.cache_file)), exist_ok=True)
+            tmp = "{}.{}.tmp".format(self.cache_file, os.getpid())
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.cache_file)
+
+
+def lookup_prefix(namespace, lookup_url=None, client=None):
+    """Looks up a namespace's prefix online. Returns the prefix or None if the namespace has none
+
+    Raises requests.RequestException if the lookup service can't be reached, as that says nothing about the
+    namespace"""
+    lookup_url = lookup_url if lookup_url is not None else DEFAULT_LOOKUP_URL
+    client = client if client is not None else get_client()
+    r = client.get(lookup_url, params={"uri": namespace, "format": "txt"})
+    if r.status_code == 200:
+        # primitive check to see if it really is prefix.cc replying with a text/plain response
+        if r.headers.get("Content-Type", "").startswith("text/plain"):
+            return r.text.split("\t")[0].strip() or None
+        return None
+    if r.status_code >= 500:
+        r.raise_for_status()
+    return None
+
+
+def lookup_prefixes(namespaces, lookup_url=None, cache=None, client=None):
+    """Looks up the prefixes of many namespaces online, concurrently, using & updating a PrefixCache
+
+    :return: The prefix, or None, of each namespace. Namespaces that couldn't be looked up are left out
+    :rtype: dict
+    """
+    cache = cache if cache is not None else PrefixCache()
+    client = client if client is not None else get_client()
+
+    prefixes = {}
+    todo = []
+    for ns in set(namespaces):
+        cached, prefix = cache.get(ns)
+        if cached:
+            prefixes[ns] = prefix
+        else:
+            todo.append(ns)
+
+    def lookup(ns):
+        try:
+            return ns, lookup_prefix(ns, lookup_url=lookup_url, client=client), True
+        except requests.RequestException:
+            # presumably this module can't access the internet or the lookup service is down
+            return ns, None, False
+
+    if len(todo) > 0:
+        with ThreadPoolExecutor(max_workers=client.max_connections) as executor:
+            for ns, prefix, looked_up in executor.map(lookup, sorted(todo)):
+                if looked_up:
+                    prefixes[ns] = prefix
+                    cache.put(ns, prefix)
+        try:
+            cache.save()
+        except OSError:  # e.g. a read-only home directory: the cache is only an optimisation
+            pass
+
+    return prefixes
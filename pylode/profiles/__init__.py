@@ -1,5 +1,23 @@
-from .ontdoc import OntDoc
-from .prof import Prof
-from .vocpub import VocPub
-from .nmpf import NMPF
 from .profile import *
+
+# the profile classes are imported on first use, as they import Markdown, natsort, Jinja2 etc. (PEP 562)
+_LAZY = {
+    "OntDoc": "pylode.profiles.ontdoc",
+    "Prof": "pylode.profiles.prof",
+    "VocPub": "pylode.profiles.vocpub",
+    "NMPF": "pylode.profiles.nmpf",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'pylode.profiles' has no attribute '{}'".format(name))
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_LAZY.keys()))
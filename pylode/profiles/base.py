@@ -1,12 +1,21 @@
 import collections
+from contextlib import nullcontext
 from itertools import chain
-from jinja2 import Environment, FileSystemLoader
-from rdflib import SDO, SKOS, OWL, URIRef, RDF, PROF, Literal, XSD, Graph, Namespace, FOAF, Graph
+from rdflib import SDO, SKOS, OWL, URIRef, RDF, PROF, Literal, BNode, XSD, Graph, Namespace, FOAF, Graph
 
-from pylode.common import TEMPLATES_DIR
+from pylode.expansion import expand
+from pylode.fids import FidAllocator
+from pylode.graph import language_filtered_view
+from pylode.renderers import RENDERERS
+from pylode.templating import get_template
 
 
 class BaseProfile:
+    # the attributes that make up a profile's format-neutral model
+    MODEL = ["NAMESPACES", "FIDS", "METADATA"]
+    # the rules _expand_graph() applies, see pylode.expansion
+    EXPANSION_RULES = []
+
     def __init__(
             self,
             g,
@@ -27,39 +36,113 @@ class BaseProfile:
         self.G.bind("sdo", SDO)
         self.G.bind("skos", SKOS)
         self.NAMESPACES = collections.OrderedDict()
+        self._namespace_prefixes = None  # namespace -> prefix index of NAMESPACES, see _compile_namespaces()
+        self._curies = {}  # URI -> CURIE memo for _get_curie()
+        self._uri_namespaces = {}  # URI -> namespace memo for _get_namespace_from_uri()
         self.FIDS = {}
+        self._fids = FidAllocator(self.FIDS)  # allocates FIDS, see _make_fid()
         self.METADATA = {}
+        self.RDF_COLLECTIONS = None  # collection node -> (type, members), see _extract_rdf_collections()
+        self._adjacency = None  # a pylode.adjacency.AdjacencyIndex of self.G, if the profile's extractors use one
+        self._model = None  # the format-neutral model, as extracted by _prepare()
+        self.fragments = None  # a pylode.fragments.FragmentStore, for incremental regeneration
+        self.instrument = None  # a pylode.instrument.Instrument, to record the time etc. each phase takes
+        self._fragment_context = None  # (outputformat, key) of what all fragments depend on, see _make_fragment()
+        self.expansion_stats = None  # {rule name: triples matched} of the last _expand_graph()
 
     def _filter_graph_by_language(self, g, language):
-        filtered = Graph()
-
-        for s, p, o in g:
-            if not type(o) is Literal or not o.language or o.language == language:
-                filtered.add((s, p, o))
-
-        for k, v in g.namespaces():
-            filtered.bind(k, v)
-
-        return filtered
+        # an overlay on a read-only view of g, not a copy: g, and the view, which may be shared, are left untouched by
+        # _expand_graph()
+        return language_filtered_view(g, language)
 
     def _load_template(self, template_file):
-        return Environment(loader=FileSystemLoader(TEMPLATES_DIR)).get_template(template_file)
+        return get_template(template_file)
 
     def _expand_graph(self):
+        """Expands the graph with the profile's EXPANSION_RULES, in one pass"""
+        self.expansion_stats = expand(self.G, self.EXPANSION_RULES)
+
+    def _extract_model(self):
+        """Abstract method: extracts this profile's format-neutral model from self.G, e.g. CLASSES. The model holds
+        raw URIs, literals & text only. All formatting for an output format is done when rendering it"""
+
+    def _phase(self, name):
+        """A context in which a phase of making a document, e.g. expanding the graph, is run, for instrumentation"""
+        return self.instrument.phase(name) if self.instrument is not None else nullcontext()
+
+    def get_model(self):
+        """Returns this profile's format-neutral model, keyed by model attribute (see MODEL), e.g. to cache it"""
+        self._prepare()
+        return dict(self._model)
+
+    def set_model(self, model):
+        """Uses a model from get_model(), for the same RDF & profile, instead of extracting one from self.G"""
+        for k in self.MODEL:
+            setattr(self, k, model[k])
+        self._fids = FidAllocator(self.FIDS)
+        self._model = dict(model)
+        self._compile_namespaces()
+
+    def _prepare(self):
+        """Expands the graph and extracts the format-neutral model once only. Further documents, in any output
+        format, are rendered from the same model"""
+        if self._model is None:
+            # expand the graph using pre-defined rules to make querying easier (poor man's inference)
+            with self._phase("expand_graph"):
+                self._expand_graph()
+            # get all the namespaces using several methods
+            with self._phase("extract_namespaces"):
+                self._extract_namespaces()
+            # get the default namespace
+            with self._phase("get_default_namespace"):
+                self._get_default_namespace()
+            with self._phase("extract_model"):
+                self._extract_model()
+            self._model = {k: getattr(self, k) for k in self.MODEL}
+            self._model["NAMESPACES"] = collections.OrderedDict(self.NAMESPACES)
+        else:
+            # rendering namespaces removes the default namespace from NAMESPACES
+            self.NAMESPACES = collections.OrderedDict(self._model["NAMESPACES"])
+            self._compile_namespaces()
+
+    @property
+    def renderer(self):
+        return RENDERERS[self.outputformat]
+
+    def generate_document(self):
         """Abstract method"""
 
+    def stream_document(self):
+        """Generates a document in pieces, for writing out as it is made rather than holding all of it in memory.
+        Profiles that don't render in pieces yield the whole document at once"""
+        yield self.generate_document()
+
+    def generate_documents(self, outputformats):
+        """Generates a document in each of outputformats from this profile's graph, returned as a dict keyed by
+        format. The graph is only expanded, and namespaces extracted, once"""
+        docs = {}
+        for outputformat in outputformats:
+            self.outputformat = outputformat
+            docs[outputformat] = self.generate_document()
+        return docs
+
     # TODO: replace this with rdflib native method
     def _get_namespace_from_uri(self, uri):
+        if uri in self._uri_namespaces:
+            return self._uri_namespaces[uri]
+
         # split on hash
         segments = uri.split("#")
         if len(segments) == 2:
-            return segments[0] + "#"
+            namespace = segments[0] + "#"
         else:
             segments = uri.split("/")
             if len(segments) > 1:
-                return "/".join(segments[0:-1]) + "/"
+                namespace = "/".join(segments[0:-1]) + "/"
             else:
-                return None
+                namespace = None
+        self._uri_namespaces[uri] = namespace
+        return namespace
 
     def _get_uri_id(self, uri):
         # split on hash
@@ -70,15 +153,7 @@ class BaseProfile:
             return uri.split("/")[-1]  # could return None if URI ends in /
 
     def _make_formatted_uri_basic(self, uri):
-        curie = self._get_curie(uri)
-
-        links = {
-            "md": f"[{curie}]({uri})",
-            "adoc": f"link:{uri}[{curie}]",
-            "html": f'<a href="{uri}">{curie}</a>'
-        }
-
-        return links[self.outputformat]
+        return self.renderer.link(uri, self._get_curie(uri))
 
     def _make_fragment_uri(self, uri):
         """This function should be overriden with profile-specific implementations
@@ -92,41 +167,45 @@ class BaseProfile:
             # URI isn't in the default namespace, so use an absolut URI
             return self._make_formatted_uri_basic(uri)
 
-    def _get_curie(self, uri):
-        n = self._get_namespace_from_uri(str(uri))
+    def _compile_namespaces(self):
+        """Indexes NAMESPACES by namespace URI for _get_curie() and resets its URI -> CURIE memo
+
+        Must be called whenever NAMESPACES changes. A namespace is indexed both as-is and stripped of any leading or
+        trailing slashes & hashes, with the first prefix in NAMESPACES' order winning, as per a linear scan."""
+        index = {}
         for k, v in self.NAMESPACES.items():
-            if v == n or v.strip("/#") == n:
-                if k == ":":
-                    return "{}".format(self._get_uri_id(uri))
-                else:
-                    return "{}:{}".format(k, self._get_uri_id(uri))
+            index.setdefault(v, k)
+            index.setdefault(v.strip("/#"), k)
+        self._namespace_prefixes = index
+        self._curies = {}
+        self._fragment_context = None
 
-        # if no match, return the original URI
-        return uri
+    def _get_curie(self, uri):
+        curie = self._curies.get(uri)
+        if curie is not None:
+            return curie
+
+        if self._namespace_prefixes is None:
+            self._compile_namespaces()
+
+        k = self._namespace_prefixes.get(self._get_namespace_from_uri(str(uri)))
+        if k is None:
+            # if no match, return the original URI
+            curie = uri
+        elif k == ":":
+            curie = "{}".format(self._get_uri_id(uri))
+        else:
+            curie = "{}:{}".format(k, self._get_uri_id(uri))
 
-    def _get_curie_prefix(uself, uri, existing_curies):
+        self._curies[uri] = curie
+        return curie
+
+    def _get_curie_prefix(self, uri, existing_curies, online_prefixes=None):
+        """Returns a prefix for a namespace: a stored one, else one looked up online, from online_prefixes as
+        returned by pylode.prefixlookup.lookup_prefixes(), else one made up from the namespace"""
         ns_count = 0
 
-        from curies import CURIES
-
-        # TODO: replace this with a once-per run update CURIES function
-        def get_curie_online(uri):
-            import requests
-            try:
-                r = requests.get(
-                    "http://prefix.cc/reverse", params={"uri": uri, "format": "txt"}
-                )
-                if r.status_code == 200:
-                    # primitive check to see if it really is prefix.cc replying with a text/plain response
-                    if r.headers["Content-Type"] == "text/plain":
-                        return r.text.split("\t")[0]
-                    else:
-                        return None
-                else:
-                    return None
-            except requests.exceptions.ConnectionError:
-                # presumably this module can't access the internet or prefix.cc is down
-                return None
+        from pylode.curies import PREFIXES
 
         def get_curie_from_namespace(uri, existing_curies, ns_count):
             # strip off trailing hash or slash and return last path segment
@@ -140,19 +219,68 @@ class BaseProfile:
             return c
 
         # attempt to look up the well-known curie for this Namespace in http://prefix.cc dump
-        for k, v in CURIES.items():
-            if v == uri:
-                return k
-
-        # attempt to look up the well-known CURIE for this Namespace using http://prefix.cc online (more up-to-date)
-        c = get_curie_online(uri)
+        c = PREFIXES.prefix_for(uri)
         if c is not None:
             return c
 
+        # attempt to look up the well-known CURIE for this Namespace using http://prefix.cc online (more up-to-date)
+        if online_prefixes is not None:
+            c = online_prefixes.get(uri)
+            if c is not None:
+                return c
+
         # can't find CURIE online so make up one
         c = get_curie_from_namespace(uri, existing_curies, ns_count)
         return c if c is not None else ""
 
+    def _extract_rdf_collections(self):
+        """Walks every owl:unionOf & owl:intersectionOf RDF list in the graph once, caching each collection node's
+        type and list of members in RDF_COLLECTIONS"""
+        self.RDF_COLLECTIONS = {}
+        for col_type in [OWL.unionOf, OWL.intersectionOf]:
+            for node, head in self.G.subject_objects(predicate=col_type):
+                if node in self.RDF_COLLECTIONS:
+                    continue
+
+                members = []
+                seen = set()  # guard against malformed, circular, lists
+                while head is not None and head != RDF.nil and head not in seen:
+                    seen.add(head)
+                    member = self.G.value(subject=head, predicate=RDF.first)
+                    if member is not None:
+                        members.append(member)
+                    head = self.G.value(subject=head, predicate=RDF.rest)
+
+                self.RDF_COLLECTIONS[node] = (col_type, members)
+
+    def _extract_restriction(self, restriction_bn):
+        """Returns a Restriction's predicates & objects, other than rdf:type, with collection objects resolved"""
+        restriction = []
+        g = self._adjacency if self._adjacency is not None else self.G
+        for p2, o2 in g.predicate_objects(restriction_bn):
+            if p2 != RDF.type:
+                if p2 in [OWL.onClass, OWL.allValuesFrom, OWL.someValuesFrom] and type(o2) == BNode:
+                    # onClass / someValuesFrom collections (unionOf | intersectionOf
+                    o2 = self._get_collection(o2)
+                restriction.append((p2, o2))
+
+        return restriction
+
+    def _get_collection(self, node, curie_members=False):
+        """Returns the CURIE of a union or intersection collection node's type and its members' URIs, as CURIEs if
+        curie_members is True, or (None, []) if the node isn't such a collection"""
+        if self.RDF_COLLECTIONS is None:
+            self._extract_rdf_collections()
+
+        collection = self.RDF_COLLECTIONS.get(node)
+        if collection is None:
+            return None, []
+
+        col_type, members = collection
+        if curie_members:
+            return self._get_curie(str(col_type)), [self._get_curie(str(m)) for m in members]
+        return self._get_curie(str(col_type)), [str(m) for m in members]
+
     def _make_title_from_uri(self, uri):
         # can't tolerate any URI faults so return None if anything is wrong
 
@@ -179,65 +307,63 @@ class BaseProfile:
         """
         First we get the namespaces from rdflib
 
-        Then we cycle through all the URIs in the graph (all s, p & o),
-            create a set of them,
-            extract their base URIS (i.e. a non-duplicative list of them)
+        Then we cycle through all the triples in the graph, collecting the distinct terms (s, p & o) of those not
+            excluded,
+            extract the base URIs of the distinct URIs (i.e. a non-duplicative list of them), so each URI is only
+                split once however many triples it's in
             see if they are in the namespaces,
                 if not, generate their CURIE and add them to namespaces
         """
         # get declared namespaces, keyed by URI
         ns = {}
-        uri_bases = set()
         for k, v in self.G.namespaces():
             ns[str(v)] = k
 
-        # get other namespaces by extracting base URIs from all URIs
+        # get other namespaces by extracting base URIs from all distinct URIs
+        # exclude certain annotation URIs
+        # and individuals (SDO.identifier)
+        excluded_predicates = {OWL.versionIRI, OWL.imports, SDO.identifier}
+        subjects = set()
+        predicates = set()
+        objects = set()
         for s, p, o in self.G:
-            # exclude certain annotation URIs
-            # and individuals (SDO.identifier)
             # exclude known annoying URIs (ORCID)
-            if (
-                p == OWL.versionIRI
-                or p == OWL.imports
-                or p == SDO.identifier
-                or str(o).startswith("https://orcid")
-            ):
-                pass
-            else:
-                # add only URI subjects (not Blank Nodes)
-                if type(s) == URIRef:
-                    uri_bases.add(self._get_namespace_from_uri(str(s)))
-
-                # predicates are always URIs so add them all
-                uri_bases.add(self._get_namespace_from_uri(str(p)))
-
-                # add only URI objects (not Blank Nodes or Literals), exclude emails
-                if type(o) == URIRef and "@" not in str(o):
-                    uri_bases.add(self._get_namespace_from_uri(str(o)))
+            if p in excluded_predicates or o.startswith("https://orcid"):
+                continue
+            subjects.add(s)
+            predicates.add(p)
+            if type(o) == URIRef:  # Literals' hashing is slow & they're not wanted
+                objects.add(o)
+
+        # add only URI subjects (not Blank Nodes), predicates are always URIs so add them all, and only URI objects
+        # (not Blank Nodes or Literals), excluding emails
+        uris = {str(s) for s in subjects if type(s) == URIRef}
+        uris.update(str(p) for p in predicates)
+        uris.update(str(o) for o in objects if "@" not in o)
+        uri_bases = {self._get_namespace_from_uri(uri) for uri in uris}
 
         # for the de-duplicated URIs, if the uri_base is not in namespaces, get CURIE and add it
-        for uri_base in uri_bases:
+        from pylode.curies import PREFIXES
+
+        unknown = []
+        for uri_base in sorted(uri_bases, key=str):  # a base may be None
             if ns.get(uri_base) is None:
-                found = False
                 # try to match uri_base to stored CURIES first
-                if self.use_curies_stored:
-                    from pylode.curies import CURIES
-
-                    try:
-                        ns[uri_base] = list(CURIES.keys())[list(CURIES.values()).index(uri_base)]
-                        found = True
-                    except ValueError:
-                        pass
+                prefix = PREFIXES.prefix_for(uri_base) if self.use_curies_stored else None
+                if prefix is not None:
+                    ns[uri_base] = prefix
+                else:
+                    unknown.append(uri_base)
 
-                if not found:
-                    if self.get_curies_online:
-                        print(f"getting CURIE for {uri_base} online")
-                        uri_prefix = self._get_curie_prefix(uri_base, [x for x in ns.values()])
-                        ns[uri_base] = uri_prefix
-                        found = True
+        if self.get_curies_online and len(unknown) > 0:
+            # look up all the remaining namespaces, concurrently, in one batch
+            from pylode.prefixlookup import lookup_prefixes
 
-                # if not found:
-                #     ns[uri_base] = "ns" + str(len(ns))
+            to_look_up = [x for x in unknown if PREFIXES.prefix_for(x) is None]
+            print(f"getting CURIEs for {len(to_look_up)} namespaces online")
+            online_prefixes = lookup_prefixes(to_look_up) if len(to_look_up) > 0 else {}
+            for uri_base in unknown:
+                ns[uri_base] = self._get_curie_prefix(uri_base, [x for x in ns.values()], online_prefixes)
 
         # invert the key/values in instances
         for k, v in sorted(ns.items(), key=lambda x: x[1]):
@@ -247,6 +373,7 @@ class BaseProfile:
                 self.NAMESPACES[v] = k
 
         del(self.NAMESPACES["xml"])  # that bloody XML namespace has to go!
+        self._compile_namespaces()
 
     def _get_default_namespace(self):
         self.METADATA["default_namespace"] = None
@@ -298,6 +425,8 @@ class BaseProfile:
                 # can't find either a declared or default namespace so we have an error
                 raise Exception("pyLODE can't detect a URI for an owl:Ontology, a skos:ConceptScheme or a prof:Profile")
 
+        self._compile_namespaces()
+
     def _make_namespaces(self):
         # if the default namespace is also listed in NAMESPACES, remove it and replace the default key (:) with its key
         default_ns_prefix = self.METADATA.get("default_prefix")
@@ -308,6 +437,7 @@ class BaseProfile:
 
         for r in for_removal:
             del(self.NAMESPACES[r])
+        self._compile_namespaces()
 
         return BaseProfile._load_template(self, "namespaces." + self.outputformat).render(
             namespaces=self.NAMESPACES,
@@ -317,57 +447,11 @@ class BaseProfile:
 
     # makes the fragment ID for a class, property, Named Individual (any entity) based on URI or name
     def _make_fid(self, title, uri):
-        # does this URI already have a fid?
-        existing_fid = self.FIDS.get(uri)
-        if existing_fid is not None:
-            return existing_fid
-
-        # if we get here, there is no fid, so make one
-        def _remove_non_ascii_chars(s):
-            return "".join(j for j in s if ord(j) < 128).replace("&", "")
-
-        # try creating an ID from label
-        # lowercase, remove spaces, escape all non-ASCII chars
-        if title is not None:
-            fid = _remove_non_ascii_chars(title.replace(" ", ""))
+        return self._fids.allocate(title, uri)
 
-            # do not return fid if it's already in use
-            if fid not in self.FIDS.values():
-                self.FIDS[uri] = fid
-                return fid
-
-        # this fid is already present so generate a new one from the URI instead
-
-        # split URI for last slash segment
-        segments = uri.split("/")
-        # return None for empty string - URI ends in slash
-        if len(segments[-1]) < 1:
-            return None
-
-        # return None for domains, i.e. ['http:', '', '{domain}'] - no path segments
-        if len(segments) < 4:
-            return None
-
-        # split out hash URIs
-        # remove any training hashes
-        if segments[-1].endswith("#"):
-            return None
-
-        fid = (
-            segments[-1].split("#")[-1]
-            if segments[-1].split("#")[-1] != ""
-            else segments[-1].split("#")[-2]
-        )
-        # fid = fid.lower()
-
-        # do not return fid if it's already in use
-        if fid not in self.FIDS.values():
-            self.FIDS[uri] = fid
-            return fid
-        else:
-            # since it's in use but we've exhausted generation options, just add 1 to existing fid name
-            self.FIDS[uri] = fid + "1"
-            return fid + "1"  # yeah yeah, there could be more than one but unlikely
+    def _make_fids(self, entities):
+        """Makes the fragment IDs of many entities, in order, from (title, URI) pairs, returning {URI: ID}"""
+        return self._fids.allocate_all(entities)
 
     def _make_schemaorg_metadata(self):
         uri = URIRef(self.METADATA.get("uri"))
@@ -379,30 +463,20 @@ class BaseProfile:
         if self.METADATA.get("modified") is not None:
             date_modified = Literal(self.METADATA.get("modified"), datatype=XSD.date)
         if self.METADATA.get("description") is not None:
-            description = Literal(self.METADATA.get("description"))
+            description = Literal(self.renderer.text(self.METADATA.get("description")))
         if self.METADATA.get("license") is not None:
-            if self.outputformat == "md":
-                license = URIRef(self.METADATA.get("license").split('(')[0].strip('[]'))
-            elif self.outputformat == "adoc":
-                license = URIRef(self.METADATA.get("license").replace("link:", "").split("[")[0])
-            else:
-                license = URIRef(self.METADATA.get("license").split('"')[1])
+            license = URIRef(self.METADATA.get("license"))
         else:
             license = None
         if self.METADATA.get("rights") is not None:
-            rights = Literal(self.METADATA.get("rights"))
+            rights = Literal(self._make_rights(self.METADATA.get("rights")))
         copyright_holder = ""
         if self.METADATA.get("created") is not None:
             copyright_year = Literal(
                 self.METADATA.get("created").split("-")[0], datatype=XSD.int
             )
         if self.METADATA.get("repository") is not None:
-            if self.outputformat == "md":
-                repository = URIRef(self.METADATA.get("repository").split('(')[0].strip('[]'))
-            if self.outputformat == "adoc":
-                repository = URIRef(self.METADATA.get("repository").replace("link:", "").split("[")[0])
-            else:
-                repository = URIRef(self.METADATA.get("repository").split('"')[1])
+            repository = URIRef(self.METADATA.get("repository"))
 
         """
         @prefix sdo: <https://schema.org/> .
@@ -466,6 +540,75 @@ class BaseProfile:
         register('json-ld', Serializer, 'rdflib.plugins.serializers.jsonld', 'JsonLDSerializer')
         return g.serialize(format="json-ld", encoding="utf-8")  # support >= rdflib 6.0.0 and ensure backwards compat (last python 2 release)
 
+    def _make_text(self, text):
+        """Formats multi-line text, e.g. a description, which may contain Markdown"""
+        return self.renderer.text(text) if text is not None else None
+
+    def _link_target(self, uri):
+        """Returns what a link to uri, within this document, is made from, e.g. the title & fragment ID of the Class it
+        identifies, or None if links to it are made from the URI alone. Overridden by profiles that make such links"""
+        return None
+
+    def _make_fragment(self, uri, entity, make, *args):
+        """Renders an entity, e.g. a Class, with make(*args) or, when regenerating incrementally, reuses its fragment
+        from a previous run if nothing its rendering depends on has changed
+
+        A fragment depends on the entity's model, e.g. its dict in CLASSES, on the _link_target() of every URI it
+        links to, and on this document's namespaces, default namespace & output format.
+        """
+        if self.fragments is None:
+            return make(*args)
+
+        from pylode import __version__
+        from pylode.fragments import make_key
+
+        if self._fragment_context is None or self._fragment_context[0] != self.outputformat:
+            self._fragment_context = (self.outputformat, make_key(
+                __version__,
+                type(self).__name__,
+                self.outputformat,
+                self.METADATA.get("default_namespace"),
+                self.NAMESPACES,
+            ))
+
+        linked = []
+        for u in sorted(set(self._find_uris(entity))):
+            target = self._link_target(u)
+            if target is not None:
+                linked.append((u, target))
+
+        key = make_key(self._fragment_context[1], make.__name__, uri, entity, linked)
+        return self.fragments.get(self.outputformat, key, lambda: make(*args))
+
+    @staticmethod
+    def _find_uris(value):
+        """Yields all the strings, including URIs, within a model value"""
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for v in value.values():
+                yield from BaseProfile._find_uris(v)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for v in value:
+                yield from BaseProfile._find_uris(v)
+
+    def _make_optional_uri(self, uri):
+        return self._make_formatted_uri(uri) if uri is not None else None
+
+    def _make_uri_or_text(self, value):
+        """Formats value as a link if it's a URI, otherwise leaves it as text"""
+        if value is not None and value.startswith("http"):
+            return self._make_formatted_uri(value)
+        return value
+
+    def _make_rights(self, rights):
+        if rights is None:
+            return None
+        return rights.replace("Copyright", "&copy;").replace("copyright", "&copy;").replace("(c)", "&copy;")
+
+    def _make_agents(self, agents):
+        return sorted({self._make_agent(agent) for agent in agents})
+
     def _make_agent_link(self, name, url=None, email=None, affiliation=None):
         if self.outputformat == "md":
             orcid = None
@@ -515,7 +658,8 @@ class BaseProfile:
                 affiliation=affiliation
             )
 
-    def _make_agent(self, agent_node):
+    def _extract_agent(self, agent_node):
+        """Returns an Agent's (name, url, email, org_name, org_url, org_email)"""
         # we understand foaf:name, foaf:homepage & sdo:name & sdo:identifier & sdo:email (as a URI)
         # TODO: cater for other Agent representations
 
@@ -545,6 +689,14 @@ class BaseProfile:
             if url is None and type(agent_node) == URIRef:
                 url = str(agent_node)
 
+        return name, url, email, org_name, org_url, org_email
+
+    def _make_agent(self, agent):
+        """Formats an Agent, either a Literal or as given by _extract_agent()"""
+        if type(agent) == Literal:
+            return str(agent)
+
+        name, url, email, org_name, org_url, org_email = agent
         agent = self._make_agent_link(name, url=url, email=email)
 
         if org_name is not None:
@@ -560,18 +712,7 @@ class BaseProfile:
             uri_of_rdf = self.source_info[0]
         else:
             uri_of_rdf = self.source_info[0].split("/")[-1]
-        if self.outputformat == "md":
-            return 'RDF ([{}]({}))'.format(
-                uri_of_rdf, self.source_info[1]
-            )
-        if self.outputformat == "adoc":
-            return 'RDF link:{}[{}]'.format(
-                uri_of_rdf, self.source_info[1]
-            )
-        else:
-            return '<a href="{}">RDF ({})</a>'.format(
-                uri_of_rdf, self.source_info[1]
-            )
+        return self.renderer.source_file_link(uri_of_rdf, self.source_info[1])
 
     def generate_document(self):
         if self.ouputformat == "md":
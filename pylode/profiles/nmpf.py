@@ -1,17 +1,36 @@
 from pylode import __version__
-from pylode.common import TEMPLATES_DIR, STYLE_DIR
+from pylode.common import STYLE_DIR
 import collections
 from os import path
 from itertools import chain
 import markdown
-from jinja2 import Environment, FileSystemLoader
-from os.path import join
 from rdflib import URIRef, BNode, Literal
 from rdflib.namespace import DC, DCTERMS, DOAP, OWL, PROV, RDF, RDFS, SDO, SKOS
+from pylode.adjacency import AdjacencyIndex
+from pylode.expansion import AGENT_RULES, Copy, InferType, SubjectType
 from pylode.profiles.base import BaseProfile
+from pylode.templating import get_template
 
 
 class NMPF(BaseProfile):
+    MODEL = BaseProfile.MODEL + ["CLASSES", "PROPERTIES", "NAMED_INDIVIDUALS"]
+    EXPANSION_RULES = [
+        Copy("name", [DC.title, RDFS.label, SKOS.prefLabel, SDO.name], DCTERMS.title),
+        Copy("description", [DC.description, RDFS.comment, SKOS.definition, SDO.description], DCTERMS.description),
+        InferType(
+            "property types",
+            [OWL.ObjectProperty, OWL.FunctionalProperty, OWL.DatatypeProperty, OWL.AnnotationProperty],
+            RDF.Property,
+        ),
+        InferType("class types", [OWL.Class], RDFS.Class),
+        # owl:Restrictions from Blank Nodes
+        SubjectType("restrictions", OWL.onProperty, OWL.Restriction),
+    ] + AGENT_RULES
+    # the predicates of the Classes' & Properties' incoming edges, e.g. their sub Classes, see AdjacencyIndex
+    ADJACENCY_PREDICATES = [
+        RDF.type, RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, SDO.domainIncludes, RDFS.range, SDO.rangeIncludes
+    ]
+
     def __init__(
             self,
             g,
@@ -47,146 +66,70 @@ class NMPF(BaseProfile):
             j.join([self._make_formatted_uri(x, type="c") for x in col_members])
         )
 
-    def _make_restriction_html(self, subject, restriction_bn):
+    def _make_restriction_html(self, restriction):
         prop = None
         card = None
         cls = None
 
-        for p2, o2 in self.G.predicate_objects(subject=restriction_bn):
-            if p2 != RDF.type:
-                if p2 == OWL.onProperty:
-                    # TODO: add the property type for HTML
-                    t = None
-                    if str(o2) in self.PROPERTIES.keys():
-                        t = self.PROPERTIES[str(o2)]["prop_type"]
-                    prop = self._make_formatted_uri(str(o2), t)
-                elif p2 == OWL.onClass:
-                    """
-                    domains = []
-                    for o in self.G.objects(subject=s, predicate=RDFS.domain):
-                        if type(o) != BNode:
-                            domains.append(str(o))  # domains that are just classes
-                        else:
-                            # domain collections (unionOf | intersectionOf
-                            q = '''
-                                PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                                PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                                SELECT ?col_type ?col_member
-                                WHERE {{
-                                    <{}> rdfs:domain ?domain .
-                                    ?domain owl:unionOf|owl:intersectionOf ?collection .
-                                    ?domain ?col_type ?collection .
-                                    ?collection rdf:rest*/rdf:first ?col_member .
-                                }}
-                            '''.format(s)
-                            collection_type = None
-                            collection_members = []
-                            for r in self.G.query(q):
-                                collection_type = self._get_curie(str(r.col_type))
-                                collection_members.append(str(r.col_member))
-                            domains.append((collection_type, collection_members))
-                    self.PROPERTIES[prop]['domains'] = domains
-
-                    """
-                    if type(o2) == BNode:
-                        # onClass collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{}> owl:onClass ?onClass .
-                                ?onClass owl:unionOf|owl:intersectionOf ?collection .
-                                ?onClass ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            str(subject)
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
-
-                        cls = self._make_collection_class_html(
-                            collection_type, collection_members
-                        )
-                    else:
-                        cls = self._make_formatted_uri(str(o2), type="c")
-                elif p2 in [
-                    OWL.cardinality,
-                    OWL.qualifiedCardinality,
-                    OWL.minCardinality,
-                    OWL.minQualifiedCardinality,
-                    OWL.maxCardinality,
-                    OWL.maxQualifiedCardinality,
-                ]:
-                    if p2 in [OWL.minCardinality, OWL.minQualifiedCardinality]:
-                        card = "min"
-                    elif p2 in [OWL.maxCardinality, OWL.maxQualifiedCardinality]:
-                        card = "max"
-                    elif p2 in [OWL.cardinality, OWL.qualifiedCardinality]:
-                        card = "exactly"
-
-                    if self.outputformat == "md":
-                        card = '**{}** {}'.format(
-                            card, str(o2)
-                        )
-                    else:
-                        card = '<span class="cardinality">{}</span> {}'.format(
-                            card, str(o2)
-                        )
-                elif p2 in [OWL.allValuesFrom, OWL.someValuesFrom]:
-                    if p2 == OWL.allValuesFrom:
-                        card = "only"
-                    else:  # p2 == OWL.someValuesFrom
-                        card = "some"
-
-                    if type(o2) == BNode:
-                        # someValuesFrom collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{0}> ?x _:{1} .
-                                _:{1} owl:someValuesFrom|owl:allValuesFrom ?bn2 .
-                                ?bn2 owl:unionOf|owl:intersectionOf ?collection .
-                                ?s ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            str(subject), str(o2)
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
-
-                        c = self._make_collection_class_html(
-                            collection_type, collection_members
-                        )
-                    else:
-                        c = self._make_formatted_uri(str(o2), type="c")
+        for p2, o2 in restriction:
+            if p2 == OWL.onProperty:
+                # TODO: add the property type for HTML
+                t = None
+                if str(o2) in self.PROPERTIES.keys():
+                    t = self.PROPERTIES[str(o2)]["prop_type"]
+                prop = self._make_formatted_uri(str(o2), t)
+            elif p2 == OWL.onClass:
+                if type(o2) == tuple:
+                    cls = self._make_collection_class_html(o2[0], o2[1])
+                else:
+                    cls = self._make_formatted_uri(str(o2), type="c")
+            elif p2 in [
+                OWL.cardinality,
+                OWL.qualifiedCardinality,
+                OWL.minCardinality,
+                OWL.minQualifiedCardinality,
+                OWL.maxCardinality,
+                OWL.maxQualifiedCardinality,
+            ]:
+                if p2 in [OWL.minCardinality, OWL.minQualifiedCardinality]:
+                    card = "min"
+                elif p2 in [OWL.maxCardinality, OWL.maxQualifiedCardinality]:
+                    card = "max"
+                elif p2 in [OWL.cardinality, OWL.qualifiedCardinality]:
+                    card = "exactly"
+
+                if self.outputformat == "md":
+                    card = '**{}** {}'.format(
+                        card, str(o2)
+                    )
+                else:
+                    card = '<span class="cardinality">{}</span> {}'.format(
+                        card, str(o2)
+                    )
+            elif p2 in [OWL.allValuesFrom, OWL.someValuesFrom]:
+                if p2 == OWL.allValuesFrom:
+                    card = "only"
+                else:  # p2 == OWL.someValuesFrom
+                    card = "some"
+
+                if type(o2) == tuple:
+                    c = self._make_collection_class_html(o2[0], o2[1])
+                else:
+                    c = self._make_formatted_uri(str(o2), type="c")
 
-                    if self.outputformat == "md":
-                        card = '**{}** {}'.format(card, c)
-                    else:
-                        card = '<span class="cardinality">{}</span> {}'.format(card, c)
-                elif p2 == OWL.hasValue:
-                    if self.outputformat == "md":
-                        card = '**value** {}'.format(
-                            self._make_formatted_uri(str(o2), type="c")
-                        )
-                    else:
-                        card = '<span class="cardinality">value</span> {}'.format(
-                            self._make_formatted_uri(str(o2), type="c")
-                        )
+                if self.outputformat == "md":
+                    card = '**{}** {}'.format(card, c)
+                else:
+                    card = '<span class="cardinality">{}</span> {}'.format(card, c)
+            elif p2 == OWL.hasValue:
+                if self.outputformat == "md":
+                    card = '**value** {}'.format(
+                        self._make_formatted_uri(str(o2), type="c")
+                    )
+                else:
+                    card = '<span class="cardinality">value</span> {}'.format(
+                        self._make_formatted_uri(str(o2), type="c")
+                    )
 
         restriction = prop + " " + card if card is not None else prop
         restriction = restriction + " " + cls if cls is not None else restriction
@@ -194,7 +137,7 @@ class NMPF(BaseProfile):
         return restriction
 
     def _load_template(self, template_file):
-        return Environment(loader=FileSystemLoader(join(TEMPLATES_DIR, "ontdoc"))).get_template(template_file)
+        return get_template(template_file, "ontdoc")
 
     def _make_formatted_uri(self, uri, type=None):
         # set display to CURIE
@@ -259,71 +202,8 @@ class NMPF(BaseProfile):
 
         return link + suffix
 
-    def _expand_graph(self):
-        # name
-        for s, o in chain(
-                self.G.subject_objects(DC.title),
-                self.G.subject_objects(RDFS.label),
-                self.G.subject_objects(SKOS.prefLabel),
-                self.G.subject_objects(SDO.name)
-        ):
-            self.G.add((s, DCTERMS.title, o))
-
-        # description
-        for s, o in chain(
-                self.G.subject_objects(DC.description),
-                self.G.subject_objects(RDFS.comment),
-                self.G.subject_objects(SKOS.definition),
-                self.G.subject_objects(SDO.description)
-        ):
-            self.G.add((s, DCTERMS.description, o))
-
-        # property types
-        for s in chain(
-                self.G.subjects(RDF.type, OWL.ObjectProperty),
-                self.G.subjects(RDF.type, OWL.FunctionalProperty),
-                self.G.subjects(RDF.type, OWL.DatatypeProperty),
-                self.G.subjects(RDF.type, OWL.AnnotationProperty)
-        ):
-            self.G.add((s, RDF.type, RDF.Property))
-
-        # class types
-        for s in self.G.subjects(RDF.type, OWL.Class):
-            self.G.add((s, RDF.type, RDFS.Class))
-
-        # owl:Restrictions from Blank Nodes
-        for s in self.G.subjects(OWL.onProperty):
-            self.G.add((s, RDF.type, OWL.Restriction))
-
-        # Agents
-        # creator
-        for s, o in chain(
-                self.G.subject_objects(DC.creator),
-                self.G.subject_objects(SDO.creator),
-                self.G.subject_objects(SDO.author)  # conflate SDO.author with DCTERMS.creator
-        ):
-            self.G.remove((s, DC.creator, o))
-            self.G.remove((s, SDO.creator, o))
-            self.G.remove((s, SDO.author, o))
-            self.G.add((s, DCTERMS.creator, o))
-
-        # contributor
-        for s, o in chain(
-                self.G.subject_objects(DC.contributor),
-                self.G.subject_objects(SDO.contributor)
-        ):
-            self.G.remove((s, DC.contributor, o))
-            self.G.remove((s, SDO.contributor, o))
-            self.G.add((s, DCTERMS.contributor, o))
-
-        # publisher
-        for s, o in chain(
-                self.G.subject_objects(DC.publisher),
-                self.G.subject_objects(SDO.publisher)
-        ):
-            self.G.remove((s, DC.publisher, o))
-            self.G.remove((s, SDO.publisher, o))
-            self.G.add((s, DCTERMS.publisher, o))
+    def _make_markdown(self, text):
+        return markdown.markdown(text) if text is not None else None
 
     def _extract_metadata(self):
         if len(self.CLASSES.keys()) > 0:
@@ -364,16 +244,16 @@ class NMPF(BaseProfile):
 
             for p, o in self.G.predicate_objects(subject=s):
                 if p == OWL.imports:
-                    self.METADATA["imports"].add(self._make_formatted_uri(o))
+                    self.METADATA["imports"].add(str(o))
 
                 if p == DCTERMS.title:
                     self.METADATA["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    self.METADATA["description"] = markdown.markdown(str(o))
+                    self.METADATA["description"] = str(o)
 
                 if p == SKOS.historyNote:
-                    self.METADATA["historyNote"] = markdown.markdown(str(o))
+                    self.METADATA["historyNote"] = str(o)
 
                 # dates
                 if p in [DCTERMS.created, DCTERMS.modified, DCTERMS.issued]:
@@ -381,13 +261,10 @@ class NMPF(BaseProfile):
                     self.METADATA[date_type] = str(o)
 
                 if p == DCTERMS.source:
-                    if str(o).startswith('http'):
-                        self.METADATA["source"] = self._make_formatted_uri(o)
-                    else:
-                        self.METADATA["source"] = str(o)
+                    self.METADATA["source"] = str(o)
 
                 if p == OWL.versionIRI:
-                    self.METADATA["versionIRI"] = self._make_formatted_uri(o)
+                    self.METADATA["versionIRI"] = str(o)
 
                 if p == OWL.versionInfo:
                     self.METADATA["versionInfo"] = str(o)
@@ -399,19 +276,10 @@ class NMPF(BaseProfile):
                     self.METADATA["preferredNamespaceUri"] = str(o)
 
                 if p == DCTERMS.license:
-                    self.METADATA["license"] = (
-                        self._make_formatted_uri(o)
-                        if str(o).startswith("http")
-                        else str(o)
-                    )
+                    self.METADATA["license"] = str(o)
 
                 if p == DCTERMS.rights:
-                    self.METADATA["rights"] = (
-                        str(o)
-                            .replace("Copyright", "&copy;")
-                            .replace("copyright", "&copy;")
-                            .replace("(c)", "&copy;")
-                    )
+                    self.METADATA["rights"] = str(o)
 
                 # Agents
                 if p in [
@@ -419,16 +287,16 @@ class NMPF(BaseProfile):
                 ]:
                     agent_type = p.split("/")[-1] + "s"
                     if type(o) == Literal:
-                        self.METADATA[agent_type].add(str(o))
+                        self.METADATA[agent_type].add(o)
                     else:  # Blank Node or URI
-                        self.METADATA[agent_type].add(self._make_agent(o))
+                        self.METADATA[agent_type].add(self._extract_agent(o))
 
                 if p == PROV.wasGeneratedBy:
                     for o2 in self.G.objects(subject=o, predicate=DOAP.repository):
-                        self.METADATA["repository"] = self._make_formatted_uri(o2)
+                        self.METADATA["repository"] = str(o2)
 
                 if p == SDO.codeRepository:
-                    self.METADATA["repository"] = self._make_formatted_uri(o)
+                    self.METADATA["repository"] = str(o)
 
             if self.METADATA.get("title") is None:
                 self.METADATA["title"] = "{no title found}"
@@ -456,6 +324,9 @@ class NMPF(BaseProfile):
             self.CLASSES[p] = {}
 
     def _extract_classes(self):
+        idx = self._adjacency
+        # the Blank Nodes of Restrictions, told apart from other super classes
+        restriction_nodes = set(idx.subjects(RDF.type, OWL.Restriction))
         for cls in self.CLASSES.keys():
             s = URIRef(cls)
             # create Python dict for each class
@@ -469,15 +340,15 @@ class NMPF(BaseProfile):
             self.CLASSES[cls]["isDefinedBy"] = None
             self.CLASSES[cls]["source"] = None
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 if p == DCTERMS.title:
                     self.CLASSES[cls]["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    self.CLASSES[cls]["description"] = markdown.markdown(str(o))
+                    self.CLASSES[cls]["description"] = str(o)
 
                 if p == SKOS.scopeNote:
-                    self.CLASSES[cls]["scopeNote"] = markdown.markdown(str(o))
+                    self.CLASSES[cls]["scopeNote"] = str(o)
 
                 if p == SKOS.example:
                     self.CLASSES[cls]["example"] = str(o)
@@ -486,139 +357,83 @@ class NMPF(BaseProfile):
                     self.CLASSES[cls]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.CLASSES[cls]["source"] = self._make_formatted_uri(o)  # '<a href="{0}">{0}</a>'.format(str(o))
-                    else:
-                        self.CLASSES[cls]["source"] = str(o)
+                    self.CLASSES[cls]["source"] = str(o)
 
             # patch title from URI if we haven't got one
             if self.CLASSES[cls]["title"] is None:
                 self.CLASSES[cls]["title"] = self._make_title_from_uri(cls)
 
-            # make fid
-            self.CLASSES[cls]["fid"] = self._make_fid(self.CLASSES[cls]["title"], cls)
-
             # equivalent classes
             equivalent_classes = []
-            for o in self.G.objects(subject=s, predicate=OWL.equivalentClass):
+            for o in idx.objects(s, OWL.equivalentClass):
                 if type(o) != BNode:
                     equivalent_classes.append(
                         self._get_curie(str(o))
                     )  # ranges that are just classes
                 else:
                     # equivalent classes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> owl:equivalentClass ?eq .
-                            ?eq owl:unionOf|owl:intersectionOf ?collection .
-                            ?eq ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(self._get_curie(str(r.col_member)))
+                    collection_type, collection_members = self._get_collection(o, curie_members=True)
                     equivalent_classes.append((collection_type, collection_members))
             self.CLASSES[cls]["equivalents"] = equivalent_classes
 
             # super classes
             supers = []
             restrictions = []
-            for o in self.G.objects(subject=s, predicate=RDFS.subClassOf):
-                if (o, RDF.type, OWL.Restriction) not in self.G:
+            for o in idx.objects(s, RDFS.subClassOf):
+                if o not in restriction_nodes:
                     if type(o) != BNode:
                         supers.append(str(o))  # supers that are just classes
                     else:
                         # super collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{}> rdfs:subClassOf ?sup .
-                                ?sup owl:unionOf|owl:intersectionOf ?collection .
-                                ?sup ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            s
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
+                        collection_type, collection_members = self._get_collection(o)
                         supers.append((collection_type, collection_members))
                 else:
-                    restrictions.append(o)
+                    restrictions.append(self._extract_restriction(o))
 
             self.CLASSES[cls]["supers"] = supers
             self.CLASSES[cls]["restrictions"] = restrictions
 
             # sub classes
             subs = []
-            for o in self.G.subjects(predicate=RDFS.subClassOf, object=s):
+            for o in idx.subjects(RDFS.subClassOf, s):
                 if type(o) != BNode:
                     subs.append(str(o))
                 else:
                     # sub classes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            ?sub rdfs:subClassOf <{}> .
-                            ?sub owl:unionOf|owl:intersectionOf ?collection .
-                            ?sub ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(self._get_curie(str(r.col_member)))
+                    collection_type, collection_members = self._get_collection(o, curie_members=True)
                     subs.append((collection_type, collection_members))
             self.CLASSES[cls]["subs"] = subs
 
             in_domain_of = []
-            for o in self.G.subjects(predicate=RDFS.domain, object=s):
+            for o in idx.subjects(RDFS.domain, s):
                 in_domain_of.append(str(o))
             self.CLASSES[cls]["in_domain_of"] = in_domain_of
 
             in_domain_includes_of = []
-            for o in self.G.subjects(predicate=SDO.domainIncludes, object=s):
+            for o in idx.subjects(SDO.domainIncludes, s):
                 in_domain_includes_of.append(str(o))
             self.CLASSES[cls]["in_domain_includes_of"] = in_domain_includes_of
 
             in_range_of = []
-            for o in self.G.subjects(predicate=RDFS.range, object=s):
+            for o in idx.subjects(RDFS.range, s):
                 in_range_of.append(str(o))
             self.CLASSES[cls]["in_range_of"] = in_range_of
 
             in_range_includes_of = []
-            for o in self.G.subjects(predicate=SDO.rangeIncludes, object=s):
+            for o in idx.subjects(SDO.rangeIncludes, s):
                 in_range_includes_of.append(str(o))
             self.CLASSES[cls]["in_range_includes_of"] = in_range_includes_of
 
             # TODO: cater for Named Individuals of this class - "has members"
             has_members = []
-            for o in self.G.subjects(predicate=RDF.type, object=s):
+            for o in idx.subjects(RDF.type, s):
                 has_members.append(str(o))
             self.CLASSES[cls]["has_members"] = has_members
 
+        # make fids
+        for cls, fid in self._make_fids((v["title"], k) for k, v in self.CLASSES.items()).items():
+            self.CLASSES[cls]["fid"] = fid
+
         # # sort properties by title
         # x = sorted([(k, v) for k, v in classes.items()], key=lambda tup: tup[1]['title'])
         # y = collections.OrderedDict()
@@ -636,16 +451,18 @@ class NMPF(BaseProfile):
             self.PROPERTIES[p] = {}
 
     def _extract_properties(self):
+        idx = self._adjacency
         for prop in self.PROPERTIES.keys():
             s = URIRef(prop)
             # property type
-            if (s, RDF.type, OWL.ObjectProperty) in self.G:
+            types = idx.objects(s, RDF.type)
+            if OWL.ObjectProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "op"
-            elif (s, RDF.type, OWL.FunctionalProperty) in self.G:
+            elif OWL.FunctionalProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "fp"
-            elif (s, RDF.type, OWL.DatatypeProperty) in self.G:
+            elif OWL.DatatypeProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "dp"
-            elif (s, RDF.type, OWL.AnnotationProperty) in self.G:
+            elif OWL.AnnotationProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "ap"
             else:
                 self.PROPERTIES[prop]["prop_type"] = "p"
@@ -665,15 +482,15 @@ class NMPF(BaseProfile):
             self.PROPERTIES[prop]["ranges"] = []
             self.PROPERTIES[prop]["rangeIncludes"] = []
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 if p == RDFS.label:
                     self.PROPERTIES[prop]["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    self.PROPERTIES[prop]["description"] = markdown.markdown(str(o))
+                    self.PROPERTIES[prop]["description"] = str(o)
 
                 if p == SKOS.scopeNote:
-                    self.PROPERTIES[prop]["scopeNote"] = markdown.markdown(str(o))
+                    self.PROPERTIES[prop]["scopeNote"] = str(o)
 
                 if p == SKOS.example:
                     self.PROPERTIES[prop]["example"] = str(o)
@@ -682,153 +499,76 @@ class NMPF(BaseProfile):
                     self.PROPERTIES[prop]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.PROPERTIES[prop]["source"] = self._make_formatted_uri(
-                            o)  # '<a href="{0}">{0}</a>'.format(str(o))
-                    else:
-                        self.PROPERTIES[prop]["source"] = str(o)
+                    self.PROPERTIES[prop]["source"] = str(o)
 
             # patch title from URI if we haven't got one
             if self.PROPERTIES[prop]["title"] is None:
                 self.PROPERTIES[prop]["title"] = self._make_title_from_uri(prop)
 
-            # make fid
-            self.PROPERTIES[prop]["fid"] = self._make_fid(
-                self.PROPERTIES[prop]["title"], prop
-            )
-
             # super properties
-            for o in self.G.objects(subject=s, predicate=RDFS.subPropertyOf):
+            for o in idx.objects(s, RDFS.subPropertyOf):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["supers"].append(str(o))  # self._make_uri_html
 
             # sub properties
-            for o in self.G.subjects(predicate=RDFS.subPropertyOf, object=s):
+            for o in idx.subjects(RDFS.subPropertyOf, s):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["subs"].append(str(o))
 
             # equivalent properties
-            for o in self.G.objects(subject=s, predicate=OWL.equivalentProperty):
+            for o in idx.objects(s, OWL.equivalentProperty):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["equivs"].append(str(o))
 
             # inverse properties
-            for o in self.G.objects(subject=s, predicate=OWL.inverseOf):
+            for o in idx.objects(s, OWL.inverseOf):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["invs"].append(str(o))
 
             # domains
-            for o in self.G.objects(subject=s, predicate=RDFS.domain):
+            for o in idx.objects(s, RDFS.domain):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["domains"].append(str(o))  # domains that are just classes
                 else:
                     # domain collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> rdfs:domain ?domain .
-                            ?domain owl:unionOf|owl:intersectionOf ?collection .
-                            ?domain ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["domains"].append((collection_type, collection_members))
 
             # domainIncludes
-            for o in self.G.objects(subject=s, predicate=SDO.domainIncludes):
+            for o in idx.objects(s, SDO.domainIncludes):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["domainIncludes"].append(
                         str(o)
                     )  # domainIncludes that are just classes
                 else:
                     # domainIncludes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX sdo: <https://schema.org/>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> sdo:domainIncludes ?domainIncludes .
-                            ?domainIncludes owl:unionOf|owl:intersectionOf ?collection .
-                            ?domainIncludes ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["domainIncludes"].append((collection_type, collection_members))
 
             # ranges
-            for o in self.G.objects(subject=s, predicate=RDFS.range):
+            for o in idx.objects(s, RDFS.range):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["ranges"].append(str(o))  # ranges that are just classes
                 else:
                     # range collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> rdfs:range ?range .
-                            ?range owl:unionOf|owl:intersectionOf ?collection .
-                            ?range ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["ranges"].append((collection_type, collection_members))
 
             # rangeIncludes
-            for o in self.G.objects(subject=s, predicate=SDO.rangeIncludes):
+            for o in idx.objects(s, SDO.rangeIncludes):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["rangeIncludes"].append(str(o))  # rangeIncludes that are just classes
                 else:
                     # rangeIncludes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX sdo: <https://schema.org/>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> sdo:rangeIncludes ?rangeIncludes .
-                            ?rangeIncludes owl:unionOf|owl:intersectionOf ?collection .
-                            ?rangeIncludes ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["rangeIncludes"].append((collection_type, collection_members))
 
             # TODO: cater for sub property chains
 
+        # make fids
+        for prop, fid in self._make_fids((v["title"], k) for k, v in self.PROPERTIES.items()).items():
+            self.PROPERTIES[prop]["fid"] = fid
+
         # # sort properties by title
         # x = sorted([(k, v) for k, v in self.PROPERTIES.items()], key=lambda tup: tup[1]['title'])
         # y = collections.OrderedDict()
@@ -846,6 +586,7 @@ class NMPF(BaseProfile):
             self.NAMED_INDIVIDUALS[ni] = {}
 
     def _extract_named_individuals(self):
+        idx = self._adjacency
         for ni in self.NAMED_INDIVIDUALS.keys():
             if ni.startswith("http"):
                 s = URIRef(ni)
@@ -867,11 +608,11 @@ class NMPF(BaseProfile):
             self.NAMED_INDIVIDUALS[ni]["directsOther"] = None
             self.NAMED_INDIVIDUALS[ni]["directsChapter"] = None
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 # list all the other classes of this NI
                 if p == RDF.type:
                     if o != OWL.NamedIndividual:
-                        self.NAMED_INDIVIDUALS[ni]["classes"].add(self._make_formatted_uri(o))
+                        self.NAMED_INDIVIDUALS[ni]["classes"].add(o)
 
                 if p == RDFS.label:
                     self.NAMED_INDIVIDUALS[ni]["title"] = str(o)
@@ -883,17 +624,13 @@ class NMPF(BaseProfile):
                     self.NAMED_INDIVIDUALS[ni]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.NAMED_INDIVIDUALS[ni]["source"] = self._make_formatted_uri(
-                            o)  # '<a href="{0}">{0}</a>'.format(str(o))
-                    else:
-                        self.NAMED_INDIVIDUALS[ni]["source"] = str(o)
+                    self.NAMED_INDIVIDUALS[ni]["source"] = str(o)
 
                 if p == RDFS.seeAlso:
-                    self.NAMED_INDIVIDUALS[ni]["seeAlso"] = self._make_formatted_uri(o)
+                    self.NAMED_INDIVIDUALS[ni]["seeAlso"] = str(o)
 
                 if p == OWL.sameAs:
-                    self.NAMED_INDIVIDUALS[ni]["sameAs"] = self._make_formatted_uri(o)
+                    self.NAMED_INDIVIDUALS[ni]["sameAs"] = str(o)
 
                 if p == URIRef('http://something/national-marine-planning-framework-policies#appliesToWholeMaritimeArea'):
                     self.NAMED_INDIVIDUALS[ni]['appliesToWholeMaritimeArea'] = str(o)
@@ -911,28 +648,29 @@ class NMPF(BaseProfile):
             if self.NAMED_INDIVIDUALS[ni].get("title") is None:
                 self.NAMED_INDIVIDUALS[ni]["title"] = self._make_title_from_uri(ni)
 
-            # make fid
-            self.NAMED_INDIVIDUALS[ni]["fid"] = self._make_fid(self.NAMED_INDIVIDUALS[ni]["title"], ni)
+        # make fids
+        for ni, fid in self._make_fids((v["title"], k) for k, v in self.NAMED_INDIVIDUALS.items()).items():
+            self.NAMED_INDIVIDUALS[ni]["fid"] = fid
 
     def _make_metadata(self):
         return self._load_template("metadata." + self.outputformat).render(
-            imports=sorted(self.METADATA["imports"]),
+            imports=sorted(self._make_formatted_uri(x) for x in self.METADATA["imports"]),
             title=self.METADATA.get("title"),
             uri=self.METADATA.get("uri"),
-            version_uri=self.METADATA.get("versionIRI"),
-            publishers=sorted(self.METADATA["publishers"]),
-            creators=sorted(self.METADATA["creators"]),
-            contributors=sorted(self.METADATA["contributors"]),
+            version_uri=self._make_optional_uri(self.METADATA.get("versionIRI")),
+            publishers=self._make_agents(self.METADATA["publishers"]),
+            creators=self._make_agents(self.METADATA["creators"]),
+            contributors=self._make_agents(self.METADATA["contributors"]),
             created=self.METADATA.get("created"),  # TODO: auto-detect format
             modified=self.METADATA.get("modified"),
             issued=self.METADATA.get("issued"),
-            source=self.METADATA.get("source"),
-            description=self.METADATA.get("description"),
-            historyNote=self.METADATA.get("historyNote"),
+            source=self._make_uri_or_text(self.METADATA.get("source")),
+            description=self._make_markdown(self.METADATA.get("description")),
+            historyNote=self._make_markdown(self.METADATA.get("historyNote")),
             version_info=self.METADATA.get("versionInfo"),
-            license=self.METADATA.get("license"),
-            rights=self.METADATA.get("rights"),
-            repository=self.METADATA.get("repository"),
+            license=self._make_uri_or_text(self.METADATA.get("license")),
+            rights=self._make_rights(self.METADATA.get("rights")),
+            repository=self._make_optional_uri(self.METADATA.get("repository")),
             ont_rdf=self._make_source_file_link(),
             has_classes=self.METADATA.get("has_classes"),
             has_ops=self.METADATA.get("has_ops"),
@@ -948,9 +686,11 @@ class NMPF(BaseProfile):
         class_template = self._load_template("class." + self.outputformat)
         classes_list = []
         for k, v in self.CLASSES.items():
+            links = self._make_class_links(v)
             # handling Markdown formatting within a table
             if self.outputformat == "md":
-                desc = v["description"].replace("\n", " ") if v.get("description") is not None else None
+                desc = self._make_markdown(v["description"]).replace("\n", " ") \
+                    if v.get("description") is not None else None
                 if v.get("example") is not None:
                     eg = v["example"].strip().replace("\t", "    ").split("\n")
                     eg2 = ""
@@ -960,7 +700,7 @@ class NMPF(BaseProfile):
                 else:
                     eg = None
             else:
-                desc = v["description"]
+                desc = self._make_markdown(v["description"])
                 eg = v["example"].replace("<", "&lt;").replace(">", "&gt;") if v.get("example") is not None else None
 
             classes_list.append(
@@ -969,18 +709,18 @@ class NMPF(BaseProfile):
                     fid=v["fid"],
                     title=v["title"],
                     description=desc,
-                    supers=v["supers"],
-                    restrictions=v["restrictions"],
-                    scopeNote=v["scopeNote"],
+                    supers=links["supers"],
+                    restrictions=links["restrictions"],
+                    scopeNote=self._make_markdown(v["scopeNote"]),
                     example=eg,
                     is_defined_by=v["isDefinedBy"],
-                    source=v["source"],
-                    subs=v["subs"],
-                    in_domain_of=v["in_domain_of"],
-                    in_domain_includes_of=v["in_domain_includes_of"],
-                    in_range_of=v["in_range_of"],
-                    in_range_includes_of=v["in_range_includes_of"],
-                    has_members=v["has_members"]
+                    source=self._make_uri_or_text(v["source"]),
+                    subs=links["subs"],
+                    in_domain_of=links["in_domain_of"],
+                    in_domain_includes_of=links["in_domain_includes_of"],
+                    in_range_of=links["in_range_of"],
+                    in_range_includes_of=links["in_range_includes_of"],
+                    has_members=links["has_members"]
                 )
             )
 
@@ -994,9 +734,10 @@ class NMPF(BaseProfile):
         return classes_template.render(fids=fids, classes=classes_list, )
 
     def _make_property(self, property):
+        links = self._make_property_links(property[1])
         # handling Markdown formatting within a table
         if self.outputformat == "md":
-            desc = property[1].get("description").replace("\n", " ") \
+            desc = self._make_markdown(property[1].get("description")).replace("\n", " ") \
                 if property[1].get("description") is not None else None
             if property[1].get("example") is not None:
                 eg = property[1].get("example").strip().replace("\t", "    ").split("\n")
@@ -1007,7 +748,7 @@ class NMPF(BaseProfile):
             else:
                 eg = None
         else:
-            desc = property[1].get("description")
+            desc = self._make_markdown(property[1].get("description"))
             eg = property[1].get("example")
 
         return self._load_template("property." + self.outputformat).render(
@@ -1016,18 +757,18 @@ class NMPF(BaseProfile):
             property_type=property[1].get("prop_type"),
             title=property[1].get("title"),
             description=desc,
-            scopeNote=property[1].get("scopeNote"),
+            scopeNote=self._make_markdown(property[1].get("scopeNote")),
             example=eg,
             is_defined_by=property[1].get("isDefinedBy"),
-            source=property[1].get("source"),
-            supers=property[1].get("supers"),
-            subs=property[1].get("subs"),
-            equivs=property[1].get("equivs"),
-            invs=property[1].get("invs"),
-            domains=property[1]["domains"],
-            domainIncludes=property[1]["domainIncludes"],
-            ranges=property[1]["ranges"],
-            rangeIncludes=property[1]["rangeIncludes"],
+            source=self._make_uri_or_text(property[1].get("source")),
+            supers=links["supers"],
+            subs=links["subs"],
+            equivs=links["equivs"],
+            invs=links["invs"],
+            domains=links["domains"],
+            domainIncludes=links["domainIncludes"],
+            ranges=links["ranges"],
+            rangeIncludes=links["rangeIncludes"],
         )
 
     def _make_properties(self):
@@ -1093,13 +834,13 @@ class NMPF(BaseProfile):
         return self._load_template("named_individual." + self.outputformat).render(
             uri=named_individual[0],
             fid=named_individual[1].get("fid"),
-            classes=named_individual[1].get("classes"),
+            classes={self._make_formatted_uri(x) for x in named_individual[1].get("classes")},
             title=named_individual[1].get("title"),
             description=named_individual[1].get("description"),
             is_defined_by=named_individual[1].get("isDefinedBy"),
-            source=named_individual[1].get("source"),
-            see_also=named_individual[1].get("seeAlso"),
-            same_as=named_individual[1].get("sameAs"),
+            source=self._make_uri_or_text(named_individual[1].get("source")),
+            see_also=self._make_optional_uri(named_individual[1].get("seeAlso")),
+            same_as=self._make_optional_uri(named_individual[1].get("sameAs")),
             applies_whole=named_individual[1].get("appliesToWholeMaritimeArea"),
             policy_code=named_individual[1].get("policyCode"),
             directs_other=named_individual[1].get("directsOther"),
@@ -1144,188 +885,194 @@ class NMPF(BaseProfile):
             pylode_version=__version__
         )
 
-    def generate_document(self):
-        # expand the graph using pre-defined rules to make querying easier (poor man's inference)
-        self._expand_graph()
-        # get all the namespaces using several methods
-        self._extract_namespaces()
-        # get the default namespace
-        self._get_default_namespace()
+    def _make_property_links(self, prop):
+        """Formats a Property's related Classes & Properties as links"""
+        links = {}
+        html = []
+        for p in prop["supers"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["supers"] = html
+
+        html = []
+        for p in prop["subs"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["subs"] = html
+
+        html = []
+        for p in prop["equivs"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["equivs"] = html
+
+        html = []
+        for p in prop["invs"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["invs"] = html
+
+        html = []
+        for d in prop["domains"]:
+            if type(d) == tuple:
+                html.append(self._make_collection_class_html(d[0], d[1]))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["domains"] = html
+
+        html = []
+        for d in prop["domainIncludes"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(self._make_formatted_uri(m, type="c"))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["domainIncludes"] = html
+
+        html = []
+        for d in prop["ranges"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(self._make_formatted_uri(m, type="c"))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["ranges"] = html
+
+        html = []
+        for d in prop["rangeIncludes"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(self._make_formatted_uri(m, type="c"))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["rangeIncludes"] = html
+
+        return links
+
+    def _make_class_links(self, class_):
+        """Formats a Class' related Classes, Properties & Restrictions as links"""
+        links = {}
+        html = []
+        for d in class_["equivalents"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(self._make_formatted_uri(m, type="c"))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["equivalents"] = html
+
+        html = []
+        for d in class_["supers"]:
+            if type(d) == tuple:
+                html.append(self._make_collection_class_html(d[0], d[1]))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["supers"] = html
+
+        html = []
+        for d in class_["restrictions"]:
+            html.append(self._make_restriction_html(d))
+        links["restrictions"] = html
+
+        html = []
+        for d in class_["subs"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(self._make_formatted_uri(m, type="c"))
+            else:
+                html.append(self._make_formatted_uri(d, type="c"))
+        links["subs"] = html
+
+        html = []
+        for p in class_["in_domain_of"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["in_domain_of"] = html
+
+        html = []
+        for p in class_["in_domain_includes_of"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["in_domain_includes_of"] = html
+
+        html = []
+        for p in class_["in_range_of"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["in_range_of"] = html
+
+        html = []
+        for p in class_["in_range_includes_of"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["in_range_includes_of"] = html
+
+        html = []
+        for p in class_["has_members"]:
+            prop_type = (
+                self.PROPERTIES.get(p).get("prop_type")
+                if self.PROPERTIES.get(p)
+                else None
+            )
+            html.append(self._make_formatted_uri(p, type=prop_type))
+        links["has_members"] = html
+
+        return links
+
+    def _extract_model(self):
         # get the IDs (URIs) of all properties -> self.PROPERTIES
         self._extract_properties_uris()
         # get the IDs (URIs) of all classes -> CLASSES
         self._extract_classes_uris()
         # get the IDs (URIs) of all Named Individuals -> NAMED_INDIVIDUALS
         self._extract_named_individuals_uris()
+        # index the edges the details are extracted from -> _adjacency
+        self._adjacency = AdjacencyIndex(self.G, self.ADJACENCY_PREDICATES)
         # get all the properties' details
         self._extract_properties()
         # get all the classes' details
         self._extract_classes()
         # get all the Named Individuals' details
         self._extract_named_individuals()
+        self._adjacency = None  # only needed to extract them
         # get the ontology's metadata
         self._extract_metadata()
-        # create fragment URIs for default namespace classes & properties
-        # for each CURIE, if it's in the default namespace, i.e. this ontology, use its fragment URI
-
-        # crosslinking properties
-        for uri, prop in self.PROPERTIES.items():
-            html = []
-            for p in prop["supers"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.PROPERTIES[uri]["supers"] = html
-
-            html = []
-            for p in prop["subs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.PROPERTIES[uri]["subs"] = html
-
-            html = []
-            for p in prop["equivs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.PROPERTIES[uri]["equivs"] = html
-
-            html = []
-            for p in prop["invs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.PROPERTIES[uri]["invs"] = html
 
-            html = []
-            for d in prop["domains"]:
-                if type(d) == tuple:
-                    html.append(self._make_collection_class_html(d[0], d[1]))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.PROPERTIES[uri]["domains"] = html
-
-            html = []
-            for d in prop["domainIncludes"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(self._make_formatted_uri(m, type="c"))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.PROPERTIES[uri]["domainIncludes"] = html
-
-            html = []
-            for d in prop["ranges"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(self._make_formatted_uri(m, type="c"))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.PROPERTIES[uri]["ranges"] = html
-
-            html = []
-            for d in prop["rangeIncludes"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(self._make_formatted_uri(m, type="c"))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.PROPERTIES[uri]["rangeIncludes"] = html
-
-        # crosslinking classes
-        for uri, cls in self.CLASSES.items():
-            html = []
-            for d in cls["equivalents"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(self._make_formatted_uri(m, type="c"))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.CLASSES[uri]["equivalents"] = html
-
-            html = []
-            for d in cls["supers"]:
-                if type(d) == tuple:
-                    html.append(self._make_collection_class_html(d[0], d[1]))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.CLASSES[uri]["supers"] = html
-
-            html = []
-            for d in cls["restrictions"]:
-                html.append(self._make_restriction_html(uri, d))
-            self.CLASSES[uri]["restrictions"] = html
-
-            html = []
-            for d in cls["subs"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(self._make_formatted_uri(m, type="c"))
-                else:
-                    html.append(self._make_formatted_uri(d, type="c"))
-            self.CLASSES[uri]["subs"] = html
-
-            html = []
-            for p in cls["in_domain_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.CLASSES[uri]["in_domain_of"] = html
-
-            html = []
-            for p in cls["in_domain_includes_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.CLASSES[uri]["in_domain_includes_of"] = html
-
-            html = []
-            for p in cls["in_range_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.CLASSES[uri]["in_range_of"] = html
-
-            html = []
-            for p in cls["in_range_includes_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.CLASSES[uri]["in_range_includes_of"] = html
-
-            html = []
-            for p in cls["has_members"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                html.append(self._make_formatted_uri(p, type=prop_type))
-            self.CLASSES[uri]["has_members"] = html
+    def generate_document(self):
+        # extract the format-neutral model, unless already done for another output format
+        self._prepare()
 
-        return self._make_document()
+        with self._phase("render"):
+            return self._make_document()
@@ -1,21 +1,40 @@
 from typing import Union
 from pylode import __version__
-from pylode.common import TEMPLATES_DIR, STYLE_DIR
+from pylode.common import STYLE_DIR
 import collections
 from os import path
 from itertools import chain
 import markdown
-from jinja2 import Environment, FileSystemLoader
-from os.path import join
 from rdflib import URIRef, BNode, Literal
 from rdflib.namespace import DC, DCTERMS, DOAP, OWL, PROF, PROV, RDF, RDFS, SDO, SKOS
+from pylode.adjacency import AdjacencyIndex
+from pylode.expansion import AGENT_RULES, Copy, InferType, SubjectType
 from pylode.profiles.base import BaseProfile
+from pylode.templating import Deferred, get_template
 from natsort import natsorted
 
 import re
 
 
 class OntDoc(BaseProfile):
+    MODEL = BaseProfile.MODEL + ["CLASSES", "PROPERTIES", "NAMED_INDIVIDUALS", "LINK_INDEX"]
+    EXPANSION_RULES = [
+        Copy("name", [DC.title, RDFS.label, SKOS.prefLabel, SDO.name], DCTERMS.title),
+        Copy("description", [DC.description, RDFS.comment, SKOS.definition, SDO.description], DCTERMS.description),
+        InferType(
+            "property types",
+            [OWL.ObjectProperty, OWL.FunctionalProperty, OWL.DatatypeProperty, OWL.AnnotationProperty],
+            RDF.Property,
+        ),
+        InferType("class types", [OWL.Class], RDFS.Class),
+        # owl:Restrictions from Blank Nodes
+        SubjectType("restrictions", OWL.onProperty, OWL.Restriction),
+    ] + AGENT_RULES
+    # the predicates of the Classes' & Properties' incoming edges, e.g. their sub Classes, see AdjacencyIndex
+    ADJACENCY_PREDICATES = [
+        RDF.type, RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, SDO.domainIncludes, RDFS.range, SDO.rangeIncludes
+    ]
+
     def __init__(
             self,
             g,
@@ -38,6 +57,20 @@ class OntDoc(BaseProfile):
         self.CLASSES = collections.OrderedDict()
         self.PROPERTIES = collections.OrderedDict()
         self.NAMED_INDIVIDUALS = collections.OrderedDict()
+        # URI -> (title, fid, type) for this ontology's Properties & Classes, filled in as they are extracted
+        self.LINK_INDEX = {}
+
+    def _index_link(self, uri, entity, type):
+        # Properties take precedence over Classes with the same URI
+        if type != "c" or uri not in self.LINK_INDEX:
+            self.LINK_INDEX[uri] = (entity.get("title"), entity.get("fid"), type)
+
+    def _link_target(self, uri):
+        return self.LINK_INDEX.get(uri)
+
+    def _get_prop_type(self, uri):
+        link = self.LINK_INDEX.get(uri)
+        return link[2] if link is not None and link[2] != "c" else None
 
     def _make_collection_class_html(self, col_type, col_members):
         if col_type == "owl:unionOf":
@@ -51,148 +84,49 @@ class OntDoc(BaseProfile):
             j.join([self._make_formatted_uri(x, type="c") for x in col_members])
         )
 
-    def _make_restriction_html(self, subject, restriction_bn):
+    def _make_restriction_html(self, restriction):
         prop = None
         card = None
         cls = None
 
-        for p2, o2 in self.G.predicate_objects(subject=restriction_bn):
-            if p2 != RDF.type:
-                if p2 == OWL.onProperty:
-                    # TODO: add the property type for HTML
-                    t = None
-                    if str(o2) in self.PROPERTIES.keys():
-                        t = self.PROPERTIES[str(o2)]["prop_type"]
-                    #prop = self._make_formatted_uri(str(o2), t)
-                    prop = self._build_link(uri=str(o2), source="_make_restrictions_html")
-                elif p2 == OWL.onClass:
-                    """
-                    domains = []
-                    for o in self.G.objects(subject=s, predicate=RDFS.domain):
-                        if type(o) != BNode:
-                            domains.append(str(o))  # domains that are just classes
-                        else:
-                            # domain collections (unionOf | intersectionOf
-                            q = '''
-                                PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                                PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                                SELECT ?col_type ?col_member
-                                WHERE {{
-                                    <{}> rdfs:domain ?domain .
-                                    ?domain owl:unionOf|owl:intersectionOf ?collection .
-                                    ?domain ?col_type ?collection .
-                                    ?collection rdf:rest*/rdf:first ?col_member .
-                                }}
-                            '''.format(s)
-                            collection_type = None
-                            collection_members = []
-                            for r in self.G.query(q):
-                                collection_type = self._get_curie(str(r.col_type))
-                                collection_members.append(str(r.col_member))
-                            domains.append((collection_type, collection_members))
-                    self.PROPERTIES[prop]['domains'] = domains
-
-                    """
-                    if type(o2) == BNode:
-                        # onClass collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{}> owl:onClass ?onClass .
-                                ?onClass owl:unionOf|owl:intersectionOf ?collection .
-                                ?onClass ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            str(subject)
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
-
-                        cls = self._make_collection_class_html(
-                            collection_type, collection_members
-                        )
-                    else:
-                        #cls = self._make_formatted_uri(str(o2), type="c")
-                        cls = self._build_link(uri=str(o2), type="c", source="_make_restrictions_html")
-                elif p2 in [
-                    OWL.cardinality,
-                    OWL.qualifiedCardinality,
-                    OWL.minCardinality,
-                    OWL.minQualifiedCardinality,
-                    OWL.maxCardinality,
-                    OWL.maxQualifiedCardinality,
-                ]:
-                    if p2 in [OWL.minCardinality, OWL.minQualifiedCardinality]:
-                        card = "min"
-                    elif p2 in [OWL.maxCardinality, OWL.maxQualifiedCardinality]:
-                        card = "max"
-                    elif p2 in [OWL.cardinality, OWL.qualifiedCardinality]:
-                        card = "exactly"
-
-                    if self.outputformat in ["md", "adoc"]:
-                        card = '**{}** {}'.format(
-                            card, str(o2)
-                        )
-                    else:
-                        card = '<span class="cardinality">{}</span> {}'.format(
-                            card, str(o2)
-                        )
-                elif p2 in [OWL.allValuesFrom, OWL.someValuesFrom]:
-                    if p2 == OWL.allValuesFrom:
-                        card = "only"
-                    else:  # p2 == OWL.someValuesFrom
-                        card = "some"
-
-                    if type(o2) == BNode:
-                        # someValuesFrom collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{0}> ?x _:{1} .
-                                _:{1} owl:someValuesFrom|owl:allValuesFrom ?bn2 .
-                                ?bn2 owl:unionOf|owl:intersectionOf ?collection .
-                                ?s ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            str(subject), str(o2)
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
-
-                        c = self._make_collection_class_html(
-                            collection_type, collection_members
-                        )
-                    else:
-                        c = self._make_formatted_uri(str(o2), type="c")
+        for p2, o2 in restriction:
+            if p2 == OWL.onProperty:
+                prop = self._build_link(uri=str(o2), source="_make_restrictions_html")
+            elif p2 == OWL.onClass:
+                if type(o2) == tuple:
+                    cls = self._make_collection_class_html(o2[0], o2[1])
+                else:
+                    cls = self._build_link(uri=str(o2), type="c", source="_make_restrictions_html")
+            elif p2 in [
+                OWL.cardinality,
+                OWL.qualifiedCardinality,
+                OWL.minCardinality,
+                OWL.minQualifiedCardinality,
+                OWL.maxCardinality,
+                OWL.maxQualifiedCardinality,
+            ]:
+                if p2 in [OWL.minCardinality, OWL.minQualifiedCardinality]:
+                    card = "min"
+                elif p2 in [OWL.maxCardinality, OWL.maxQualifiedCardinality]:
+                    card = "max"
+                elif p2 in [OWL.cardinality, OWL.qualifiedCardinality]:
+                    card = "exactly"
+
+                card = "{} {}".format(self.renderer.keyword(card), str(o2))
+            elif p2 in [OWL.allValuesFrom, OWL.someValuesFrom]:
+                if p2 == OWL.allValuesFrom:
+                    card = "only"
+                else:  # p2 == OWL.someValuesFrom
+                    card = "some"
+
+                if type(o2) == tuple:
+                    c = self._make_collection_class_html(o2[0], o2[1])
+                else:
+                    c = self._make_formatted_uri(str(o2), type="c")
 
-                    if self.outputformat in ["md", "adoc"]:
-                        card = '**{}** {}'.format(card, c)
-                    else:
-                        card = '<span class="cardinality">{}</span> {}'.format(card, c)
-                elif p2 == OWL.hasValue:
-                    if self.outputformat in ["md", "adoc"]:
-                        card = '**value** {}'.format(
-                            self._make_formatted_uri(str(o2), type="c")
-                        )
-                    else:
-                        card = '<span class="cardinality">value</span> {}'.format(
-                            self._make_formatted_uri(str(o2), type="c")
-                        )
+                card = "{} {}".format(self.renderer.keyword(card), c)
+            elif p2 == OWL.hasValue:
+                card = "{} {}".format(self.renderer.keyword("value"), self._make_formatted_uri(str(o2), type="c"))
 
         restriction = prop + " " + card if card is not None else prop
         restriction = restriction + " " + cls if cls is not None else restriction
@@ -200,27 +134,16 @@ class OntDoc(BaseProfile):
         return restriction
 
     def _load_template(self, template_file):
-        return Environment(loader=FileSystemLoader(join(TEMPLATES_DIR, "ontdoc"))).get_template(template_file)
+        return get_template(template_file, "ontdoc")
 
     def _make_fragment_uri(self, uri):
         """OntDoc Profile allows fragment URIs for Classes & Properties"""
-        if self.PROPERTIES.get(uri) or self.CLASSES.get(uri):
-            if self.PROPERTIES.get(uri):
-                title = self.PROPERTIES[uri]["title"] \
-                    if self.PROPERTIES[uri].get("title") is not None else self.PROPERTIES[uri]["fid"]
-                uri = self.PROPERTIES[uri]["fid"]
-            elif self.CLASSES.get(uri):
-                title = self.CLASSES[uri]["title"] \
-                    if self.CLASSES[uri].get("title") is not None else self.CLASSES[uri]["fid"]
-                uri = self.CLASSES[uri]["fid"]
-
-            links = {
-                "md": f"[{title}](#{uri})",
-                "adoc": f"link:#{uri}[{title}]",
-                "html": f'<a href="#{uri}">{title}</a>'
-            }
+        link = self.LINK_INDEX.get(uri)
+        if link is not None:
+            title, fid, _ = link
+            title = title if title is not None else fid
 
-            return links[self.outputformat]
+            return self.renderer.fragment_link(fid, title)
         else:
             return self._make_formatted_uri_basic(uri)
 
@@ -239,79 +162,7 @@ class OntDoc(BaseProfile):
         if type not in types.keys():
             return link
 
-        suffixes = {
-            "md": f' ({type})',
-            "adoc": f' ^{type}^',
-            "html": f'<sup class="sup-{type}" title="{types[type]}">{type}</sup>'  # {}
-        }
-
-        return link + suffixes[self.outputformat]
-
-    def _expand_graph(self):
-        # name
-        for s, o in chain(
-                self.G.subject_objects(DC.title),
-                self.G.subject_objects(RDFS.label),
-                self.G.subject_objects(SKOS.prefLabel),
-                self.G.subject_objects(SDO.name)
-        ):
-            self.G.add((s, DCTERMS.title, o))
-
-        # description
-        for s, o in chain(
-                self.G.subject_objects(DC.description),
-                self.G.subject_objects(RDFS.comment),
-                self.G.subject_objects(SKOS.definition),
-                self.G.subject_objects(SDO.description)
-        ):
-            self.G.add((s, DCTERMS.description, o))
-
-        # property types
-        for s in chain(
-                self.G.subjects(RDF.type, OWL.ObjectProperty),
-                self.G.subjects(RDF.type, OWL.FunctionalProperty),
-                self.G.subjects(RDF.type, OWL.DatatypeProperty),
-                self.G.subjects(RDF.type, OWL.AnnotationProperty)
-        ):
-            self.G.add((s, RDF.type, RDF.Property))
-
-        # class types
-        for s in self.G.subjects(RDF.type, OWL.Class):
-            self.G.add((s, RDF.type, RDFS.Class))
-
-        # owl:Restrictions from Blank Nodes
-        for s in self.G.subjects(OWL.onProperty):
-            self.G.add((s, RDF.type, OWL.Restriction))
-
-        # Agents
-        # creator
-        for s, o in chain(
-                self.G.subject_objects(DC.creator),
-                self.G.subject_objects(SDO.creator),
-                self.G.subject_objects(SDO.author)  # conflate SDO.author with DCTERMS.creator
-        ):
-            self.G.remove((s, DC.creator, o))
-            self.G.remove((s, SDO.creator, o))
-            self.G.remove((s, SDO.author, o))
-            self.G.add((s, DCTERMS.creator, o))
-
-        # contributor
-        for s, o in chain(
-                self.G.subject_objects(DC.contributor),
-                self.G.subject_objects(SDO.contributor)
-        ):
-            self.G.remove((s, DC.contributor, o))
-            self.G.remove((s, SDO.contributor, o))
-            self.G.add((s, DCTERMS.contributor, o))
-
-        # publisher
-        for s, o in chain(
-                self.G.subject_objects(DC.publisher),
-                self.G.subject_objects(SDO.publisher)
-        ):
-            self.G.remove((s, DC.publisher, o))
-            self.G.remove((s, SDO.publisher, o))
-            self.G.add((s, DCTERMS.publisher, o))
+        return link + self.renderer.type_suffix(type, types[type])
 
     def _extract_metadata(self):
         if len(self.CLASSES.keys()) > 0:
@@ -352,26 +203,16 @@ class OntDoc(BaseProfile):
 
             for p, o in self.G.predicate_objects(subject=s):
                 if p == OWL.imports:
-                    self.METADATA["imports"].add(self._make_formatted_uri(o))
+                    self.METADATA["imports"].add(str(o))
 
                 if p == DCTERMS.title:
                     self.METADATA["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    if self.outputformat == "md":
-                        self.METADATA["description"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.METADATA["description"] = str(o)
-                    else:
-                        self.METADATA["description"] = markdown.markdown(str(o))
+                    self.METADATA["description"] = str(o)
 
                 if p == SKOS.historyNote:
-                    if self.outputformat == "md":
-                        self.METADATA["historyNote"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.METADATA["historyNote"] = str(o)
-                    else:
-                        self.METADATA["historyNote"] = markdown.markdown(str(o))
+                    self.METADATA["historyNote"] = str(o)
 
                 # dates
                 if p in [DCTERMS.created, DCTERMS.modified, DCTERMS.issued]:
@@ -379,13 +220,10 @@ class OntDoc(BaseProfile):
                     self.METADATA[date_type] = str(o)
 
                 if p == DCTERMS.source:
-                    if str(o).startswith('http'):
-                        self.METADATA["source"] = self._make_formatted_uri(o)
-                    else:
-                        self.METADATA["source"] = str(o)
+                    self.METADATA["source"] = str(o)
 
                 if p == OWL.versionIRI:
-                    self.METADATA["versionIRI"] = self._make_formatted_uri(o)
+                    self.METADATA["versionIRI"] = str(o)
 
                 if p == OWL.versionInfo:
                     self.METADATA["versionInfo"] = str(o)
@@ -397,19 +235,10 @@ class OntDoc(BaseProfile):
                     self.METADATA["preferredNamespaceUri"] = str(o)
 
                 if p == DCTERMS.license:
-                    self.METADATA["license"] = (
-                        self._make_formatted_uri(o)
-                        if str(o).startswith("http")
-                        else str(o)
-                    )
+                    self.METADATA["license"] = str(o)
 
                 if p == DCTERMS.rights:
-                    self.METADATA["rights"] = (
-                        str(o)
-                            .replace("Copyright", "&copy;")
-                            .replace("copyright", "&copy;")
-                            .replace("(c)", "&copy;")
-                    )
+                    self.METADATA["rights"] = str(o)
 
                 # Agents
                 if p in [
@@ -417,16 +246,16 @@ class OntDoc(BaseProfile):
                 ]:
                     agent_type = p.split("/")[-1] + "s"
                     if type(o) == Literal:
-                        self.METADATA[agent_type].add(str(o))
+                        self.METADATA[agent_type].add(o)
                     else:  # Blank Node or URI
-                        self.METADATA[agent_type].add(self._make_agent(o))
+                        self.METADATA[agent_type].add(self._extract_agent(o))
 
                 if p == PROV.wasGeneratedBy:
                     for o2 in self.G.objects(subject=o, predicate=DOAP.repository):
-                        self.METADATA["repository"] = self._make_formatted_uri(o2)
+                        self.METADATA["repository"] = str(o2)
 
                 if p == SDO.codeRepository:
-                    self.METADATA["repository"] = self._make_formatted_uri(o)
+                    self.METADATA["repository"] = str(o)
 
             if self.METADATA.get("title") is None:
                 self.METADATA["title"] = "{no title found}"
@@ -454,6 +283,9 @@ class OntDoc(BaseProfile):
             self.CLASSES[p] = {}
 
     def _extract_classes(self):
+        idx = self._adjacency
+        # the Blank Nodes of Restrictions, told apart from other super classes
+        restriction_nodes = set(idx.subjects(RDF.type, OWL.Restriction))
         for cls in self.CLASSES.keys():
             s = URIRef(cls)
             # create Python dict for each class
@@ -469,166 +301,101 @@ class OntDoc(BaseProfile):
             self.CLASSES[cls]["isDefinedBy"] = None
             self.CLASSES[cls]["source"] = None
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 if p == DCTERMS.title:
                     self.CLASSES[cls]["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    if self.outputformat == "md":
-                        self.CLASSES[cls]["description"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.CLASSES[cls]["description"] = str(o)
-                    else:
-                        self.CLASSES[cls]["description"] = markdown.markdown(str(o))
+                    self.CLASSES[cls]["description"] = str(o)
 
                 if p == SKOS.scopeNote:
-                    if self.outputformat == "md":
-                        self.CLASSES[cls]["scopeNote"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.CLASSES[cls]["scopeNote"] = str(o)
-                    else:
-                        self.CLASSES[cls]["scopeNote"] = markdown.markdown(str(o))
+                    self.CLASSES[cls]["scopeNote"] = str(o)
 
                 if p == SKOS.example:
-                    self.CLASSES[cls]["examples"].append(self._make_example(o))
+                    self.CLASSES[cls]["examples"].append(self._extract_example(o))
 
                 if p == RDFS.isDefinedBy:
                     self.CLASSES[cls]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.CLASSES[cls]["source"] = self._make_formatted_uri(o)
-                    else:
-                        self.CLASSES[cls]["source"] = str(o)
+                    self.CLASSES[cls]["source"] = str(o)
 
             # patch title from URI if we haven't got one
             if self.CLASSES[cls]["title"] is None:
                 self.CLASSES[cls]["title"] = self._make_title_from_uri(cls)
 
-            # make fid
-            self.CLASSES[cls]["fid"] = self._make_fid(self.CLASSES[cls]["title"], cls)
-
             # equivalent classes
             equivalent_classes = []
-            for o in self.G.objects(subject=s, predicate=OWL.equivalentClass):
+            for o in idx.objects(s, OWL.equivalentClass):
                 if type(o) != BNode:
                     equivalent_classes.append(
                         self._get_curie(str(o))
                     )  # ranges that are just classes
                 else:
                     # equivalent classes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> owl:equivalentClass ?eq .
-                            ?eq owl:unionOf|owl:intersectionOf ?collection .
-                            ?eq ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(self._get_curie(str(r.col_member)))
+                    collection_type, collection_members = self._get_collection(o, curie_members=True)
                     equivalent_classes.append((collection_type, collection_members))
             self.CLASSES[cls]["equivalents"] = equivalent_classes
 
             # super classes
             supers = []
             restrictions = []
-            for o in self.G.objects(subject=s, predicate=RDFS.subClassOf):
-                if (o, RDF.type, OWL.Restriction) not in self.G:
+            for o in idx.objects(s, RDFS.subClassOf):
+                if o not in restriction_nodes:
                     if type(o) != BNode:
                         supers.append(str(o))  # supers that are just classes
                     else:
                         # super collections (unionOf | intersectionOf
-                        q = """
-                            PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                            SELECT ?col_type ?col_member
-                            WHERE {{
-                                <{}> rdfs:subClassOf ?sup .
-                                ?sup owl:unionOf|owl:intersectionOf ?collection .
-                                ?sup ?col_type ?collection .
-                                ?collection rdf:rest*/rdf:first ?col_member .
-                            }}
-                        """.format(
-                            s
-                        )
-                        collection_type = None
-                        collection_members = []
-                        for r in self.G.query(q):
-                            collection_type = self._get_curie(str(r.col_type))
-                            collection_members.append(str(r.col_member))
+                        collection_type, collection_members = self._get_collection(o)
                         supers.append((collection_type, collection_members))
                 else:
-                    restrictions.append(o)
+                    restrictions.append(self._extract_restriction(o))
 
             self.CLASSES[cls]["supers"] = supers
             self.CLASSES[cls]["restrictions"] = restrictions
 
             # sub classes
             subs = []
-            for o in self.G.subjects(predicate=RDFS.subClassOf, object=s):
+            for o in idx.subjects(RDFS.subClassOf, s):
                 if type(o) != BNode:
                     subs.append(str(o))
                 else:
                     # sub classes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            ?sub rdfs:subClassOf <{}> .
-                            ?sub owl:unionOf|owl:intersectionOf ?collection .
-                            ?sub ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(self._get_curie(str(r.col_member)))
+                    collection_type, collection_members = self._get_collection(o, curie_members=True)
                     subs.append((collection_type, collection_members))
             self.CLASSES[cls]["subs"] = subs
 
             in_domain_of = []
-            for o in self.G.subjects(predicate=RDFS.domain, object=s):
+            for o in idx.subjects(RDFS.domain, s):
                 in_domain_of.append(str(o))
             self.CLASSES[cls]["in_domain_of"] = in_domain_of
 
             in_domain_includes_of = []
-            for o in self.G.subjects(predicate=SDO.domainIncludes, object=s):
+            for o in idx.subjects(SDO.domainIncludes, s):
                 in_domain_includes_of.append(str(o))
             self.CLASSES[cls]["in_domain_includes_of"] = in_domain_includes_of
 
             in_range_of = []
-            for o in self.G.subjects(predicate=RDFS.range, object=s):
+            for o in idx.subjects(RDFS.range, s):
                 in_range_of.append(str(o))
             self.CLASSES[cls]["in_range_of"] = in_range_of
 
             in_range_includes_of = []
-            for o in self.G.subjects(predicate=SDO.rangeIncludes, object=s):
+            for o in idx.subjects(SDO.rangeIncludes, s):
                 in_range_includes_of.append(str(o))
             self.CLASSES[cls]["in_range_includes_of"] = in_range_includes_of
 
             # TODO: cater for Named Individuals of this class - "has members"
             has_members = []
-            for o in self.G.subjects(predicate=RDF.type, object=s):
+            for o in idx.subjects(RDF.type, s):
                 has_members.append(str(o))
             self.CLASSES[cls]["has_members"] = has_members
 
+        # make fids
+        for cls, fid in self._make_fids((v["title"], k) for k, v in self.CLASSES.items()).items():
+            self.CLASSES[cls]["fid"] = fid
+            self._index_link(cls, self.CLASSES[cls], "c")
+
         # # sort properties by title
         # x = sorted([(k, v) for k, v in classes.items()], key=lambda tup: tup[1]['title'])
         # y = collections.OrderedDict()
@@ -646,16 +413,18 @@ class OntDoc(BaseProfile):
             self.PROPERTIES[p] = {}
 
     def _extract_properties(self):
+        idx = self._adjacency
         for prop in self.PROPERTIES.keys():
             s = URIRef(prop)
             # property type
-            if (s, RDF.type, OWL.FunctionalProperty) in self.G:
+            types = idx.objects(s, RDF.type)
+            if OWL.FunctionalProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "fp"
-            elif (s, RDF.type, OWL.ObjectProperty) in self.G:
+            elif OWL.ObjectProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "op"
-            elif (s, RDF.type, OWL.DatatypeProperty) in self.G:
+            elif OWL.DatatypeProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "dp"
-            elif (s, RDF.type, OWL.AnnotationProperty) in self.G:
+            elif OWL.AnnotationProperty in types:
                 self.PROPERTIES[prop]["prop_type"] = "ap"
             else:
                 self.PROPERTIES[prop]["prop_type"] = "p"
@@ -675,181 +444,96 @@ class OntDoc(BaseProfile):
             self.PROPERTIES[prop]["ranges"] = []
             self.PROPERTIES[prop]["rangeIncludes"] = []
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 if p == DCTERMS.title:
                     self.PROPERTIES[prop]["title"] = str(o)
 
                 if p == DCTERMS.description:
-                    if self.outputformat == "md":
-                        self.PROPERTIES[prop]["description"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.PROPERTIES[prop]["description"] = str(o)
-                    else:
-                        self.PROPERTIES[prop]["description"] = markdown.markdown(str(o))
+                    self.PROPERTIES[prop]["description"] = str(o)
 
                 if p == SKOS.scopeNote:
-                    if self.outputformat == "md":
-                        self.PROPERTIES[prop]["scopeNote"] = str(o)
-                    elif self.outputformat == "adoc":
-                        self.PROPERTIES[prop]["scopeNote"] = str(o)
-                    else:
-                        self.PROPERTIES[prop]["scopeNote"] = markdown.markdown(str(o))
+                    self.PROPERTIES[prop]["scopeNote"] = str(o)
 
                 if p == SKOS.example:
-                    self.PROPERTIES[prop]["examples"].append(self._make_example(o))
+                    self.PROPERTIES[prop]["examples"].append(self._extract_example(o))
 
                 if p == RDFS.isDefinedBy:
                     self.PROPERTIES[prop]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.PROPERTIES[prop]["source"] = self._make_formatted_uri(o)
-                    else:
-                        self.PROPERTIES[prop]["source"] = str(o)
+                    self.PROPERTIES[prop]["source"] = str(o)
 
             # patch title from URI if we haven't got one
             if self.PROPERTIES[prop]["title"] is None:
                 self.PROPERTIES[prop]["title"] = self._make_title_from_uri(prop)
 
-            # make fid
-            self.PROPERTIES[prop]["fid"] = self._make_fid(
-                self.PROPERTIES[prop]["title"], prop
-            )
-
             # super properties
-            for o in self.G.objects(subject=s, predicate=RDFS.subPropertyOf):
+            for o in idx.objects(s, RDFS.subPropertyOf):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["supers"].append(str(o))  # self._make_uri_html
 
             # sub properties
-            for o in self.G.subjects(predicate=RDFS.subPropertyOf, object=s):
+            for o in idx.subjects(RDFS.subPropertyOf, s):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["subs"].append(str(o))
 
             # equivalent properties
-            for o in self.G.objects(subject=s, predicate=OWL.equivalentProperty):
+            for o in idx.objects(s, OWL.equivalentProperty):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["equivs"].append(str(o))
 
             # inverse properties
-            for o in self.G.objects(subject=s, predicate=OWL.inverseOf):
+            for o in idx.objects(s, OWL.inverseOf):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["invs"].append(str(o))
 
             # domains
-            for o in self.G.objects(subject=s, predicate=RDFS.domain):
+            for o in idx.objects(s, RDFS.domain):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["domains"].append(str(o))  # domains that are just classes
                 else:
                     # domain collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> rdfs:domain ?domain .
-                            ?domain owl:unionOf|owl:intersectionOf ?collection .
-                            ?domain ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["domains"].append((collection_type, collection_members))
 
             # domainIncludes
-            for o in self.G.objects(subject=s, predicate=SDO.domainIncludes):
+            for o in idx.objects(s, SDO.domainIncludes):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["domainIncludes"].append(
                         str(o)
                     )  # domainIncludes that are just classes
                 else:
                     # domainIncludes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX sdo: <https://schema.org/>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> sdo:domainIncludes ?domainIncludes .
-                            ?domainIncludes owl:unionOf|owl:intersectionOf ?collection .
-                            ?domainIncludes ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["domainIncludes"].append((collection_type, collection_members))
 
             # ranges
-            for o in self.G.objects(subject=s, predicate=RDFS.range):
+            for o in idx.objects(s, RDFS.range):
                 if type(o) != BNode:
                     #self.PROPERTIES[prop]["ranges"].append(self._make_formatted_uri(o, type="c"))
                     #self.PROPERTIES[prop]["ranges"].append(self._build_link(uri=o, type="c", source="ranges"))  # ranges that are just classes
                     self.PROPERTIES[prop]["ranges"].append(o)
                 else:
                     # range collections (unionOf | intersectionOf)
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> rdfs:range ?range .
-                            ?range owl:unionOf|owl:intersectionOf ?collection .
-                            ?range ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["ranges"].append((collection_type, collection_members))
 
             # rangeIncludes
-            for o in self.G.objects(subject=s, predicate=SDO.rangeIncludes):
+            for o in idx.objects(s, SDO.rangeIncludes):
                 if type(o) != BNode:
                     self.PROPERTIES[prop]["rangeIncludes"].append(str(o))  # rangeIncludes that are just classes
                 else:
                     # rangeIncludes collections (unionOf | intersectionOf
-                    q = """
-                        PREFIX owl:  <http://www.w3.org/2002/07/owl#>
-                        PREFIX sdo: <https://schema.org/>
-
-                        SELECT ?col_type ?col_member
-                        WHERE {{
-                            <{}> sdo:rangeIncludes ?rangeIncludes .
-                            ?rangeIncludes owl:unionOf|owl:intersectionOf ?collection .
-                            ?rangeIncludes ?col_type ?collection .
-                            ?collection rdf:rest*/rdf:first ?col_member .
-                        }}
-                    """.format(
-                        s
-                    )
-                    collection_type = None
-                    collection_members = []
-                    for r in self.G.query(q):
-                        collection_type = self._get_curie(str(r.col_type))
-                        collection_members.append(str(r.col_member))
+                    collection_type, collection_members = self._get_collection(o)
                     self.PROPERTIES[prop]["rangeIncludes"].append((collection_type, collection_members))
 
             # TODO: cater for sub property chains
 
+        # make fids
+        for prop, fid in self._make_fids((v["title"], k) for k, v in self.PROPERTIES.items()).items():
+            self.PROPERTIES[prop]["fid"] = fid
+            self._index_link(prop, self.PROPERTIES[prop], self.PROPERTIES[prop]["prop_type"])
+
         # # sort properties by title
         # x = sorted([(k, v) for k, v in self.PROPERTIES.items()], key=lambda tup: tup[1]['title'])
         # y = collections.OrderedDict()
@@ -867,6 +551,7 @@ class OntDoc(BaseProfile):
             self.NAMED_INDIVIDUALS[ni] = {}
 
     def _extract_named_individuals(self):
+        idx = self._adjacency
         for ni in self.NAMED_INDIVIDUALS.keys():
             if ni.startswith("http"):
                 s = URIRef(ni)
@@ -884,11 +569,11 @@ class OntDoc(BaseProfile):
             self.NAMED_INDIVIDUALS[ni]["seeAlso"] = None
             self.NAMED_INDIVIDUALS[ni]["sameAs"] = None
 
-            for p, o in self.G.predicate_objects(subject=s):
+            for p, o in idx.predicate_objects(s):
                 # list all the other classes of this NI
                 if p == RDF.type:
                     if o != OWL.NamedIndividual:
-                        self.NAMED_INDIVIDUALS[ni]["classes"].add(self._make_formatted_uri(o))
+                        self.NAMED_INDIVIDUALS[ni]["classes"].add(o)
 
                 if p == DCTERMS.title:
                     self.NAMED_INDIVIDUALS[ni]["title"] = str(o)
@@ -900,43 +585,41 @@ class OntDoc(BaseProfile):
                     self.NAMED_INDIVIDUALS[ni]["isDefinedBy"] = str(o)
 
                 if p == DCTERMS.source or p == DC.source:
-                    if str(o).startswith('http'):
-                        self.NAMED_INDIVIDUALS[ni]["source"] = self._make_formatted_uri(o)
-                    else:
-                        self.NAMED_INDIVIDUALS[ni]["source"] = str(o)
+                    self.NAMED_INDIVIDUALS[ni]["source"] = str(o)
 
                 if p == RDFS.seeAlso:
-                    self.NAMED_INDIVIDUALS[ni]["seeAlso"] = self._make_formatted_uri(o)
+                    self.NAMED_INDIVIDUALS[ni]["seeAlso"] = str(o)
 
                 if p == OWL.sameAs:
-                    self.NAMED_INDIVIDUALS[ni]["sameAs"] = self._make_formatted_uri(o)
+                    self.NAMED_INDIVIDUALS[ni]["sameAs"] = str(o)
 
             # patch title from URI if we haven't got one
             if self.NAMED_INDIVIDUALS[ni].get("title") is None:
                 self.NAMED_INDIVIDUALS[ni]["title"] = self._make_title_from_uri(ni)
 
-            # make fid
-            self.NAMED_INDIVIDUALS[ni]["fid"] = self._make_fid(self.NAMED_INDIVIDUALS[ni]["title"], ni)
+        # make fids
+        for ni, fid in self._make_fids((v["title"], k) for k, v in self.NAMED_INDIVIDUALS.items()).items():
+            self.NAMED_INDIVIDUALS[ni]["fid"] = fid
 
     def _make_metadata(self):
         return self._load_template("metadata." + self.outputformat).render(
-            imports=sorted(self.METADATA["imports"]),
+            imports=sorted(self._make_formatted_uri(x) for x in self.METADATA["imports"]),
             title=self.METADATA.get("title"),
             uri=self.METADATA.get("uri"),
-            version_uri=self.METADATA.get("versionIRI"),
-            publishers=sorted(self.METADATA["publishers"]),
-            creators=sorted(self.METADATA["creators"]),
-            contributors=sorted(self.METADATA["contributors"]),
+            version_uri=self._make_optional_uri(self.METADATA.get("versionIRI")),
+            publishers=self._make_agents(self.METADATA["publishers"]),
+            creators=self._make_agents(self.METADATA["creators"]),
+            contributors=self._make_agents(self.METADATA["contributors"]),
             created=self.METADATA.get("created"),  # TODO: auto-detect format
             modified=self.METADATA.get("modified"),
             issued=self.METADATA.get("issued"),
-            source=self.METADATA.get("source"),
-            description=self.METADATA.get("description"),
-            historyNote=self.METADATA.get("historyNote"),
+            source=self._make_uri_or_text(self.METADATA.get("source")),
+            description=self._make_text(self.METADATA.get("description")),
+            historyNote=self._make_text(self.METADATA.get("historyNote")),
             version_info=self.METADATA.get("versionInfo"),
-            license=self.METADATA.get("license"),
-            rights=self.METADATA.get("rights"),
-            repository=self.METADATA.get("repository"),
+            license=self._make_uri_or_text(self.METADATA.get("license")),
+            rights=self._make_rights(self.METADATA.get("rights")),
+            repository=self._make_optional_uri(self.METADATA.get("repository")),
             ont_rdf=self._make_source_file_link(),
             has_classes=self.METADATA.get("has_classes"),
             has_ops=self.METADATA.get("has_ops"),
@@ -949,56 +632,42 @@ class OntDoc(BaseProfile):
 
     def _make_class(self, uri, class_):
         class_template = self._load_template("class." + self.outputformat)
-        # handling Markdown formatting within a table
-        if self.outputformat == "md":
-            desc = class_["description"].replace("\n", " ") if class_.get("description") is not None else None
-        elif self.outputformat == "adoc":
-            desc = class_["description"]
-        else:
-            desc = class_["description"]
+        links = self._make_class_links(class_)
 
         return class_template.render(
             uri=uri,
             fid=class_["fid"],
             title=class_["title"],
-            description=desc,
-            supers=class_["supers"],
-            restrictions=class_["restrictions"],
-            scopeNote=class_["scopeNote"],
-            examples=class_["examples"],
+            # handling Markdown formatting within a table
+            description=self.renderer.table_text(self._make_text(class_["description"])),
+            supers=links["supers"],
+            restrictions=links["restrictions"],
+            scopeNote=self._make_text(class_["scopeNote"]),
+            examples=[self._make_example(x) for x in class_["examples"]],
             is_defined_by=class_["isDefinedBy"],
-            source=class_["source"],
-            subs=class_["subs"],
-            in_domain_of=class_["in_domain_of"],
-            in_domain_includes_of=class_["in_domain_includes_of"],
-            in_range_of=class_["in_range_of"],
-            in_range_includes_of=class_["in_range_includes_of"],
-            has_members=class_["has_members"]
+            source=self._make_uri_or_text(class_["source"]),
+            subs=links["subs"],
+            in_domain_of=links["in_domain_of"],
+            in_domain_includes_of=links["in_domain_includes_of"],
+            in_range_of=links["in_range_of"],
+            in_range_includes_of=links["in_range_includes_of"],
+            has_members=links["has_members"]
         )
 
     def _make_class2(self, class2):
-        # handling Markdown formatting within a table
-        if self.outputformat == "md":
-            desc = class2[1].get("description").replace("\n", " ") \
-                if class2[1].get("description") is not None else None
-        elif self.outputformat == "adoc":
-            desc = class2[1].get("description")
-        else:
-            desc = class2[1].get("description")
-
         return self._load_template("class." + self.outputformat).render(
             uri=class2[0],
             fid=class2[1].get("fid"),
             title=class2[1].get("title"),
-            description=desc,
+            # handling Markdown formatting within a table
+            description=self.renderer.table_text(self._make_text(class2[1].get("description"))),
         )
 
-
     def _make_classes(self):
-        # make all the individual Classes
+        # make all the individual Classes, each only as the template writes it
         classes_list = []
         for k, v in self.CLASSES.items():
-            classes_list.append(self._make_class(k, v))
+            classes_list.append(Deferred(self._make_fragment, k, v, self._make_class, k, v))
 
         cl_instances = []
 
@@ -1007,7 +676,7 @@ class OntDoc(BaseProfile):
                 (
                     v["title"],
                     v["fid"],
-                    self._make_class2((k, v)),
+                    Deferred(self._make_class2, (k, v)),
                 )
             )
 
@@ -1019,40 +688,34 @@ class OntDoc(BaseProfile):
         #     key=lambda tup: tup[1],
         # )
         class_index = [f"<li>{self._make_formatted_uri(x)}</li>" for x in self.CLASSES.keys()]
-        return classes_template.render(class_index=class_index, classes=classes_list, cl_instances=cl_instances, )
+        yield from classes_template.generate(class_index=class_index, classes=classes_list, cl_instances=cl_instances, )
 
     def _make_property(self, property):
-        # handling Markdown formatting within a table
-        if self.outputformat == "md":
-            desc = property[1].get("description").replace("\n", " ") \
-                if property[1].get("description") is not None else None
-        elif self.outputformat == "adoc":
-            desc = property[1].get("description")
-        else:
-            desc = property[1].get("description")
+        links = self._make_property_links(property[1])
 
         return self._load_template("property." + self.outputformat).render(
             uri=property[0],
             fid=property[1].get("fid"),
             property_type=property[1].get("prop_type"),
             title=property[1].get("title"),
-            description=desc,
-            scopeNote=property[1].get("scopeNote"),
-            examples=property[1].get("examples"),
+            # handling Markdown formatting within a table
+            description=self.renderer.table_text(self._make_text(property[1].get("description"))),
+            scopeNote=self._make_text(property[1].get("scopeNote")),
+            examples=[self._make_example(x) for x in property[1].get("examples")],
             is_defined_by=property[1].get("isDefinedBy"),
-            source=property[1].get("source"),
-            supers=property[1].get("supers"),
-            subs=property[1].get("subs"),
-            equivs=property[1].get("equivs"),
-            invs=property[1].get("invs"),
-            domains=property[1]["domains"],
-            domainIncludes=property[1]["domainIncludes"],
-            ranges=property[1]["ranges"],
-            rangeIncludes=property[1]["rangeIncludes"],
+            source=self._make_uri_or_text(property[1].get("source")),
+            supers=links["supers"],
+            subs=links["subs"],
+            equivs=links["equivs"],
+            invs=links["invs"],
+            domains=links["domains"],
+            domainIncludes=links["domainIncludes"],
+            ranges=links["ranges"],
+            rangeIncludes=links["rangeIncludes"],
         )
 
     def _make_properties(self):
-        # make all properties, grouped by OWL type
+        # make all properties, grouped by OWL type, each only as the template writes it
         op_instances = []
         fp_instances = []
         dp_instances = []
@@ -1065,7 +728,7 @@ class OntDoc(BaseProfile):
                     (
                         v["title"],
                         v["fid"],
-                        self._make_property((k, v)),
+                        Deferred(self._make_fragment, k, v, self._make_property, (k, v)),
                     )
                 )
             elif v.get("prop_type") == "fp":
@@ -1073,7 +736,7 @@ class OntDoc(BaseProfile):
                     (
                         v["title"],
                         v["fid"],
-                        self._make_property((k, v)),
+                        Deferred(self._make_fragment, k, v, self._make_property, (k, v)),
                     )
                 )
             elif v.get("prop_type") == "dp":
@@ -1081,7 +744,7 @@ class OntDoc(BaseProfile):
                     (
                         v["title"],
                         v["fid"],
-                        self._make_property((k, v)),
+                        Deferred(self._make_fragment, k, v, self._make_property, (k, v)),
                     )
                 )
             elif v.get("prop_type") == "ap":
@@ -1089,7 +752,7 @@ class OntDoc(BaseProfile):
                     (
                         v["title"],
                         v["fid"],
-                        self._make_property((k, v)),
+                        Deferred(self._make_fragment, k, v, self._make_property, (k, v)),
                     )
                 )
             elif v.get("prop_type") == "p":
@@ -1097,12 +760,12 @@ class OntDoc(BaseProfile):
                     (
                         v["title"],
                         v["fid"],
-                        self._make_property((k, v)),
+                        Deferred(self._make_fragment, k, v, self._make_property, (k, v)),
                     )
                 )
 
         # make the template for all properties
-        return self._load_template("properties." + self.outputformat).render(
+        yield from self._load_template("properties." + self.outputformat).generate(
             op_instances=op_instances,
             fp_instances=fp_instances,
             dp_instances=dp_instances,
@@ -1114,20 +777,20 @@ class OntDoc(BaseProfile):
         return self._load_template("named_individual." + self.outputformat).render(
             uri=named_individual[0],
             fid=named_individual[1].get("fid"),
-            classes=named_individual[1].get("classes"),
+            classes={self._make_formatted_uri(x) for x in named_individual[1].get("classes")},
             title=named_individual[1].get("title"),
             description=named_individual[1].get("description"),
             is_defined_by=named_individual[1].get("isDefinedBy"),
-            source=named_individual[1].get("source"),
-            see_also=named_individual[1].get("seeAlso"),
-            same_as=named_individual[1].get("sameAs")
+            source=self._make_uri_or_text(named_individual[1].get("source")),
+            see_also=self._make_optional_uri(named_individual[1].get("seeAlso")),
+            same_as=self._make_optional_uri(named_individual[1].get("sameAs"))
         )
 
     def _make_named_individuals(self):
         named_individuals_list = []
         for k, v in self.NAMED_INDIVIDUALS.items():
             named_individuals_list.append(
-                self._make_named_individual((k, v))
+                Deferred(self._make_fragment, k, v, self._make_named_individual, (k, v))
             )
 
         # add in NIs index
@@ -1136,103 +799,37 @@ class OntDoc(BaseProfile):
             if v.get("fid") is not None:  # ensure BNodes not added
                 fids.append((v.get("fid"), v.get("title")))
         fids = sorted(fids, key=lambda tup: tup[1])
-        return self._load_template("named_individuals." + self.outputformat).render(
+        yield from self._load_template("named_individuals." + self.outputformat).generate(
             fids=fids,
             named_individuals=named_individuals_list
         )
 
     def _make_code(self, field_var) -> str:
         """Returns the given field_var as code (<code>) in this instances' output format"""
-        if self.outputformat == "md":
-            escaped_var = field_var.rstrip().replace("\t", "    ").split("\n")
-            eg2 = ""
-            for line in escaped_var:
-                eg2 += f"`{line}` <br /> "
-            field_var = eg2
-            return field_var
-        if self.outputformat == "adoc":
-            return f"....\n{field_var}\n....\n\n"
-        else:
-            escaped_var = field_var.replace("<", "&lt;").replace(">", "&gt;")
-            return f"<pre>{escaped_var}</pre>"
+        return self.renderer.code(field_var)
 
-    def _make_resource_descriptor_example(self, rd: Union[URIRef, BNode]) -> str:
-        code_formats = [
-            "text/turtle",
-            "text/n3",
-            "application/ld+json",
-            "application/json",
-            "application/rdf+xml",
-            "application/xml",
-        ]
-        markup_formats = [
-            "text/html",
-            "text/markdown",
-            "text/asciidoc",
-            # "text/x-rst"
-        ]
-        is_code = False
-        is_markup = False
-        artifact = None
-        format = None
-        conforms_to = None
+    def _extract_resource_descriptor_example(self, rd: Union[URIRef, BNode]) -> dict:
+        example = {"type": "resource_descriptor", "format": None, "conforms_to": None, "artifact": None}
         for p, o in self.G.predicate_objects(subject=rd):
             if p == DCTERMS["format"]:
-                format = str(o)
-                if format in code_formats:
-                    is_code = True
-                elif format in markup_formats:
-                    is_markup = True
+                example["format"] = str(o)
             elif p == DCTERMS.conformsTo:
-                conforms_to = str(o)
+                example["conforms_to"] = str(o)
             elif p == PROF.hasArtifact:
-                artifact = str(o)
+                example["artifact"] = str(o)
 
-        eg = ""
-        if is_code:
-            eg = self._make_code(artifact)
-        elif is_markup:
-            if format == "text/html" and self.outputformat in ["html", "md"]:
-                eg = artifact
-            elif format == "text/html" and self.outputformat == "adoc":
-                eg = f"+++{artifact}+++\n&nbsp;"
-            elif format == "text/markdown" and self.outputformat == "md":
-                eg = artifact
-            elif format == "text/markdown" and self.outputformat == "adoc":
-                eg = f"+++{markdown.markdown(artifact)}+++\n&nbsp;"
-            elif format == "text/markdown" and self.outputformat == "html":
-                eg = markdown.markdown(artifact)
-            elif format == "text/asciidoc" and self.outputformat == "html":  # TODO: test ASCIIDOC rendering in HTML
-                eg = markdown.markdown(artifact)
-        else:
-            eg = self._make_code(artifact)
-
-        if conforms_to is not None:
-            if self.outputformat == "html":
-                return f"<div style=\"border:solid 1px lightgrey; padding:5px;\">{eg}<br />Conforms to: <a href=\"{conforms_to}\">{conforms_to}</a></div>"
-            elif self.outputformat == "md":
-                return f"{eg}\n\nConforms to: [{conforms_to}]({conforms_to})"
-            elif self.outputformat == "adoc":
-                return f"{eg}\n\nConforms to: link:{conforms_to}[{conforms_to}]"
-        else:
-            return eg
+        return example
 
-    def _make_example(self, o: Union[URIRef, BNode, Literal]) -> str:
-        """Returns an HTML / Markdown / ASCIIDOC string of this Class / Property's example, formatted according
-        to this OntDoc instance's outputformat instance variable. All content needed is extracted from this
-        instance's graph (self.G)"""
+    def _extract_example(self, o: Union[URIRef, BNode, Literal]) -> dict:
+        """Returns a Class / Property's example as a dict with a "type" - image, link, resource_descriptor, html or
+        code - and the content needed to render it, all extracted from this instance's graph (self.G)"""
 
         o_str = str(o)
 
         # check to see if it is an image, if so, render it
         # could be a URIRef or Literal
         if re.findall(r"(.png|.jpg|.tiff|.gif|.webp|.pdf|.svg)#?", o_str):
-            if self.outputformat == "md":
-                return f"![]({o_str}) "
-            if self.outputformat == "adoc":
-                return f"image::{o_str}[]"
-            else:
-                return f"<img src=\"{o_str}\" />"
+            return {"type": "image", "value": o_str}
 
         # check to see if this is a hyperlink only, if so, render a link
         # could be a URIRef or Literal
@@ -1243,49 +840,91 @@ class OntDoc(BaseProfile):
                 local = True
 
             if local:
-                return self._make_resource_descriptor_example(o)
+                return self._extract_resource_descriptor_example(o)
 
-            if self.outputformat == "md":
-                return f"[{o_str}]({o_str}) "
-            elif self.outputformat == "adoc":
-                return f"{o_str} "
-            else:  # self.outputformat == "md":
-                return f"<a href=\"{o_str}\">{o_str}</a>"
+            return {"type": "link", "value": o_str}
 
         # check to see if it's a BN for further handling or a Literal
         if type(o) == BNode:
             # it must be a Resource Descriptor BN
-            return self._make_resource_descriptor_example(o)
+            return self._extract_resource_descriptor_example(o)
         elif type(o) == Literal:
             # handle any declared datatypes (within rdf:HTML, rdf:XMLLiteral & rdf:JSON)
             if o.datatype == RDF.HTML:
-                if self.outputformat == "md":
-                    return str(o)
-                elif self.outputformat == "adoc":
-                    return f"+++{str(o)}+++\n&nbsp;"
-                else:  # self.outputformat == "html":
-                    return str(o)
-            if o.datatype == RDF.XMLLiteral or RDF.JSON:
-                return self._make_code(o)
+                return {"type": "html", "value": o_str}
 
         # fall-back: just print out a <code>-formatted literal
-        return self._make_code(o)
+        return {"type": "code", "value": o_str}
+
+    def _make_resource_descriptor_example(self, example: dict) -> str:
+        code_formats = [
+            "text/turtle",
+            "text/n3",
+            "application/ld+json",
+            "application/json",
+            "application/rdf+xml",
+            "application/xml",
+        ]
+        markup_formats = [
+            "text/html",
+            "text/markdown",
+            "text/asciidoc",
+            # "text/x-rst"
+        ]
+        format = example["format"]
+        artifact = example["artifact"]
+
+        eg = ""
+        if format in code_formats:
+            eg = self._make_code(artifact)
+        elif format in markup_formats:
+            if format == "text/html" and self.outputformat in ["html", "md"]:
+                eg = artifact
+            elif format == "text/html" and self.outputformat == "adoc":
+                eg = self.renderer.embedded_html(artifact)
+            elif format == "text/markdown":
+                eg = self.renderer.embedded_markdown(artifact)
+            elif format == "text/asciidoc" and self.outputformat == "html":  # TODO: test ASCIIDOC rendering in HTML
+                eg = markdown.markdown(artifact)
+        else:
+            eg = self._make_code(artifact)
+
+        if example["conforms_to"] is not None:
+            return self.renderer.conforms_to(eg, example["conforms_to"])
+        else:
+            return eg
+
+    def _make_example(self, example: dict) -> str:
+        """Returns an HTML / Markdown / ASCIIDOC string of an example from _extract_example(), formatted according
+        to this OntDoc instance's outputformat instance variable"""
+        if example["type"] == "image":
+            return self.renderer.image(example["value"])
+        elif example["type"] == "link":
+            return self.renderer.example_link(example["value"])
+        elif example["type"] == "resource_descriptor":
+            return self._make_resource_descriptor_example(example)
+        elif example["type"] == "html":
+            return self.renderer.embedded_html(example["value"])
+        else:
+            return self._make_code(example["value"])
 
     def _make_document(self):
+        """Generates the document in pieces. The sections, and the entities within them, are made in document order
+        as the pieces are consumed"""
         css = None
         if self.outputformat == "html":
             if self.include_css:
                 css = open(path.join(STYLE_DIR, "pylode.css")).read()
 
-        return self._load_template("document." + self.outputformat).render(
+        yield from self._load_template("document." + self.outputformat).generate(
             schemaorg=self._make_schemaorg_metadata(),  # only does something for the HTML templates
             title=self.METADATA["title"],
-            metadata=self._make_metadata(),
+            metadata=Deferred(self._make_metadata),
             classes=self._make_classes(),
             properties=self._make_properties(),
             named_individuals=self._make_named_individuals(),
             default_namespace=self.METADATA["default_namespace"],
-            namespaces=self._make_namespaces(),
+            namespaces=Deferred(self._make_namespaces),
             css=css,
             pylode_version=__version__
         )
@@ -1294,230 +933,199 @@ class OntDoc(BaseProfile):
         if uri == None:
             return self._make_formatted_uri(uri, type=type)
 
-        found = 0
-        link = ""
-        for k, v in self.PROPERTIES.items():
-            if k == uri:
-                title = v.get("title")
-                link = "<a href=#" + title.replace(" ", "") + ">" + v.get("title") + "</a>"
-                found = 1
-                break
-        if found == 0:
-            for k, v in self.CLASSES.items():
-                if k == uri:
-                    title = v.get("title")
-                    link = "<a href=#" + title.replace(" ", "") + ">" + v.get("title") + "</a>"
-                    found = 1
-                    break
-        if found == 0:
-            link = self._make_formatted_uri(uri, type=type)
-
-        return link
+        link = self.LINK_INDEX.get(uri)
+        if link is not None:
+            title = link[0]
+            return "<a href=#" + title.replace(" ", "") + ">" + title + "</a>"
+
+        return self._make_formatted_uri(uri, type=type)
+
+    def _make_property_links(self, prop):
+        """Formats a Property's related Classes & Properties as links"""
+        links = {}
+        html = []
+        for p in prop["supers"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type))
+        links["supers"] = natsorted(html)
+
+        html = []
+        for p in prop["subs"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type))
+        links["subs"] = natsorted(html)
+
+        html = []
+        for p in prop["equivs"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="equivs"))
+        links["equivs"] = natsorted(html)
+
+        html = []
+        for p in prop["invs"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="equivs"))
+        links["invs"] = natsorted(html)
+
+        html = []
+        for d in prop["domains"]:
+            if type(d) == tuple:
+                html.append(self._make_collection_class_html(d[0], d[1]))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="domains"))
 
-    def generate_document(self):
-        # expand the graph using pre-defined rules to make querying easier (poor man's inference)
-        self._expand_graph()
-        # get all the namespaces using several methods
-        self._extract_namespaces()
-        # get the default namespace
-        self._get_default_namespace()
+        links["domains"] = natsorted(html)
+
+        html = []
+        for d in prop["domainIncludes"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    #html.append(self._make_formatted_uri(m, type="c"))
+                    html.append(self._build_link(uri=m, type="c", source="domainIncludes"))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="domainIncludes"))
+        links["domainIncludes"] = natsorted(html)
+
+        html = []
+        for d in prop["ranges"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    html.append(m)
+                    #html.append(self._build_link(uri=m, source="ranges"))
+            else:
+                html.append(self._build_link(uri=str(d), source="ranges")) #html.append(d) #http://purl.obolibrary.org/obo/GSSO_009994
+        links["ranges"] = natsorted(html)
+
+        html = []
+        for d in prop["rangeIncludes"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    #html.append(self._make_formatted_uri(m, type="c"))
+                    html.append(self._build_link(uri=m, type="c", source="rangeIncludes"))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="rangeIncludes"))
+        links["rangeIncludes"] = natsorted(html)
+
+        return links
+
+    def _make_class_links(self, class_):
+        """Formats a Class' related Classes, Properties & Restrictions as links"""
+        links = {}
+        html = []
+        for d in class_["equivalents"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    #html.append(self._make_formatted_uri(m, type="c"))
+                    html.append(self._build_link(uri=m, type="c", source="equivalents"))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="echivalents"))
+        links["equivalents"] = natsorted(html)
+
+        html = []
+        for d in class_["supers"]:
+            if type(d) == tuple:
+                html.append(self._make_collection_class_html(d[0], d[1]))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="supers"))
+        links["supers"] = natsorted(html)
+
+        html = []
+        for d in class_["restrictions"]:
+            html.append(self._make_restriction_html(d))
+        links["restrictions"] = natsorted(html)
+
+        html = []
+        for d in class_["subs"]:
+            if type(d) == tuple:
+                for m in d[1]:
+                    #html.append(self._make_formatted_uri(m, type="c"))
+                    html.append(self._build_link(uri=m, type="c", source="subs"))
+            else:
+                #html.append(self._make_formatted_uri(d, type="c"))
+                html.append(self._build_link(uri=d, type="c", source="subs"))
+        links["subs"] = natsorted(html)
+
+        html = []
+        for p in class_["in_domain_of"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="if_domain_of"))
+
+        links["in_domain_of"] = natsorted(html)
+
+        html = []
+        for p in class_["in_domain_includes_of"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="in_domain_includes_of"))
+        links["in_domain_includes_of"] = natsorted(html)
+
+        html = []
+        for p in class_["in_range_of"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="in_range_of"))
+        links["in_range_of"] = natsorted(html)
+
+        html = []
+        for p in class_["in_range_includes_of"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="in_range_includes_of"))
+        links["in_range_includes_of"] = natsorted(html)
+
+        html = []
+        for p in class_["has_members"]:
+            prop_type = self._get_prop_type(p)
+            #html.append(self._make_formatted_uri(p, type=prop_type))
+            html.append(self._build_link(uri=p, type=prop_type, source="has_members"))
+        links["has_members"] = natsorted(html)
+
+        return links
+
+    def _extract_model(self):
         # get the IDs (URIs) of all properties -> self.PROPERTIES
-        self._extract_properties_uris()
+        with self._phase("extract_properties_uris"):
+            self._extract_properties_uris()
         # get the IDs (URIs) of all classes -> CLASSES
-        self._extract_classes_uris()
+        with self._phase("extract_classes_uris"):
+            self._extract_classes_uris()
         # get the IDs (URIs) of all Named Individuals -> NAMED_INDIVIDUALS
-        self._extract_named_individuals_uris()
+        with self._phase("extract_named_individuals_uris"):
+            self._extract_named_individuals_uris()
+        # index the edges the details are extracted from -> _adjacency
+        with self._phase("index_adjacency"):
+            self._adjacency = AdjacencyIndex(self.G, self.ADJACENCY_PREDICATES)
         # get all the properties' details
-        self._extract_properties()
-        # get all the classes' details
-        self._extract_classes()
+        with self._phase("extract_properties"):
+            self._extract_properties()
+        # get all the classes' details, including links to the properties that have them as domains & ranges
+        with self._phase("extract_classes"):
+            self._extract_classes()
         # get all the Named Individuals' details
-        self._extract_named_individuals()
+        with self._phase("extract_named_individuals"):
+            self._extract_named_individuals()
+        self._adjacency = None  # only needed to extract them
         # get the ontology's metadata
-        self._extract_metadata()
-        # create fragment URIs for default namespace classes & properties
-        # for each CURIE, if it's in the default namespace, i.e. this ontology, use its fragment URI
-
-        # crosslinking properties
-        for uri, prop in self.PROPERTIES.items():
-            html = []
-            for p in prop["supers"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type))
-            self.PROPERTIES[uri]["supers"] = natsorted(html)
-
-            html = []
-            for p in prop["subs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type))
-            self.PROPERTIES[uri]["subs"] = natsorted(html)
-
-            html = []
-            for p in prop["equivs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="equivs"))
-            self.PROPERTIES[uri]["equivs"] = natsorted(html)
-
-            html = []
-            for p in prop["invs"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="equivs"))
-            self.PROPERTIES[uri]["invs"] = natsorted(html)
-
-            html = []
-            for d in prop["domains"]:
-                if type(d) == tuple:
-                    html.append(self._make_collection_class_html(d[0], d[1]))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="domains"))
+        with self._phase("extract_metadata"):
+            self._extract_metadata()
 
-            self.PROPERTIES[uri]["domains"] = natsorted(html)
+    def stream_document(self):
+        # extract the format-neutral model, unless already done for another output format
+        self._prepare()
 
-            html = []
-            for d in prop["domainIncludes"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        #html.append(self._make_formatted_uri(m, type="c"))
-                        html.append(self._build_link(uri=m, type="c", source="domainIncludes"))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="domainIncludes"))
-            self.PROPERTIES[uri]["domainIncludes"] = natsorted(html)
-
-            html = []
-            for d in prop["ranges"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        html.append(m)
-                        #html.append(self._build_link(uri=m, source="ranges"))
-                else:
-                    html.append(self._build_link(uri=str(d), source="ranges")) #html.append(d) #http://purl.obolibrary.org/obo/GSSO_009994
-            self.PROPERTIES[uri]["ranges"] = natsorted(html)
-
-            html = []
-            for d in prop["rangeIncludes"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        #html.append(self._make_formatted_uri(m, type="c"))
-                        html.append(self._build_link(uri=m, type="c", source="rangeIncludes"))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="rangeIncludes"))
-            self.PROPERTIES[uri]["rangeIncludes"] = natsorted(html)
-
-        # crosslinking classes
-        for uri, cls in self.CLASSES.items():
-            html = []
-            for d in cls["equivalents"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        #html.append(self._make_formatted_uri(m, type="c"))
-                        html.append(self._build_link(uri=m, type="c", source="equivalents"))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="echivalents"))
-            self.CLASSES[uri]["equivalents"] = natsorted(html)
-
-            html = []
-            for d in cls["supers"]:
-                if type(d) == tuple:
-                    html.append(self._make_collection_class_html(d[0], d[1]))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="supers"))
-            self.CLASSES[uri]["supers"] = natsorted(html)
-
-            html = []
-            for d in cls["restrictions"]:
-                html.append(self._make_restriction_html(uri, d))
-            self.CLASSES[uri]["restrictions"] = natsorted(html)
-
-            html = []
-            for d in cls["subs"]:
-                if type(d) == tuple:
-                    for m in d[1]:
-                        #html.append(self._make_formatted_uri(m, type="c"))
-                        html.append(self._build_link(uri=m, type="c", source="subs"))
-                else:
-                    #html.append(self._make_formatted_uri(d, type="c"))
-                    html.append(self._build_link(uri=d, type="c", source="subs"))
-            self.CLASSES[uri]["subs"] = natsorted(html)
-
-            html = []
-            for p in cls["in_domain_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="if_domain_of"))
-
-            self.CLASSES[uri]["in_domain_of"] = natsorted(html)
-
-            html = []
-            for p in cls["in_domain_includes_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="in_domain_includes_of"))
-            self.CLASSES[uri]["in_domain_includes_of"] = natsorted(html)
-
-            html = []
-            for p in cls["in_range_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="in_range_of"))
-            self.CLASSES[uri]["in_range_of"] = natsorted(html)
-
-            html = []
-            for p in cls["in_range_includes_of"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="in_range_includes_of"))
-            self.CLASSES[uri]["in_range_includes_of"] = natsorted(html)
-
-            html = []
-            for p in cls["has_members"]:
-                prop_type = (
-                    self.PROPERTIES.get(p).get("prop_type")
-                    if self.PROPERTIES.get(p)
-                    else None
-                )
-                #html.append(self._make_formatted_uri(p, type=prop_type))
-                html.append(self._build_link(uri=p, type=prop_type, source="has_members"))
-            self.CLASSES[uri]["has_members"] = natsorted(html)
+        # when streamed, rendering includes the time taken to write each piece out
+        with self._phase("render"):
+            yield from self._make_document()
 
-        return self._make_document()
+    def generate_document(self):
+        return "".join(self.stream_document())
@@ -1,17 +1,24 @@
 from pylode import __version__
-from pylode.common import STYLE_DIR, TEMPLATES_DIR
+from pylode.common import STYLE_DIR
 import collections
 from os import path
 from rdflib import URIRef, BNode, Literal
 from rdflib.namespace import DC, DCTERMS, OWL, PROF, RDF, RDFS, SDO, SKOS
-from itertools import chain
 import markdown
-from jinja2 import Environment, FileSystemLoader
-from os.path import join
+from pylode.expansion import AGENT_RULES, Move, ObjectType
 from pylode.profiles.base import BaseProfile
+from pylode.templating import get_template
 
 
 class Prof(BaseProfile):
+    MODEL = BaseProfile.MODEL + ["RESOURCE_DESCRIPTORS"]
+    EXPANSION_RULES = [
+        Move("label", [DC.title, SKOS.prefLabel, DCTERMS.title], RDFS.label),
+        Move("comment", [DC.description, DCTERMS.description, SDO.description, SKOS.definition], RDFS.comment),
+    ] + AGENT_RULES + [
+        ObjectType("resource descriptors", PROF.hasResource, PROF.ResourceDescriptor),
+    ]
+
     def __init__(
             self,
             g,
@@ -33,71 +40,12 @@ class Prof(BaseProfile):
         self.RESOURCE_DESCRIPTORS = collections.OrderedDict()
 
     def _load_template(self, template_file):
-        return Environment(loader=FileSystemLoader(join(TEMPLATES_DIR, "prof"))).get_template(template_file)
+        return get_template(template_file, "prof")
 
     # use parent class - i.e. no overriding
     # def _make_formatted_uri(self, uri):
     #     pass
 
-    def _expand_graph(self):
-        # label
-        for s, o in chain(
-                self.G.subject_objects(DC.title),
-                self.G.subject_objects(SKOS.prefLabel),
-                self.G.subject_objects(DCTERMS.title)
-        ):
-            self.G.remove((s, DC.title, o))
-            self.G.remove((s, SKOS.prefLabel, o))
-            self.G.remove((s, DCTERMS.title, o))
-            self.G.add((s, RDFS.label, o))
-
-        # comment
-        for s, o in chain(
-                self.G.subject_objects(DC.description),
-                self.G.subject_objects(DCTERMS.description),
-                self.G.subject_objects(SDO.description),
-                self.G.subject_objects(SKOS.definition),
-        ):
-            self.G.remove((s, DC.description, o))
-            self.G.remove((s, DCTERMS.description, o))
-            self.G.remove((s, SDO.description, o))
-            self.G.remove((s, SKOS.definition, o))
-            self.G.add((s, RDFS.comment, o))
-
-        # Agents
-        # creator
-        for s, o in chain(
-                self.G.subject_objects(DC.creator),
-                self.G.subject_objects(SDO.creator),
-                self.G.subject_objects(SDO.author)  # conflate SDO.author with DCTERMS.creator
-        ):
-            self.G.remove((s, DC.creator, o))
-            self.G.remove((s, SDO.creator, o))
-            self.G.remove((s, SDO.author, o))
-            self.G.add((s, DCTERMS.creator, o))
-
-        # contributor
-        for s, o in chain(
-                self.G.subject_objects(DC.contributor),
-                self.G.subject_objects(SDO.contributor)
-        ):
-            self.G.remove((s, DC.contributor, o))
-            self.G.remove((s, SDO.contributor, o))
-            self.G.add((s, DCTERMS.contributor, o))
-
-        # publisher
-        for s, o in chain(
-                self.G.subject_objects(DC.publisher),
-                self.G.subject_objects(SDO.publisher)
-        ):
-            self.G.remove((s, DC.publisher, o))
-            self.G.remove((s, SDO.publisher, o))
-            self.G.add((s, DCTERMS.publisher, o))
-
-        # Resource Descriptors
-        for s, o in self.G.subject_objects(PROF.hasResource):
-            self.G.add((o, RDF.type, PROF.ResourceDescriptor))
-
     def _extract_resource_descriptors(self):
         """Extracts Resource Descriptors"""
         resource_descriptors = []
@@ -125,22 +73,21 @@ class Prof(BaseProfile):
                 elif p == RDFS.comment:
                     self.RESOURCE_DESCRIPTORS[rd]["comment"] = str(o)
                 elif p == PROF.hasArtifact:
-                    self.RESOURCE_DESCRIPTORS[rd]["artifact"] = self._make_formatted_uri(str(o))
+                    self.RESOURCE_DESCRIPTORS[rd]["artifact"] = str(o)
                 elif p == PROF.hasRole:
-                    self.RESOURCE_DESCRIPTORS[rd]["roles"].add(self._make_formatted_uri(str(o)))
+                    self.RESOURCE_DESCRIPTORS[rd]["roles"].add(str(o))
                 elif p == DCTERMS.conformsTo:
-                    self.RESOURCE_DESCRIPTORS[rd]["conforms"].add(self._make_formatted_uri(str(o)))
+                    self.RESOURCE_DESCRIPTORS[rd]["conforms"].add(str(o))
                 elif p == DCTERMS.format:
                     self.RESOURCE_DESCRIPTORS[rd]["format"] = str(o)
 
             self.RESOURCE_DESCRIPTORS[rd]["roles"] = list(self.RESOURCE_DESCRIPTORS[rd]["roles"])
             self.RESOURCE_DESCRIPTORS[rd]["conforms"] = list(self.RESOURCE_DESCRIPTORS[rd]["conforms"])
 
-            # make fid
-            if type(rd) is BNode:
-                self.RESOURCE_DESCRIPTORS[rd]["fid"] = str(rd)
-            else:  # URI
-                self.RESOURCE_DESCRIPTORS[rd]["fid"] = self._make_fid(str(rd), str(rd))
+        # make fids, Blank Nodes' being their IDs
+        fids = self._make_fids((str(rd), str(rd)) for rd in self.RESOURCE_DESCRIPTORS.keys() if type(rd) is not BNode)
+        for rd in self.RESOURCE_DESCRIPTORS.keys():
+            self.RESOURCE_DESCRIPTORS[rd]["fid"] = str(rd) if type(rd) is BNode else fids[str(rd)]
 
     def _extract_profile(self):
         """Extracts standard prof:Profile metadata
@@ -157,7 +104,7 @@ class Prof(BaseProfile):
                     self.METADATA["label"] = str(o)
 
                 if p == RDFS.comment:
-                    self.METADATA["comment"] = markdown.markdown(str(o))
+                    self.METADATA["comment"] = str(o)
 
                 # dates
                 if p in [DCTERMS.created, DCTERMS.modified, DCTERMS.issued]:
@@ -165,7 +112,7 @@ class Prof(BaseProfile):
                     self.METADATA[date_type] = str(o)
 
                 if p == OWL.versionIRI:
-                    self.METADATA["versionIRI"] = self._make_formatted_uri(o)
+                    self.METADATA["versionIRI"] = str(o)
 
                 if p == OWL.versionInfo:
                     self.METADATA["versionInfo"] = str(o)
@@ -177,27 +124,18 @@ class Prof(BaseProfile):
                     self.METADATA["preferredNamespaceUri"] = str(o)
 
                 if p == DCTERMS.license:
-                    self.METADATA["license"] = (
-                        self._make_formatted_uri(o)
-                        if str(o).startswith("http")
-                        else str(o)
-                    )
+                    self.METADATA["license"] = str(o)
 
                 if p == DCTERMS.rights:
-                    self.METADATA["rights"] = (
-                        str(o)
-                            .replace("Copyright", "&copy;")
-                            .replace("copyright", "&copy;")
-                            .replace("(c)", "&copy;")
-                    )
+                    self.METADATA["rights"] = str(o)
 
                 # Agents
                 if p in [DCTERMS.creator, DCTERMS.contributor, DCTERMS.publisher]:
                     agent_type = p.split("/")[-1] + "s"
                     if type(o) == Literal:
-                        self.METADATA[agent_type].add(str(o))
+                        self.METADATA[agent_type].add(o)
                     else:  # Blank Node or URI
-                        self.METADATA[agent_type].add(self._make_agent(o))
+                        self.METADATA[agent_type].add(self._extract_agent(o))
 
                 if p == PROF.isProfileOf:
                     self.METADATA["profiles"].add(str(o))
@@ -214,18 +152,18 @@ class Prof(BaseProfile):
         return self._load_template("profile." + self.outputformat).render(
             label=self.METADATA.get("label"),
             uri=self.METADATA.get("uri"),
-            version_uri=self.METADATA.get("versionIRI"),
-            publishers=sorted(self.METADATA["publishers"]),
-            creators=sorted(self.METADATA["creators"]),
-            contributors=sorted(self.METADATA["contributors"]),
+            version_uri=self._make_optional_uri(self.METADATA.get("versionIRI")),
+            publishers=self._make_agents(self.METADATA["publishers"]),
+            creators=self._make_agents(self.METADATA["creators"]),
+            contributors=self._make_agents(self.METADATA["contributors"]),
             created=self.METADATA.get("created"),
             modified=self.METADATA.get("modified"),
             issued=self.METADATA.get("issued"),
-            comment=self.METADATA.get("comment"),
+            comment=markdown.markdown(self.METADATA["comment"]) if self.METADATA.get("comment") is not None else None,
             version_info=self.METADATA.get("versionInfo"),
-            license=self.METADATA.get("license"),
-            rights=self.METADATA.get("rights"),
-            repository=self.METADATA.get("repository"),
+            license=self._make_uri_or_text(self.METADATA.get("license")),
+            rights=self._make_rights(self.METADATA.get("rights")),
+            repository=self._make_optional_uri(self.METADATA.get("repository")),
             prof_rdf=self._make_source_file_link(),
             profiles=self.METADATA["profiles"],
             resource_descriptors=self.RESOURCE_DESCRIPTORS,
@@ -237,15 +175,14 @@ class Prof(BaseProfile):
             fid=rd.get("fid"),
             label=rd.get("label"),
             comment=rd.get("comment"),
-            artifact=rd.get("artifact"),
-            roles=rd.get("roles"),
-            conforms=rd.get("conforms"),
+            artifact=self._make_optional_uri(rd.get("artifact")),
+            roles=[self._make_formatted_uri(x) for x in rd.get("roles")],
+            conforms=[self._make_formatted_uri(x) for x in rd.get("conforms")],
             format=rd.get("format"),
         )
 
     def _make_resource_descriptors(self):
-        for rdid, rd in self.RESOURCE_DESCRIPTORS.items():
-            self.RESOURCE_DESCRIPTORS[rdid]["html"] = self._make_resource_descriptor(rd)
+        return {rdid: dict(rd, html=self._make_resource_descriptor(rd)) for rdid, rd in self.RESOURCE_DESCRIPTORS.items()}
 
     def _make_document(self):
         css = None
@@ -258,17 +195,17 @@ class Prof(BaseProfile):
             label=self.METADATA["label"],
             profile=self._make_profile(),
             has_resource_descriptors=True if len(self.RESOURCE_DESCRIPTORS) > 0 else False,
-            resource_descriptors=self.RESOURCE_DESCRIPTORS,
+            resource_descriptors=self._make_resource_descriptors(),
             namespaces=self._make_namespaces(),
             css=css,
             pylode_version=__version__
         )
 
-    def generate_document(self):
-        self._expand_graph()
-        self._extract_namespaces()
-        self._get_default_namespace()
+    def _extract_model(self):
         self._extract_profile()
         self._extract_resource_descriptors()
-        self._make_resource_descriptors()
-        return self._make_document()
+
+    def generate_document(self):
+        self._prepare()
+        with self._phase("render"):
+            return self._make_document()
@@ -1,17 +1,34 @@
 from pylode import __version__
-from pylode.common import STYLE_DIR, TEMPLATES_DIR
+from pylode.common import STYLE_DIR
 import collections
 from os import path
 from rdflib import URIRef, BNode, Literal
 from rdflib.namespace import DC, DCTERMS, DOAP, OWL, PROV, RDF, RDFS, SDO, SKOS
-from itertools import chain
-import markdown
-from jinja2 import Environment, FileSystemLoader
-from os.path import join
+from pylode.expansion import AGENT_RULES, Copy, InferType, Inverse
 from pylode.profiles.base import BaseProfile
+from pylode.templating import get_template
 
 
 class VocPub(BaseProfile):
+    MODEL = BaseProfile.MODEL + ["CONCEPTS", "COLLECTIONS"]
+    EXPANSION_RULES = [
+        Copy("name", [DC.title, RDFS.label, DCTERMS.title], SKOS.prefLabel),
+        Copy("description", [DC.description, DCTERMS.description, RDFS.comment, SDO.description], SKOS.definition),
+        # OWL -> SKOS
+        # classes as Concepts types
+        InferType("concept types", [RDFS.Class, OWL.Class], SKOS.Concept),
+        # SKOS Concept Hierarchy from Class subsumption, not seeing restrictions as broader/narrower
+        Copy("broader classes", [RDFS.subClassOf], SKOS.broader, uri_objects_only=True),
+        Copy("equivalent classes", [OWL.equivalentClass], SKOS.exactMatch),
+        Inverse("equivalent classes inverse", [OWL.equivalentClass], SKOS.exactMatch),
+        # SKOS -> SKOS
+        # broader / narrower buildout
+        Inverse("narrower", [SKOS.broader], SKOS.narrower),
+        Inverse("broader", [SKOS.narrower], SKOS.broader),
+        Inverse("has top concept", [SKOS.topConceptOf], SKOS.hasTopConcept),
+        Inverse("top concept of", [SKOS.hasTopConcept], SKOS.topConceptOf),
+    ] + AGENT_RULES
+
     def __init__(
             self,
             g,
@@ -34,7 +51,7 @@ class VocPub(BaseProfile):
         self.COLLECTIONS = collections.OrderedDict()
 
     def _load_template(self, template_file):
-        return Environment(loader=FileSystemLoader(join(TEMPLATES_DIR, "vocpub"))).get_template(template_file)
+        return get_template(template_file, "vocpub")
 
     def _make_fragment_uri(self, uri):
         """VocPub Profile allows fragment URIs for Concepts & Collections"""
@@ -46,15 +63,16 @@ class VocPub(BaseProfile):
                 title = self.COLLECTIONS[uri]["default_prefLabel"]
                 uri = self.COLLECTIONS[uri]["fid"]
 
-            links = {
-                "md": f"[{title}](#{uri})",
-                "adoc": f"link:#{uri}[{title}]",
-                "html": f'<a href="#{uri}">{title}</a>'
-            }
-            return links[self.outputformat]
+            return self.renderer.fragment_link(uri, title)
         else:
             return self._make_formatted_uri_basic(uri)
 
+    def _link_target(self, uri):
+        for entities in [self.CONCEPTS, self.COLLECTIONS]:
+            if entities.get(uri):
+                return entities[uri]["default_prefLabel"], entities[uri]["fid"]
+        return None
+
     def _make_formatted_uri(self, uri, type=None):
         link = super()._make_formatted_uri(uri)
 
@@ -66,51 +84,13 @@ class VocPub(BaseProfile):
         if type not in types.keys():
             return link
 
-        suffixes = {
-            "md": f' ({type})',
-            "adoc": f' ^{type}^',
-            "html": f'<sup class="sup-{type}" title="{types[type]}">{type}</sup>'
-        }
-
-        return link + suffixes[self.outputformat]
+        return link + self.renderer.type_suffix(type, types[type])
 
     def _expand_graph(self):
-        # name
-        for s, o in chain(
-                self.G.subject_objects(DC.title),
-                self.G.subject_objects(RDFS.label),
-                self.G.subject_objects(DCTERMS.title)
-        ):
-            self.G.add((s, SKOS.prefLabel, o))
-
-        # description
-        for s, o in chain(
-                self.G.subject_objects(DC.description),
-                self.G.subject_objects(DCTERMS.description),
-                self.G.subject_objects(RDFS.comment),
-                self.G.subject_objects(SDO.description)
-        ):
-            self.G.add((s, SKOS.definition, o))
-
-        # OWL -> SKOS
-        # classes as Concepts types
-        for s in chain(
-                self.G.subjects(RDF.type, RDFS.Class),
-                self.G.subjects(RDF.type, OWL.Class)
-        ):
-            self.G.add((s, RDF.type, SKOS.Concept))
-
-        # SKOS Concept Hierarchy from Class subsumption
-        for s, o in self.G.subject_objects(RDFS.subClassOf):
-            if type(o) != BNode:  # stops restrictions being seen as broader/narrower
-                self.G.add((s, SKOS.broader, o))
-                self.G.add((o, SKOS.narrower, s))
-
-        for s, o in self.G.subject_objects(OWL.equivalentClass):
-            self.G.add((s, SKOS.exactMatch, o))
-            self.G.add((o, SKOS.exactMatch, s))
+        super()._expand_graph()
 
         # the ontology is now a ConceptScheme
+        top_concepts = []
         for s in self.G.subjects(RDF.type, OWL.Ontology):
             self.G.add((s, RDF.type, SKOS.ConceptScheme))
 
@@ -121,59 +101,19 @@ class VocPub(BaseProfile):
             #   or is only a subClassOf BNodes (restrictions)
             for s2 in self.G.subjects(RDF.type, SKOS.Concept):
                 if (s2, RDFS.subClassOf, None) not in self.G:
-                    self.G.add((s2, SKOS.topConceptOf, s))
+                    top_concepts.append((s2, SKOS.topConceptOf, s))
 
                 only_bn = True
                 for o3 in self.G.objects(s2, RDFS.subClassOf):
                     if type(o3) != BNode:
                         only_bn = False
                 if only_bn:
-                    self.G.add((s2, SKOS.topConceptOf, s))
+                    top_concepts.append((s2, SKOS.topConceptOf, s))
 
-
-        # SKOS -> SKOS
-        # broader / narrower buildout
-        for s, o in self.G.subject_objects(SKOS.broader):
-            self.G.add((o, SKOS.narrower, s))
-
-        for s, o in self.G.subject_objects(SKOS.narrower):
-            self.G.add((o, SKOS.broader, s))
-
-        for s, o in self.G.subject_objects(SKOS.topConceptOf):
-            self.G.add((o, SKOS.hasTopConcept, s))
-
-        for s, o in self.G.subject_objects(SKOS.hasTopConcept):
-            self.G.add((o, SKOS.topConceptOf, s))
-
-        # Agents
-        # creator
-        for s, o in chain(
-                self.G.subject_objects(DC.creator),
-                self.G.subject_objects(SDO.creator),
-                self.G.subject_objects(SDO.author)  # conflate SDO.author with DCTERMS.creator
-        ):
-            self.G.remove((s, DC.creator, o))
-            self.G.remove((s, SDO.creator, o))
-            self.G.remove((s, SDO.author, o))
-            self.G.add((s, DCTERMS.creator, o))
-
-        # contributor
-        for s, o in chain(
-                self.G.subject_objects(DC.contributor),
-                self.G.subject_objects(SDO.contributor)
-        ):
-            self.G.remove((s, DC.contributor, o))
-            self.G.remove((s, SDO.contributor, o))
-            self.G.add((s, DCTERMS.contributor, o))
-
-        # publisher
-        for s, o in chain(
-                self.G.subject_objects(DC.publisher),
-                self.G.subject_objects(SDO.publisher)
-        ):
-            self.G.remove((s, DC.publisher, o))
-            self.G.remove((s, SDO.publisher, o))
-            self.G.add((s, DCTERMS.publisher, o))
+        # and the ConceptScheme has them
+        self.G.addN((s, p, o, self.G) for s, p, o in top_concepts)
+        self.G.addN((o, SKOS.hasTopConcept, s, self.G) for s, p, o in top_concepts)
+        self.expansion_stats["top concepts"] = len(top_concepts)
 
     def _extract_collections(self):
         """Extracts standard SKOS Collection metadata"""
@@ -209,18 +149,10 @@ class VocPub(BaseProfile):
                     self.COLLECTIONS[c]["altLabels"].add(str(o))  # TODO: add in language
 
                 elif p == SKOS.definition:
-                    # TODO: add in language
-                    if self.outputformat == "md":
-                        self.COLLECTIONS[c]["definitions"].add(str(o))
-                    else:
-                        self.COLLECTIONS[c]["definitions"].add(markdown.markdown(str(o)))
+                    self.COLLECTIONS[c]["definitions"].add(str(o))  # TODO: add in language
 
                 elif p == SKOS.scopeNote:
-                    # TODO: add in language
-                    if self.outputformat == "md":
-                        self.COLLECTIONS[c]["scopeNotes"].add(str(o))
-                    else:
-                        self.COLLECTIONS[c]["scopeNotes"].add(markdown.markdown(str(o)))
+                    self.COLLECTIONS[c]["scopeNotes"].add(str(o))  # TODO: add in language
 
                 elif p == DCTERMS.source:
                     self.COLLECTIONS[c]["source"] = str(o)
@@ -239,17 +171,13 @@ class VocPub(BaseProfile):
             self.COLLECTIONS[c]["scopeNotes"] = list(self.COLLECTIONS[c]["scopeNotes"])
             self.COLLECTIONS[c]["members"] = list(self.COLLECTIONS[c]["members"])
 
-            # make fid
-            # TODO: update to use default language label, not [0]
-            try:
-                pl = self.COLLECTIONS[c]["prefLabels"][0][0]
-
-                self.COLLECTIONS[c]["fid"] = self._make_fid(
-                    pl, c
-                )
-            except Exception as e:
-                print(e)
+        # make fids
+        # TODO: update to use default language label, not [0]
+        for c, v in self.COLLECTIONS.items():
+            if len(v["prefLabels"]) == 0:
                 raise Exception("You Collection {}  doesn't have a label but it needs one!".format(c))
+        for c, fid in self._make_fids((v["prefLabels"][0][0], k) for k, v in self.COLLECTIONS.items()).items():
+            self.COLLECTIONS[c]["fid"] = fid
 
     def _extract_concepts(self):
         """Extracts standard SKOS Concepts and their metadata
@@ -295,18 +223,10 @@ class VocPub(BaseProfile):
                     self.CONCEPTS[c]["altLabels"].add(str(o))  # TODO: add in language
 
                 elif p == SKOS.definition:
-                    # TODO: add in language
-                    if self.outputformat == "md":
-                        self.CONCEPTS[c]["definitions"].add(str(o))
-                    else:
-                        self.CONCEPTS[c]["definitions"].add(markdown.markdown(str(o)))
+                    self.CONCEPTS[c]["definitions"].add(str(o))  # TODO: add in language
 
                 elif p == SKOS.scopeNote:
-                    # TODO: add in language
-                    if self.outputformat == "md":
-                        self.CONCEPTS[c]["scopeNotes"].add(str(o))
-                    else:
-                        self.CONCEPTS[c]["scopeNotes"].add(markdown.markdown(str(o)))
+                    self.CONCEPTS[c]["scopeNotes"].add(str(o))  # TODO: add in language
 
                 elif p == SKOS.example:
                     self.CONCEPTS[c]["examples"].add(str(o))  # TODO: add in language
@@ -359,11 +279,9 @@ class VocPub(BaseProfile):
             self.CONCEPTS[c]["broadMatches"] = list(self.CONCEPTS[c]["broadMatches"])
             self.CONCEPTS[c]["narrowMatches"] = list(self.CONCEPTS[c]["narrowMatches"])
 
-            # make fid
-            # TODO: update to use default language label, not [0]
-            self.CONCEPTS[c]["fid"] = self._make_fid(
-                self.CONCEPTS[c]["default_prefLabel"], c
-            )
+        # make fids
+        for c, fid in self._make_fids((v["default_prefLabel"], k) for k, v in self.CONCEPTS.items()).items():
+            self.CONCEPTS[c]["fid"] = fid
 
     def _extract_concept_scheme(self):
         """Extracts standard SKOS ConceptScheme metadata
@@ -374,6 +292,7 @@ class VocPub(BaseProfile):
         self.METADATA["creators"] = set()
         self.METADATA["contributors"] = set()
         self.METADATA["publishers"] = set()
+        self.METADATA["topConcepts"] = [str(o) for o in self.G.objects(predicate=SKOS.hasTopConcept)]
         for s in self.G.subjects(predicate=RDF.type, object=SKOS.ConceptScheme):
             self.METADATA["uri"] = str(s)
             for p, o in self.G.predicate_objects(subject=s):
@@ -381,16 +300,10 @@ class VocPub(BaseProfile):
                     self.METADATA["title"] = str(o)
 
                 if p == SKOS.definition:
-                    if self.outputformat == "md":
-                        self.METADATA["description"] = str(o)
-                    else:
-                        self.METADATA["description"] = markdown.markdown(str(o))
+                    self.METADATA["description"] = str(o)
 
                 if p == SKOS.historyNote:
-                    if self.outputformat == "md":
-                        self.METADATA["historyNote"] = str(o)
-                    else:
-                        self.METADATA["historyNote"] = markdown.markdown(str(o))
+                    self.METADATA["historyNote"] = str(o)
 
                 # dates
                 if p in [DCTERMS.created, DCTERMS.modified, DCTERMS.issued]:
@@ -398,13 +311,10 @@ class VocPub(BaseProfile):
                     self.METADATA[date_type] = str(o)
 
                 if p == DCTERMS.source:
-                    if str(o).startswith('http'):
-                        self.METADATA["source"] = self._make_formatted_uri(o)  # '<a href="{0}">{0}</a>'.format(str(o))
-                    else:
-                        self.METADATA["source"] = str(o)
+                    self.METADATA["source"] = str(o)
 
                 if p == OWL.versionIRI:
-                    self.METADATA["versionIRI"] = self._make_formatted_uri(o)
+                    self.METADATA["versionIRI"] = str(o)
 
                 if p == OWL.versionInfo:
                     self.METADATA["versionInfo"] = str(o)
@@ -416,36 +326,27 @@ class VocPub(BaseProfile):
                     self.METADATA["preferredNamespaceUri"] = str(o)
 
                 if p == DCTERMS.license:
-                    self.METADATA["license"] = (
-                        self._make_formatted_uri(o)
-                        if str(o).startswith("http")
-                        else str(o)
-                    )
+                    self.METADATA["license"] = str(o)
 
                 if p == DCTERMS.rights:
-                    self.METADATA["rights"] = (
-                        str(o)
-                            .replace("Copyright", "&copy;")
-                            .replace("copyright", "&copy;")
-                            .replace("(c)", "&copy;")
-                    )
+                    self.METADATA["rights"] = str(o)
 
                 # Agents
                 if p in [DCTERMS.creator, DCTERMS.contributor, DCTERMS.publisher]:
                     agent_type = p.split("/")[-1] + "s"
                     if type(o) == Literal:
-                        self.METADATA[agent_type].add(str(o))
+                        self.METADATA[agent_type].add(o)
                     else:  # Blank Node or URI
-                        self.METADATA[agent_type].add(self._make_agent(o))
+                        self.METADATA[agent_type].add(self._extract_agent(o))
 
                 # TODO: cater for other Agent representations
 
                 if p == PROV.wasGeneratedBy:
                     for o2 in self.G.objects(subject=o, predicate=DOAP.repository):
-                        self.METADATA["repository"] = self._make_formatted_uri(o2)
+                        self.METADATA["repository"] = str(o2)
 
                 if p == SDO.codeRepository:
-                    self.METADATA["repository"] = self._make_formatted_uri(o)
+                    self.METADATA["repository"] = str(o)
 
         if self.METADATA.get("title") is None:
             raise ValueError(
@@ -463,20 +364,20 @@ class VocPub(BaseProfile):
         return self._load_template("concept_scheme." + self.outputformat).render(
             title=self.METADATA.get("title"),
             uri=self.METADATA.get("uri"),
-            version_uri=self.METADATA.get("versionIRI"),
-            publishers=sorted(self.METADATA["publishers"]),
-            creators=sorted(self.METADATA["creators"]),
-            contributors=sorted(self.METADATA["contributors"]),
+            version_uri=self._make_optional_uri(self.METADATA.get("versionIRI")),
+            publishers=self._make_agents(self.METADATA["publishers"]),
+            creators=self._make_agents(self.METADATA["creators"]),
+            contributors=self._make_agents(self.METADATA["contributors"]),
             created=self.METADATA.get("created"),
             modified=self.METADATA.get("modified"),
             issued=self.METADATA.get("issued"),
-            source=self.METADATA.get("source"),
-            description=self.METADATA.get("description"),
-            historyNote=self.METADATA.get("historyNote"),
+            source=self._make_uri_or_text(self.METADATA.get("source")),
+            description=self._make_text(self.METADATA.get("description")),
+            historyNote=self._make_text(self.METADATA.get("historyNote")),
             version_info=self.METADATA.get("versionInfo"),
-            license=self.METADATA.get("license"),
-            rights=self.METADATA.get("rights"),
-            repository=self.METADATA.get("repository"),
+            license=self._make_uri_or_text(self.METADATA.get("license")),
+            rights=self._make_rights(self.METADATA.get("rights")),
+            repository=self._make_optional_uri(self.METADATA.get("repository")),
             ont_rdf=self._make_source_file_link(),
             has_collections=True if len(self.COLLECTIONS) > 0 else False,
             has_concepts=True if len(self.CONCEPTS) > 0 else False,
@@ -489,8 +390,8 @@ class VocPub(BaseProfile):
             default_prefLabel=collection[1].get("default_prefLabel"),
             prefLabels=collection[1].get("prefLabels"),
             altLabels=collection[1].get("altLabels"),
-            definitions=collection[1].get("definitions"),
-            scopeNotes=collection[1].get("scopeNotes"),
+            definitions=[self._make_text(x) for x in collection[1].get("definitions")],
+            scopeNotes=[self._make_text(x) for x in collection[1].get("scopeNotes")],
             source=collection[1].get("source"),
             members=[self._make_formatted_uri(x, type="con") for x in collection[1].get("members")],
         )
@@ -529,12 +430,8 @@ class VocPub(BaseProfile):
                 return html
 
         # start with a topConcept
-        tcs = []
-        for s, o in self.G.subject_objects(predicate=SKOS.hasTopConcept):
-            tcs.append(str(o))
-
         txt = ""
-        for tc in sorted(tcs):
+        for tc in sorted(self.METADATA["topConcepts"]):
             txt += _render(tc, self.CONCEPTS.get(tc).get("narrowers"), self.outputformat, 0)
 
         if self.outputformat == "md":
@@ -561,7 +458,7 @@ class VocPub(BaseProfile):
             else:
                 egs = []
         else:
-            defs = concept[1].get("definitions")
+            defs = [self._make_text(d) for d in concept[1].get("definitions")]
             if len(concept[1].get("examples")) > 1:
                 egs = [x.replace("<", "&lt;").replace(">", "&gt;") for x in concept[1].get("examples")]
             else:
@@ -574,7 +471,7 @@ class VocPub(BaseProfile):
             prefLabels=concept[1].get("prefLabels"),
             altLabels=concept[1].get("altLabels"),
             definitions=defs,
-            scopeNotes=concept[1].get("scopeNotes"),
+            scopeNotes=[self._make_text(x) for x in concept[1].get("scopeNotes")],
             examples=egs,
             source=concept[1].get("source"),
             broaders=[self._make_formatted_uri(x, type="con") for x in concept[1].get("broaders")],
@@ -595,7 +492,7 @@ class VocPub(BaseProfile):
                 (
                     v["default_prefLabel"],
                     v["fid"],
-                    self._make_skos_concept((k, v)),
+                    self._make_fragment(k, v, self._make_skos_concept, (k, v)),
                 )
             )
 
@@ -623,17 +520,15 @@ class VocPub(BaseProfile):
             pylode_version=__version__
         )
 
-    def generate_document(self):
-        # expand the graph using pre-defined rules to make querying easier (poor man's inference)
-        self._expand_graph()
-        # get all the namespaces using several methods
-        self._extract_namespaces()
-        # get the default namespace
-        self._get_default_namespace()
+    def _extract_model(self):
         # extract all the SKOS things
         self._extract_collections()
         self._extract_concepts()
-        self._make_concept_hierarchy()
         self._extract_concept_scheme()
 
-        return self._make_document()
+    def generate_document(self):
+        # expand the graph & extract the model, unless already done for another output format
+        self._prepare()
+
+        with self._phase("render"):
+            return self._make_document()
@@ -0,0 +1,158 @@
+import markdown
+
+
+class Renderer:
+    """Turns the format-neutral parts of a profile's model - raw URIs, literals & text - into markup for one output
+    format. Profiles pass the marked-up values to their Jinja2 templates for that format.
+    """
+    outputformat = None
+
+    def link(self, uri, text):
+        """Abstract method: a hyperlink to uri, displaying text"""
+
+    def fragment_link(self, fid, text):
+        """A hyperlink to a fragment, e.g. a Class, within the document"""
+        return self.link("#" + fid, text)
+
+    def type_suffix(self, type, type_label):
+        """Abstract method: the superscript indicating what type of thing a link is to, e.g. "c" for a Class"""
+
+    def text(self, text):
+        """Multi-line text that may contain Markdown, e.g. a description"""
+        return text
+
+    def table_text(self, text):
+        """Multi-line text to be placed in a single table cell"""
+        return text
+
+    def code(self, text):
+        """Abstract method: preformatted text, e.g. an RDF example"""
+
+    def image(self, uri):
+        """Abstract method: an image, e.g. a diagram, from uri"""
+
+    def example_link(self, uri):
+        """Abstract method: a hyperlink given as an example"""
+
+    def embedded_html(self, html):
+        return html
+
+    def embedded_markdown(self, md):
+        return md
+
+    def conforms_to(self, content, uri):
+        """Abstract method: content followed by a note that it conforms to uri, e.g. a profile"""
+
+    def keyword(self, keyword):
+        """An OWL keyword, e.g. "some" in a Restriction"""
+        return "**{}**".format(keyword)
+
+    def source_file_link(self, uri_of_rdf, rdf_format):
+        """Abstract method: a hyperlink to the RDF source file documented, in rdf_format"""
+
+
+class HtmlRenderer(Renderer):
+    outputformat = "html"
+
+    def link(self, uri, text):
+        return f'<a href="{uri}">{text}</a>'
+
+    def type_suffix(self, type, type_label):
+        return f'<sup class="sup-{type}" title="{type_label}">{type}</sup>'
+
+    def text(self, text):
+        return markdown.markdown(text)
+
+    def code(self, text):
+        escaped_var = text.replace("<", "&lt;").replace(">", "&gt;")
+        return f"<pre>{escaped_var}</pre>"
+
+    def image(self, uri):
+        return f"<img src=\"{uri}\" />"
+
+    def example_link(self, uri):
+        return f"<a href=\"{uri}\">{uri}</a>"
+
+    def embedded_markdown(self, md):
+        return markdown.markdown(md)
+
+    def conforms_to(self, content, uri):
+        return f"<div style=\"border:solid 1px lightgrey; padding:5px;\">{content}<br />Conforms to: " \
+               f"<a href=\"{uri}\">{uri}</a></div>"
+
+    def keyword(self, keyword):
+        return '<span class="cardinality">{}</span>'.format(keyword)
+
+    def source_file_link(self, uri_of_rdf, rdf_format):
+        return '<a href="{}">RDF ({})</a>'.format(uri_of_rdf, rdf_format)
+
+
+class MarkdownRenderer(Renderer):
+    outputformat = "md"
+
+    def link(self, uri, text):
+        return f"[{text}]({uri})"
+
+    def type_suffix(self, type, type_label):
+        return f' ({type})'
+
+    def table_text(self, text):
+        # Markdown tables can't contain line breaks
+        return text.replace("\n", " ") if text is not None else None
+
+    def code(self, text):
+        escaped_var = text.rstrip().replace("\t", "    ").split("\n")
+        eg2 = ""
+        for line in escaped_var:
+            eg2 += f"`{line}` <br /> "
+        return eg2
+
+    def image(self, uri):
+        return f"![]({uri}) "
+
+    def example_link(self, uri):
+        return f"[{uri}]({uri}) "
+
+    def conforms_to(self, content, uri):
+        return f"{content}\n\nConforms to: [{uri}]({uri})"
+
+    def source_file_link(self, uri_of_rdf, rdf_format):
+        return 'RDF ([{}]({}))'.format(uri_of_rdf, rdf_format)
+
+
+class AsciiDocRenderer(Renderer):
+    outputformat = "adoc"
+
+    def link(self, uri, text):
+        return f"link:{uri}[{text}]"
+
+    def type_suffix(self, type, type_label):
+        return f' ^{type}^'
+
+    def code(self, text):
+        return f"....\n{text}\n....\n\n"
+
+    def image(self, uri):
+        return f"image::{uri}[]"
+
+    def example_link(self, uri):
+        return f"{uri} "
+
+    def embedded_html(self, html):
+        return f"+++{html}+++\n&nbsp;"
+
+    def embedded_markdown(self, md):
+        return f"+++{markdown.markdown(md)}+++\n&nbsp;"
+
+    def conforms_to(self, content, uri):
+        return f"{content}\n\nConforms to: link:{uri}[{uri}]"
+
+    def source_file_link(self, uri_of_rdf, rdf_format):
+        return 'RDF link:{}[{}]'.format(uri_of_rdf, rdf_format)
+
+
+RENDERERS = {
+    "html": HtmlRenderer(),
+    "md": MarkdownRenderer(),
+    "adoc": AsciiDocRenderer(),
+}
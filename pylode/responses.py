@@ -0,0 +1,89 @@
+import collections
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from pylode.cache import DocumentCache, DEFAULT_MAX_SIZE
+
+
+def make_entry(body, upstream_etag=None, upstream_last_modified=None):
+    """Makes a cache entry for a response body, with its own ETag & Last-Modified values and those of the RDF it
+    documents, for revalidating it upstream"""
+    return {
+        "body": body,
+        "etag": '"{}"'.format(hashlib.sha256(body.encode()).hexdigest()[:32]),
+        "last_modified": formatdate(usegmt=True),
+        "checked": time.time(),  # when the RDF was last fetched or revalidated
+        "upstream_etag": upstream_etag,
+        "upstream_last_modified": upstream_last_modified,
+    }
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches an ETag. Weak comparison is used, as for GET"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def strip_weak(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return strip_weak(etag) in [strip_weak(t) for t in if_none_match.split(",")]
+
+
+def not_modified_since(if_modified_since, last_modified):
+    """Whether an If-Modified-Since header value is no earlier than a Last-Modified value"""
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):  # unparsable date
+        return False
+
+
+class ResponseCache:
+    """An LRU cache of server responses, from make_entry(), in memory and optionally on disk as well
+
+    The disk tier, a DocumentCache, outlives server restarts and may be shared by several server processes.
+    """
+    def __init__(self, max_entries=256, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+        self.max_entries = max_entries
+        self.disk = DocumentCache(cache_dir, max_size) if cache_dir is not None else None
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url, profile, outputformat):
+        return hashlib.sha256("\n".join([url, profile, outputformat]).encode()).hexdigest()
+
+    def _put_memory(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.disk is not None:
+            stored = self.disk.get(key)
+            if stored is not None:
+                entry = json.loads(stored)
+                self._put_memory(key, entry)
+                return entry
+
+        return None
+
+    def put(self, key, entry):
+        self._put_memory(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, json.dumps(entry))
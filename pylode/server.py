@@ -1,7 +1,33 @@
 from bs4 import BeautifulSoup as Soup
+from concurrent.futures import TimeoutError
 import falcon
 import os
-import subprocess
+import requests
+import time
+from pylode.profiles import PROFILES
+from pylode.responses import ResponseCache, make_entry, etag_matches, not_modified_since
+from pylode.workers import DocumentPool, PoolSaturated, document_uri
+
+
+def _env_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value is not None else default
+
+
+# documents are made in-process by a bounded pool of workers, see DocumentPool, configured by these env vars
+POOL = DocumentPool(
+    workers=_env_int("PYLODE_WORKERS"),  # default: the number of CPUs
+    queue_size=_env_int("PYLODE_QUEUE_SIZE"),  # default: 2 x workers
+    timeout=_env_int("PYLODE_TIMEOUT", 60),  # seconds
+)
+
+# responses are cached in memory, and on disk if PYLODE_CACHE_DIR is set. For MAX_AGE seconds, a cached response is
+# served as is. After that, the RDF is revalidated upstream with a conditional GET & only documented again if changed
+MAX_AGE = _env_int("PYLODE_MAX_AGE", 300)  # seconds
+RESPONSES = ResponseCache(
+    max_entries=_env_int("PYLODE_CACHE_ENTRIES", 256),
+    cache_dir=os.getenv("PYLODE_CACHE_DIR"),
+)
 
 
 class InfoResource:
@@ -20,37 +46,105 @@ class InfoResource:
         resp.status = falcon.HTTP_200
 
 
+MEDIA_TYPES = {
+    "html": "text/html",
+    "md": "text/markdown",
+    "adoc": "text/asciidoc",
+}
+
+
 class DocResource:
+    def _post_process(self, raw_html):
+        # remove Overview image placeholder, if present
+        processed_html = raw_html.replace(
+            '<section id="overview">', '<section id="overview" style="display:none;">')
+        soup = Soup(processed_html, features="html.parser")
+        if os.getenv('GTAGID') is not None:
+            tag = os.getenv('GTAGID')
+            title = soup.find('title')
+            async_tag = soup.new_tag("script")
+            async_tag['async src'] = "https://www.googletagmanager.com/gtag/js?id=%s" % tag
+            title.insert_after(async_tag)
+            gtag = soup.new_tag('script')
+            gtag.string = """window.dataLayer = window.dataLayer || [];\n
+                  function gtag(){dataLayer.push(arguments);}\n
+                  gtag('js', new Date());\n
+                  gtag('config', '%s');\n""" % tag
+            async_tag.insert_after(gtag)
+        return str(soup)
+
+    def _get_entry(self, url, profile, outputformat):
+        """Gets a response from the cache. The RDF is only fetched & documented if it's not cached or, if the
+        cached response is older than MAX_AGE, the RDF has changed since"""
+        key = ResponseCache.make_key(url, profile, outputformat)
+        entry = RESPONSES.get(key)
+        if entry is not None and time.time() - entry["checked"] < MAX_AGE:
+            return entry
+
+        try:
+            result = POOL.run(
+                document_uri,
+                url,
+                profile=profile,
+                outputformat=outputformat,
+                include_css=True,
+                etag=entry["upstream_etag"] if entry is not None else None,
+                last_modified=entry["upstream_last_modified"] if entry is not None else None,
+            )
+        except PoolSaturated:
+            raise falcon.HTTPServiceUnavailable(
+                "Server busy",
+                "All pyLODE workers are busy and the request queue is full. Please try again shortly.",
+                retry_after=5,
+            )
+        except TimeoutError:
+            raise falcon.HTTPGatewayTimeout(
+                "Timeout",
+                "Documenting {} took longer than {} seconds".format(url, POOL.timeout),
+            )
+        except requests.RequestException as e:
+            if entry is not None:
+                return entry  # serve the stale response rather than none
+            raise falcon.HTTPBadGateway("Could not get RDF", "Could not get RDF from {}: {}".format(url, e))
+
+        if result is None:  # the RDF hasn't changed
+            entry = dict(entry, checked=time.time())
+        else:
+            doc, upstream_etag, upstream_last_modified = result
+            if outputformat == "html":
+                doc = self._post_process(doc)
+            entry = make_entry(doc, upstream_etag, upstream_last_modified)
+        RESPONSES.put(key, entry)
+
+        return entry
+
     def on_get(self, req, resp):
         """Handles GET requests"""
         url = req.get_param("url")
-        if url is not None:
-            cmd = "cd ./bin && ./pylode.sh -u {url} -c true".format(url=url)
-
-            # remove Overview image placeholder, if present
-            raw_html = subprocess.check_output(cmd, shell=True)
-            processed_html = raw_html.decode().replace(
-                '<section id="overview">', '<section id="overview" style="display:none;">')
-            soup = Soup(processed_html, features="html.parser")
-            if os.getenv('GTAGID') is not None:
-                tag = os.getenv('GTAGID')
-                title = soup.find('title')
-                async_tag = soup.new_tag("script")
-                async_tag['async src'] = "https://www.googletagmanager.com/gtag/js?id=%s" % tag
-                title.insert_after(async_tag)
-                gtag = soup.new_tag('script')
-                gtag.string = """window.dataLayer = window.dataLayer || [];\n
-                      function gtag(){dataLayer.push(arguments);}\n
-                      gtag('js', new Date());\n
-                      gtag('config', '%s');\n""" % tag
-                async_tag.insert_after(gtag)
-            resp.body = soup
+        profile = req.get_param("profile", default="ontdoc")
+        outputformat = req.get_param("format", default="html")
+        if url is not None and profile in PROFILES.keys() and outputformat in MEDIA_TYPES.keys():
+            entry = self._get_entry(url, profile, outputformat)
 
             resp.set_header("Powered-By", "Falcon")
-            resp.set_header("content-type", "text/html")
+            resp.set_header("ETag", entry["etag"])
+            resp.set_header("Last-Modified", entry["last_modified"])
+            resp.set_header("Cache-Control", "public, max-age={}".format(MAX_AGE))
+            if_none_match = req.get_header("If-None-Match")
+            if etag_matches(if_none_match, entry["etag"]) or \
+                    (if_none_match is None and
+                     not_modified_since(req.get_header("If-Modified-Since"), entry["last_modified"])):
+                resp.status = falcon.HTTP_304
+                return
+
+            resp.body = entry["body"]
+            resp.set_header("content-type", MEDIA_TYPES[outputformat])
             resp.status = falcon.HTTP_200
         else:
-            resp.body = "<h3>USER ERROR</h3><p>For this endpoint, you must supply a Query String Argument of <code>url</code>, e.g. <code>/pylode?url={URL_OF_AN_RDF_FILE}</code>.</p>"
+            resp.body = "<h3>USER ERROR</h3><p>For this endpoint, you must supply a Query String Argument of " \
+                        "<code>url</code>, e.g. <code>/pylode?url={URL_OF_AN_RDF_FILE}</code>, and optionally " \
+                        "<code>profile</code> (one of {}) and <code>format</code> (one of {}).</p>".format(
+                            ", ".join(PROFILES.keys()), ", ".join(MEDIA_TYPES.keys()))
             resp.set_header("content-type", "text/html")
             resp.status = falcon.HTTP_400
 
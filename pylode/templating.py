@@ -0,0 +1,156 @@
+import threading
+from os import path
+from jinja2 import ChoiceLoader, Environment, FileSystemLoader, FileSystemBytecodeCache, ModuleLoader, TemplateNotFound
+
+from pylode.common import APP_DIR, TEMPLATES_DIR
+
+# templates compiled to Python modules by precompile_templates(), shipped within the wheel if present
+PRECOMPILED_TEMPLATES_DIR = path.join(APP_DIR, "templates_compiled")
+# the precompiled sub-directory name used for templates at the root of TEMPLATES_DIR
+ROOT_TEMPLATES_KEY = "_root"
+
+
+class _CountingEnvironment(Environment):
+    """A Jinja2 Environment that records how many times it has compiled template source"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compile_count = 0
+
+    def compile(self, source, name=None, filename=None, raw=False, defer_init=False):
+        self.compile_count += 1
+        return super().compile(source, name=name, filename=filename, raw=raw, defer_init=defer_init)
+
+
+class _FreshModuleLoader(ModuleLoader):
+    """A ModuleLoader that only loads precompiled templates at least as new as their source, so an edited template
+    isn't shadowed by its stale module. Others are TemplateNotFound, for a ChoiceLoader to load from source instead"""
+    def __init__(self, precompiled_dir, templates_dir):
+        super().__init__(precompiled_dir)
+        self.precompiled_dir = precompiled_dir
+        self.templates_dir = templates_dir
+
+    def load(self, environment, name, globals=None):
+        module_file = path.join(self.precompiled_dir, self.get_module_filename(name))
+        source_file = path.join(self.templates_dir, *name.split("/"))
+        try:
+            if path.getmtime(module_file) < path.getmtime(source_file):
+                raise TemplateNotFound(name)
+        except OSError:
+            raise TemplateNotFound(name)
+        return super().load(environment, name, globals)
+
+
+class TemplateRegistry:
+    """A process-wide registry of Jinja2 Environments, one per profile template directory
+
+    Each Environment caches the Templates it has compiled so any template is compiled at most once per process,
+    regardless of how many entities are rendered with it. Compiled bytecode is also cached on disk so new processes
+    don't need to recompile either. If precompiled templates are present (see precompile_templates()), they are
+    loaded directly instead of being compiled from source, unless their source is newer.
+    """
+    def __init__(self, templates_dir=TEMPLATES_DIR, precompiled_dir=PRECOMPILED_TEMPLATES_DIR, use_bytecode_cache=True):
+        self.templates_dir = templates_dir
+        self.precompiled_dir = precompiled_dir
+        self.use_bytecode_cache = use_bytecode_cache
+        self._environments = {}
+        self._lock = threading.Lock()
+        self._bytecode_cache = None
+        self.template_requests = 0
+
+    def _get_bytecode_cache(self):
+        if self._bytecode_cache is None and self.use_bytecode_cache:
+            try:
+                self._bytecode_cache = FileSystemBytecodeCache(pattern="__pylode_jinja2_%s.cache")
+            except (OSError, RuntimeError):
+                # no writable temp dir so just rely on the in-memory template caches
+                self.use_bytecode_cache = False
+        return self._bytecode_cache
+
+    def _make_environment(self, subdir):
+        key = subdir if subdir is not None else ROOT_TEMPLATES_KEY
+        templates_dir = path.join(self.templates_dir, subdir) if subdir is not None else self.templates_dir
+        loader = FileSystemLoader(templates_dir)
+        precompiled = path.join(self.precompiled_dir, key) if self.precompiled_dir is not None else None
+        if precompiled is not None and path.isdir(precompiled):
+            # templates not precompiled, or edited since, are compiled from source
+            loader = ChoiceLoader([_FreshModuleLoader(precompiled, templates_dir), loader])
+
+        # templates are package data, so there's no need to check them for changes on every get_template() call
+        return _CountingEnvironment(loader=loader, bytecode_cache=self._get_bytecode_cache(), auto_reload=False)
+
+    def get_environment(self, subdir=None):
+        """Returns the shared Environment for TEMPLATES_DIR or one of its profile sub-directories, e.g. "ontdoc\""""
+        env = self._environments.get(subdir)
+        if env is None:
+            with self._lock:
+                env = self._environments.get(subdir)
+                if env is None:
+                    env = self._make_environment(subdir)
+                    self._environments[subdir] = env
+        return env
+
+    def get_template(self, template_file, subdir=None):
+        self.template_requests += 1
+        return self.get_environment(subdir).get_template(template_file)
+
+    @property
+    def compile_count(self):
+        """The total number of template compilations performed by all of this registry's Environments"""
+        return sum(env.compile_count for env in list(self._environments.values()))
+
+    def stats(self):
+        return {
+            "environments": len(self._environments),
+            "compiles": self.compile_count,
+            "template_requests": self.template_requests,
+        }
+
+    def clear(self):
+        """Drops all Environments, and thus all compiled templates, e.g. after templates have been edited"""
+        with self._lock:
+            self._environments = {}
+            self.template_requests = 0
+
+    def precompile_templates(self, target=None):
+        """Compiles all templates to Python modules in target (default PRECOMPILED_TEMPLATES_DIR), one directory
+        per profile, for loading without any compilation at all"""
+        import os
+
+        target = target if target is not None else self.precompiled_dir
+        subdirs = [None] + sorted(
+            d for d in os.listdir(self.templates_dir) if path.isdir(path.join(self.templates_dir, d))
+        )
+        for subdir in subdirs:
+            templates_dir = path.join(self.templates_dir, subdir) if subdir is not None else self.templates_dir
+            env = Environment(loader=FileSystemLoader(templates_dir))
+            env.compile_templates(
+                path.join(target, subdir if subdir is not None else ROOT_TEMPLATES_KEY),
+                filter_func=lambda name: "/" not in name,
+                zip=None,
+                ignore_errors=False
+            )
+
+
+class Deferred:
+    """A template value that is only rendered, by calling fn(*args), when the template outputs it
+
+    Lists of Deferred fragments, e.g. one per Class, let a streamed template write each fragment as it is made rather
+    than all of them being held in memory first.
+    """
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+
+    def __str__(self):
+        return self.fn(*self.args)
+
+
+TEMPLATES = TemplateRegistry()
+
+
+def get_template(template_file, subdir=None):
+    return TEMPLATES.get_template(template_file, subdir)
+
+
+if __name__ == "__main__":
+    TEMPLATES.precompile_templates()
@@ -0,0 +1,99 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from rdflib import Graph
+
+from pylode.common import MakeDocco, get_rdf
+
+
+class PoolSaturated(Exception):
+    """Raised when a DocumentPool's workers are all busy and its queue is full"""
+    pass
+
+
+def document_uri(url, profile="ontdoc", outputformat="html", include_css=True, etag=None, last_modified=None):
+    """Documents the RDF at url. Runs in a DocumentPool worker
+
+    If the ETag and/or Last-Modified header values of the RDF last documented are given, it's only fetched, and
+    documented, again if it has changed.
+
+    :return: The document & the RDF's ETag & Last-Modified header values, or None if the RDF hasn't changed
+    :rtype: tuple
+    """
+    rdf = get_rdf(url, etag=etag, last_modified=last_modified)
+    if rdf is None:
+        return None
+    data, fmt, etag, last_modified = rdf
+
+    m = MakeDocco(
+        data=Graph().parse(data=data, format=fmt),
+        profile=profile,
+        outputformat=outputformat,
+        include_css=include_css
+    )
+    m.source_info = (url, fmt)  # as if parsed from input_uri
+    return m.document(), etag, last_modified
+
+
+class DocumentPool:
+    """A bounded pool of workers for making documents in-process, e.g. for the server
+
+    At most workers documents are made at once and at most queue_size more wait for a worker. Beyond that, submit()
+    raises PoolSaturated rather than queueing without limit, so callers can shed load.
+
+    Worker processes are used by default, since documenting is CPU-bound, and started on first use, e.g. after a
+    gunicorn fork. A document that times out in run() keeps its worker, and its place in the pool, until it finishes:
+    a process can't be safely interrupted part way through a task.
+    """
+    def __init__(self, workers=None, queue_size=None, timeout=60, processes=True):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.queue_size = queue_size if queue_size is not None else self.workers * 2
+        self.timeout = timeout
+        self.processes = processes
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.processes:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Submits fn(*args, **kwargs) to a worker, returning a Future, or raises PoolSaturated"""
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated()
+
+        try:
+            try:
+                future = self._get_executor().submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                # a worker process died, e.g. killed for using too much memory: start a new pool
+                with self._lock:
+                    self._executor = None
+                future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda f: self._slots.release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) in a worker and returns its result
+
+        Raises PoolSaturated if the pool is full and concurrent.futures.TimeoutError if the result takes longer
+        than timeout seconds."""
+        return self.submit(fn, *args, **kwargs).result(timeout=self.timeout)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -25,7 +25,8 @@ setup(
     packages=find_packages(),
     package_dir={'pylode': 'pylode', 'img': 'img'},
     package_data={
-        'pylode': ['templates/*.html', 'templates/*/*.html', 'templates/*.md', 'templates/*/*.md', 'style/*.css'],
+        'pylode': ['templates/*.html', 'templates/*/*.html', 'templates/*.md', 'templates/*/*.md', 'style/*.css',
+                   'templates_compiled/*/*.py'],
         'img': ['pyLODE-250.png']
     },
     version=__version__,
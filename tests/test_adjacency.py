@@ -0,0 +1,28 @@
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import DCTERMS, OWL, RDF, RDFS
+from pylode.adjacency import AdjacencyIndex
+
+EX = "http://example.org/"
+a, b, c = URIRef(EX + "a"), URIRef(EX + "b"), URIRef(EX + "c")
+
+
+def test_adjacency_index():
+    g = Graph()
+    g.add((a, DCTERMS.title, Literal("A")))
+    g.add((a, RDF.type, OWL.Class))
+    g.add((a, RDFS.subClassOf, b))
+    g.add((a, DCTERMS.title, Literal("Another A")))
+    g.add((c, RDFS.subClassOf, b))
+    g.add((c, RDFS.domain, a))
+
+    idx = AdjacencyIndex(g, [RDFS.subClassOf, RDF.type])
+
+    # outgoing edges are as, & in the order, the graph gives them
+    assert idx.predicate_objects(a) == list(g.predicate_objects(a))
+    assert idx.objects(a, DCTERMS.title) == list(g.objects(a, DCTERMS.title))
+    assert idx.objects(b, DCTERMS.title) == []
+
+    # incoming edges for the predicates indexed
+    assert idx.subjects(RDFS.subClassOf, b) == list(g.subjects(RDFS.subClassOf, b))
+    assert idx.subjects(RDF.type, OWL.Class) == [a]
+    assert idx.subjects(RDFS.subClassOf, a) == []
@@ -1,4 +1,9 @@
+import pytest
+from rdflib import Graph, Literal, URIRef, RDFS
+from rdflib.graph import ModificationException
 from pylode.common import MakeDocco
+from pylode.graph import has_other_languages, language_view
+from pylode.profiles import OntDoc
 from pylode.profiles.base import BaseProfile
 
 o1 = """
@@ -44,5 +49,136 @@ def test_ontdoc_extract_namespaces():
     assert len(bp.NAMESPACES.keys()) == 10
 
 
+def test_extract_namespaces_exclusions():
+    g = Graph().parse(data="""
+        @prefix owl: <http://www.w3.org/2002/07/owl#> .
+        @prefix sdo: <https://schema.org/> .
+
+        <http://example-ontology.org/thing>
+            <http://purl.org/ontology/bibo/p> <http://www.w3.org/2006/vcard/ns#x> , <http://www.w3.org/2006/vcard/ns#y> ;
+            owl:versionIRI <http://purl.org/vocab/frbr/core#v1> ;
+            owl:imports <http://rdfs.org/sioc/ns#ont> ;
+            sdo:email <http://www.w3.org/ns/adms#me@example.org> .
+
+        <http://purl.org/goodrelations/v1#person> sdo:creator <https://orcid.org/0000-0000-0000-0000> .
+        """, format="turtle")
+    bp = BaseProfile(g, None)
+    bp._extract_namespaces()
+
+    # namespaces of the distinct URIs are found, except those of owl:versionIRI, owl:imports & sdo:identifier objects,
+    # ones with an '@', e.g. emails, and of any term in a triple with an ORCID object
+    assert {"bibo", "vcard", "owl"} <= set(bp.NAMESPACES.keys())
+    assert not {"frbr", "sioc", "adms", "gr"} & set(bp.NAMESPACES.keys())
+
+
+o2 = """
+    @prefix dcterms: <http://purl.org/dc/terms/> .
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+    @prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+    @prefix : <http://example-ontology.org/> .
+
+    <http://example-ontology.org>
+        a owl:Ontology ;
+        dcterms:title "Basic Ontology" .
+
+    :testprop
+        a owl:ObjectProperty ;
+        rdfs:label "Test Property" ;
+        rdfs:domain skos:Concept ;
+        rdfs:range xsd:string .
+    """
+
+
+def _linear_get_curie(od, uri):
+    # the original linear scan implementation of _get_curie()
+    n = od._get_namespace_from_uri(str(uri))
+    for k, v in od.NAMESPACES.items():
+        if v == n or v.strip("/#") == n:
+            if k == ":":
+                return "{}".format(od._get_uri_id(uri))
+            else:
+                return "{}:{}".format(k, od._get_uri_id(uri))
+    return uri
+
+
+def test_get_curie():
+    od = OntDoc(MakeDocco(data=o2).G, None)
+    od._expand_graph()
+    od._extract_namespaces()
+    od._get_default_namespace()
+
+    assert od._get_curie("http://www.w3.org/2002/07/owl#Class") == "owl:Class"
+    assert od._get_curie("http://not-a-namespace.com/x/y") == "http://not-a-namespace.com/x/y"
+
+    for uri in [
+        "http://www.w3.org/2004/02/skos/core#Concept",
+        "http://www.w3.org/2001/XMLSchema#string",
+        "http://purl.org/dc/terms/title",
+        "http://example-ontology.org/testprop",
+        "http://example-ontology.org/other/thing",
+        "urn:x",
+    ]:
+        assert od._get_curie(uri) == _linear_get_curie(od, uri)
+        # memoised result is the same
+        assert od._get_curie(uri) == _linear_get_curie(od, uri)
+
+
+def test_filter_graph_by_language():
+    g = Graph()
+    s = URIRef("http://example.org/x")
+    g.add((s, RDFS.label, Literal("cat", lang="en")))
+    g.add((s, RDFS.label, Literal("chat", lang="fr")))
+    g.add((s, RDFS.comment, Literal("untagged")))
+    n = len(g)
+
+    bp = BaseProfile(g, None)
+    assert set(bp.G.objects(s, RDFS.label)) == {Literal("cat", lang="en")}
+    assert len(bp.G) == 2
+
+    # changes to the view don't reach the input graph
+    bp.G.add((s, RDFS.seeAlso, URIRef("http://example.org/y")))
+    bp.G.remove((s, RDFS.comment, None))
+    assert len(bp.G) == 2
+    assert (s, RDFS.comment, Literal("untagged")) not in bp.G
+    assert len(g) == n
+    assert (s, RDFS.comment, Literal("untagged")) in g
+
+    assert has_other_languages(g, "en")
+    assert not has_other_languages(bp.G, "en")
+
+
+def test_shared_language_view():
+    g = Graph()
+    s = URIRef("http://example.org/x")
+    g.add((s, RDFS.label, Literal("cat", lang="en")))
+    g.add((s, RDFS.label, Literal("chat", lang="fr")))
+
+    # a language view is read-only, so may be shared, & isn't remade from itself
+    v = language_view(g, "en")
+    assert language_view(v, "en") is v
+    with pytest.raises(ModificationException):
+        v.add((s, RDFS.seeAlso, s))
+
+    # each profile changes its own overlay on it
+    bp1 = BaseProfile(v, None)
+    bp2 = BaseProfile(v, None)
+    bp1.G.remove((s, RDFS.label, None))
+    bp1.G.add((s, RDFS.comment, Literal("a cat")))
+    assert (s, RDFS.label, Literal("cat", lang="en")) not in bp1.G
+    assert set(bp2.G.objects(s, RDFS.label)) == {Literal("cat", lang="en")}
+    assert (s, RDFS.comment, None) not in bp2.G
+    assert len(v) == 1 and len(g) == 2
+
+    # MakeDocco makes one view per language for all its profiles
+    m = MakeDocco(data=g)
+    assert m._language_view("en") is m._language_view("en")
+
+
 if __name__ == '__main__':
     test_ontdoc_extract_namespaces()
+    test_get_curie()
+    test_filter_graph_by_language()
+    test_shared_language_view()
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+from pylode.batch import make_jobs, load_manifest, run_batch, output_file_name
+from pylode.common import MakeDocco
+
+examples_dir = Path(__file__).parent.parent / "pylode" / "examples"
+
+
+def test_output_file_name():
+    assert output_file_name("x/agrif.ttl", "ontdoc", "html") == "x/agrif.html"
+    assert output_file_name("x/agrif.ttl", "vocpub", "md", output_dir="y") == "y/agrif.vocpub.md"
+
+
+def test_load_manifest(tmp_path):
+    (tmp_path / "a.ttl").write_text("")
+    (tmp_path / "b.ttl").write_text("")
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([{"input": "*.ttl", "profiles": ["ontdoc", "vocpub"], "formats": ["md"]}]))
+
+    jobs = load_manifest(str(manifest))
+    assert [Path(j["input"]).name for j in jobs] == ["a.ttl", "b.ttl"]
+    assert jobs[0]["profiles"] == ["ontdoc", "vocpub"]
+    assert jobs[0]["formats"] == ["md"]
+
+
+def test_run_batch(tmp_path):
+    jobs = make_jobs(
+        [str(examples_dir / "decprov.ttl"), str(tmp_path / "missing.ttl")],
+        profiles=["ontdoc"],
+        formats=["html", "md"]
+    )
+    progress = []
+    results = run_batch(jobs, workers=2, output_dir=str(tmp_path), progress=progress.append)
+
+    assert len(results) == 2
+    assert len(progress) == 2
+    ok = [r for r in results if r["error"] is None]
+    failed = [r for r in results if r["error"] is not None]
+    assert len(ok) == 1 and len(failed) == 1
+    assert sorted(Path(o).name for o in ok[0]["outputs"]) == ["decprov.html", "decprov.md"]
+    assert (tmp_path / "decprov.md").read_text(encoding="utf-8") == \
+        MakeDocco(input_data_file=str(examples_dir / "decprov.ttl"), outputformat="md").document()
+
+
+def test_run_batch_same_names(tmp_path):
+    # documents of inputs of the same name, written to one directory, don't overwrite one another
+    for d in ("a", "b"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "onto.ttl").write_text((examples_dir / "decprov.ttl").read_text(encoding="utf-8"))
+    out = tmp_path / "out"
+    jobs = make_jobs([str(tmp_path / "a" / "onto.ttl"), str(tmp_path / "b" / "onto.ttl")], formats=["md"])
+    results = run_batch(jobs, workers=2, output_dir=str(out), progress=None)
+
+    assert all(r["error"] is None for r in results)
+    assert sorted(o for r in results for o in r["outputs"]) == [str(out / "onto-2.md"), str(out / "onto.md")]
+    assert sorted(p.name for p in out.iterdir()) == ["onto-2.md", "onto.md"]
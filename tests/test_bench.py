@@ -0,0 +1,56 @@
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from rdflib.namespace import OWL, PROF, RDF, RDFS, SKOS
+from pylode.bench.synth import make_ontology, make_vocabulary, make_profile
+from pylode.bench.suite import PHASES, synth_cases, example_cases, run_case, compare
+
+
+def test_synth_cases():
+    # synthetic ontologies are reproducible
+    assert isomorphic(make_ontology(50), make_ontology(50))
+
+    cases = synth_cases(sizes=[50], profiles=["ontdoc", "vocpub"], formats=["html"])
+    assert [c.id for c in cases] == ["synth-ontology-50:ontdoc:html", "synth-vocabulary-50:vocpub:html"]
+    assert len(Graph().parse(data=cases[0].data, format=cases[0].rdf_format)) > 0
+
+
+def test_synth_counts():
+    g = make_ontology(
+        classes=30, properties=8, restrictions=12, collections=4, individuals=5, languages=["en", "de"], namespaces=3
+    )
+    assert len(set(g.subjects(RDF.type, OWL.Class))) == 30
+    assert len(set(g.subjects(RDF.type, OWL.Restriction))) == 12
+    assert len(set(g.subjects(RDF.type, OWL.NamedIndividual))) == 5
+    assert len(list(g.subject_objects(OWL.unionOf))) == len(list(g.subject_objects(OWL.intersectionOf))) == 2
+    for t in [OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, OWL.FunctionalProperty]:
+        assert len(set(g.subjects(RDF.type, t))) >= 2
+    assert {o.language for o in g.objects(None, RDFS.label)} == {"en", "de"}
+    assert len({str(c).rsplit("/", 1)[0] for c in g.subjects(RDF.type, OWL.Class)}) == 3
+
+    g = make_vocabulary(concepts=40, collections=3, top_concepts=4)
+    assert len(set(g.subjects(RDF.type, SKOS.Concept))) == 40
+    assert len(set(g.subjects(RDF.type, SKOS.Collection))) == 3
+    assert len(set(g.objects(None, SKOS.hasTopConcept))) == 4
+
+    g = make_profile(resources=7)
+    assert len(set(g.subjects(RDF.type, PROF.Profile))) == 1
+    assert len(set(g.objects(None, PROF.hasResource))) == 7
+
+
+def test_example_cases():
+    ids = [c.id for c in example_cases(names=["decprov.ttl", "ga-skos.ttl"], formats=["md"])]
+    assert ids == ["decprov.ttl:ontdoc:md", "decprov.ttl:nmpf:md", "ga-skos.ttl:prof:md"]
+
+
+def test_run_case_and_compare():
+    case = synth_cases(sizes=[50], profiles=["ontdoc"], formats=["md"])[0]
+    result = run_case(case, repeat=1)
+    assert set(result["phases"].keys()) == set(PHASES)
+    assert all(v["time"] > 0 and v["peak"] > 0 for v in result["phases"].values())
+
+    baseline = {"results": {case.id: result}}
+    assert compare(baseline, baseline) == []
+
+    slower = {"phases": dict(result["phases"], render={"time": 100.0, "peak": result["phases"]["render"]["peak"]})}
+    assert compare(baseline, {"results": {case.id: slower}}, min_time=0) == \
+        [(case.id, "render", "time", result["phases"]["render"]["time"], 100.0)]
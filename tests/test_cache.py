@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.collection import Collection
+from pylode.common import MakeDocco
+from pylode.cache import DocumentCache, graph_hash
+
+examples_dir = Path(__file__).parent.parent / "pylode" / "examples"
+
+d1 = """
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix : <http://example-ontology.org/> .
+
+    :A a owl:Class ;
+        rdfs:subClassOf [ a owl:Restriction ; owl:onProperty :p ; owl:someValuesFrom :B ] .
+    """
+
+
+def test_graph_hash():
+    # Blank Node IDs differ between parses but the hash doesn't
+    assert graph_hash(Graph().parse(data=d1, format="turtle")) == graph_hash(Graph().parse(data=d1, format="turtle"))
+    assert graph_hash(Graph().parse(data=d1, format="turtle")) != \
+        graph_hash(Graph().parse(data=d1.replace(":B", ":C"), format="turtle"))
+
+    # cyclic Blank Nodes
+    d2 = "@prefix : <http://example.org/> . _:a :p _:b . _:b :p _:a ."
+    assert graph_hash(Graph().parse(data=d2, format="turtle")) == graph_hash(Graph().parse(data=d2, format="turtle"))
+
+
+def test_graph_hash_unreachable_bnodes():
+    # Blank Nodes only in a cycle with each other aren't reached from any other term, but are still hashed
+    g = Graph().parse(data=d1, format="turtle")
+    h = graph_hash(g)
+    g.parse(data="""
+        @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+        _:x rdfs:seeAlso _:y . _:y rdfs:seeAlso _:x . _:x rdfs:label "hidden" .
+        """, format="turtle")
+    assert graph_hash(g) != h
+
+
+def test_graph_hash_long_list():
+    # a Blank Node per member, more deeply nested than Python's recursion limit
+    def make():
+        g = Graph()
+        head = BNode()
+        Collection(g, head, [Literal(i) for i in range(2000)])
+        g.add((URIRef("http://example.org/x"), URIRef("http://example.org/p"), head))
+        return g
+
+    assert graph_hash(make()) == graph_hash(make())
+    g = make()
+    g.add((URIRef("http://example.org/x"), URIRef("http://example.org/p"), Literal("another")))
+    assert graph_hash(g) != graph_hash(make())
+
+
+def test_document_cache(tmp_path):
+    doc = MakeDocco(input_data_file=str(examples_dir / "decprov.ttl"), cache_dir=str(tmp_path)).document()
+    assert DocumentCache(str(tmp_path)).stats()["entries"] == 1
+
+    # a hit
+    assert MakeDocco(input_data_file=str(examples_dir / "decprov.ttl"), cache_dir=str(tmp_path)).document() == doc
+    assert DocumentCache(str(tmp_path)).stats()["entries"] == 1
+
+    # other options are another entry
+    MakeDocco(input_data_file=str(examples_dir / "decprov.ttl"), cache_dir=str(tmp_path), outputformat="md").document()
+    assert DocumentCache(str(tmp_path)).stats()["entries"] == 2
+
+    assert DocumentCache(str(tmp_path)).clear() == 2
+    assert DocumentCache(str(tmp_path)).stats()["entries"] == 0
+
+
+def test_document_cache_eviction(tmp_path):
+    cache = DocumentCache(str(tmp_path), max_size=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    # make "a" the least recently used
+    os.utime(os.path.join(str(tmp_path), "a.doc"), (0, 0))
+    assert cache.get("b") is not None
+
+    cache.put("c", "x" * 10)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["size"] == 20
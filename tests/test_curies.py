@@ -0,0 +1,28 @@
+from pylode.curies import CURIES, PREFIXES
+
+
+def test_prefix_lookup_matches_first_listed_curie():
+    # acco & accom share a namespace, the first listed wins, as per a linear scan of CURIES
+    assert PREFIXES.prefix_for("http://purl.org/acco/ns#") == "acco"
+    assert PREFIXES.prefix_for("http://schemas.talis.com/2005/address/schema#") == "ad"
+    assert PREFIXES.prefix_for("http://example.com/not-a-known-namespace/") is None
+
+    for k, v in list(CURIES.items())[:50]:
+        assert PREFIXES.prefix_for(v) == list(CURIES.keys())[list(CURIES.values()).index(v)]
+
+
+def test_normalised_prefix_lookup():
+    assert PREFIXES.prefix_for("http://purl.org/acco/ns") is None
+    assert PREFIXES.prefix_for("http://purl.org/acco/ns", normalised=True) == "acco"
+    assert PREFIXES.prefix_for("http://purl.org/acco/ns/", normalised=True) == "acco"
+
+
+def test_namespace_lookup():
+    assert PREFIXES.namespace_for("aat") == "http://vocab.getty.edu/aat/"
+    assert PREFIXES.namespace_for("not-a-known-prefix") is None
+
+
+if __name__ == "__main__":
+    test_prefix_lookup_matches_first_listed_curie()
+    test_normalised_prefix_lookup()
+    test_namespace_lookup()
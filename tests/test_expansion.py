@@ -0,0 +1,69 @@
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import DC, DCTERMS, OWL, RDF, RDFS, SDO, SKOS
+from pylode.expansion import AGENT_RULES, Copy, InferType, Inverse, ObjectType, SubjectType, expand
+
+EX = "http://example.org/"
+a, b, c = URIRef(EX + "a"), URIRef(EX + "b"), URIRef(EX + "c")
+
+
+def test_copy_move_and_types():
+    g = Graph()
+    g.add((a, RDFS.label, Literal("A")))
+    g.add((a, RDF.type, OWL.Class))
+    g.add((a, SDO.creator, b))
+    r = BNode()
+    g.add((r, OWL.onProperty, c))
+    g.add((c, SDO.isPartOf, a))
+
+    stats = expand(g, [
+        Copy("name", [RDFS.label], DCTERMS.title),
+        InferType("class types", [OWL.Class], RDFS.Class),
+        SubjectType("restrictions", OWL.onProperty, OWL.Restriction),
+        ObjectType("wholes", SDO.isPartOf, SDO.CreativeWork),
+    ] + AGENT_RULES)
+
+    assert (a, DCTERMS.title, Literal("A")) in g
+    assert (a, RDFS.label, Literal("A")) in g
+    assert (a, RDF.type, RDFS.Class) in g
+    assert (r, RDF.type, OWL.Restriction) in g
+    assert (a, RDF.type, SDO.CreativeWork) in g
+    # Moves remove the source triple
+    assert (a, DCTERMS.creator, b) in g
+    assert (a, SDO.creator, b) not in g
+
+    assert stats["name"] == 1
+    assert stats["creator"] == 1
+    assert stats["contributor"] == 0
+
+
+def test_chaining():
+    # rules match the triples other rules make, in any order, but each triple only once
+    g = Graph()
+    g.add((a, RDFS.subClassOf, b))
+    g.add((b, SKOS.narrower, c))
+    g.add((a, RDFS.subClassOf, BNode()))
+
+    stats = expand(g, [
+        Inverse("narrower", [SKOS.broader], SKOS.narrower),
+        Inverse("broader", [SKOS.narrower], SKOS.broader),
+        Copy("broader classes", [RDFS.subClassOf], SKOS.broader, uri_objects_only=True),
+    ])
+
+    assert set(g.subject_objects(SKOS.broader)) == {(a, b), (c, b)}
+    assert set(g.subject_objects(SKOS.narrower)) == {(b, a), (b, c)}
+    assert stats == {"narrower": 2, "broader": 2, "broader classes": 2}
+
+
+def test_removed_not_added():
+    # a triple one rule makes and another removes isn't added
+    g = Graph()
+    g.add((a, DC.title, Literal("A")))
+
+    expand(g, [
+        Copy("name", [DC.title], DC.creator),
+        AGENT_RULES[0],
+    ])
+
+    assert (a, DC.creator, Literal("A")) not in g
+    assert (a, DCTERMS.creator, Literal("A")) in g
+    assert len(g) == 2
@@ -0,0 +1,33 @@
+from pylode.fids import FidAllocator
+
+
+def test_allocate():
+    a = FidAllocator()
+    assert a.allocate("Person Type", "http://example.org/def/PersonType") == "PersonType"
+    # same URI, same ID
+    assert a.allocate("Something Else", "http://example.org/def/PersonType") == "PersonType"
+    # the title's ID is in use so the URI's is used
+    assert a.allocate("Person Type", "http://example.org/other/Person") == "Person"
+    # both are in use so the URI's is numbered, skipping numbers in use
+    a.allocate("Thing2", "http://example.org/def/x")
+    assert a.allocate("Person Type", "http://example.org/a/Thing") == "Thing"
+    assert a.allocate("Person Type", "http://example.org/b/Thing") == "Thing1"
+    assert a.allocate("Person Type", "http://example.org/c/Thing") == "Thing3"
+    assert a.allocate("Person Type", "http://example.org/d/Thing") == "Thing4"
+    # no ID can be made from a URI without a path, but one can from a title
+    assert a.allocate("Person", "http://example.org/") is None
+    assert a.allocate("Dé Ja", "http://example.org") == "DJa"
+
+    assert len(set(a.fids.values())) == len(a.fids)
+
+
+def test_allocate_all():
+    entities = [("Concept", "http://example.org/voc/{}/concept".format(i)) for i in range(1000)]
+    fids = FidAllocator().allocate_all(entities)
+    assert list(fids.values())[:3] == ["Concept", "concept", "concept1"]
+    assert len(set(fids.values())) == 1000
+
+    # existing IDs, e.g. from a cached model, are kept in use
+    a = FidAllocator({"http://example.org/def/A": "A"})
+    assert a.allocate_all([("A", "http://example.org/x/A"), ("B", "http://example.org/x/B")]) == \
+        {"http://example.org/x/A": "A1", "http://example.org/x/B": "B"}
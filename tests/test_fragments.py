@@ -0,0 +1,45 @@
+from pylode.common import MakeDocco
+from pylode.fragments import canonical
+
+o1 = """
+    @prefix dcterms: <http://purl.org/dc/terms/> .
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix : <http://example-ontology.org/> .
+
+    <http://example-ontology.org> a owl:Ontology ; dcterms:title "Fragments Ontology" .
+
+    :A a owl:Class ; rdfs:label "A" .
+    :B a owl:Class ; rdfs:label "B" ; rdfs:subClassOf :A .
+    :C a owl:Class ; rdfs:label "C" .
+    :D a owl:Class ; rdfs:label "D" ; rdfs:comment "Not linked to A" .
+    :p a owl:ObjectProperty ; rdfs:label "p" ; rdfs:domain :C ; rdfs:range :D .
+    """
+
+
+def test_canonical():
+    # lists are compared as sets, except an RDF collection's (type, [members])
+    assert canonical({"subs": ["a", "b"]}) == canonical({"subs": ["b", "a"]})
+    assert canonical(("owl:unionOf", ["a", "b"])) != canonical(("owl:unionOf", ["b", "a"]))
+
+
+def test_incremental(tmp_path):
+    def document(data, fmt="html"):
+        m = MakeDocco(data=data, outputformat=fmt, fragments_dir=str(tmp_path))
+        return m.document(), m.fragment_stats
+
+    doc, stats = document(o1)
+    assert stats == {"rendered": 5, "reused": 0}
+
+    # nothing has changed
+    assert document(o1) == (doc, {"rendered": 0, "reused": 5})
+
+    # renaming A re-renders A and B, which links to it, only
+    o2 = o1.replace(':A a owl:Class ; rdfs:label "A"', ':A a owl:Class ; rdfs:label "Renamed"')
+    doc2, stats = document(o2)
+    assert stats == {"rendered": 2, "reused": 3}
+    assert doc2 == MakeDocco(data=o2).document()
+
+    # other formats have their own fragments
+    assert document(o2, "md")[1] == {"rendered": 5, "reused": 0}
+    assert document(o2)[1] == {"rendered": 0, "reused": 5}
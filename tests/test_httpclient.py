@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+import requests
+import urllib3
+from pylode.httpclient import HttpClient, AsyncHttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    client_ports = set()
+    failures = 0
+    lock = threading.Lock()
+    in_flight = 0  # /slow requests being handled now
+    max_in_flight = 0  # the most /slow requests handled at once
+
+    def do_GET(self):
+        Handler.client_ports.add(self.client_address[1])
+        if self.path == "/flaky" and Handler.failures > 0:
+            Handler.failures -= 1
+            status, body = 503, b"busy"
+        elif self.path == "/slow":
+            with Handler.lock:
+                Handler.in_flight += 1
+                Handler.max_in_flight = max(Handler.max_in_flight, Handler.in_flight)
+            time.sleep(0.5)
+            with Handler.lock:
+                Handler.in_flight -= 1
+            status, body = 200, b"slow"
+        else:
+            status, body = 200, self.path.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    s = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=s.serve_forever, daemon=True).start()
+    Handler.client_ports = set()
+    Handler.in_flight = Handler.max_in_flight = 0
+    yield "http://127.0.0.1:{}".format(s.server_address[1])
+    s.shutdown()
+
+
+def test_connection_reuse(server):
+    client = HttpClient()
+    for i in range(5):
+        assert client.get(server + "/{}".format(i)).text == "/{}".format(i)
+    assert len(Handler.client_ports) == 1
+    client.close()
+
+
+def test_retries(server):
+    Handler.failures = 2
+    assert HttpClient(retries=2, backoff_factor=0).get(server + "/flaky").status_code == 200
+
+    Handler.failures = 2
+    assert HttpClient(retries=1, backoff_factor=0).get(server + "/flaky").status_code == 503
+
+
+def test_timeout(server):
+    # the response takes 0.5 s so the request times out rather than waiting for it. With retries configured, requests
+    # reports the timeout as the reason the retries ran out
+    with pytest.raises(requests.exceptions.RequestException) as e:
+        HttpClient(timeout=0.1, retries=0).get(server + "/slow")
+    assert isinstance(e.value.args[0].reason, urllib3.exceptions.ReadTimeoutError)
+
+
+def test_async_get_many(server):
+    client = AsyncHttpClient(HttpClient(max_connections=4))
+    responses = asyncio.run(client.get_many([server + "/slow"] * 4))
+    # fetched concurrently, not one after another: each takes 0.5 s, so they overlap at the server
+    assert Handler.max_in_flight > 1
+    assert [r.text for r in responses] == ["slow"] * 4
+    client.close()
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from os import path
+
+TESTS_DIR = path.dirname(path.abspath(__file__))
+HEAVY_MODULES = ["rdflib", "jinja2", "markdown", "natsort", "requests", "pylode.curies", "pylode.profiles.ontdoc"]
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=TESTS_DIR,
+        env=dict(os.environ, PYTHONPATH=path.dirname(TESTS_DIR)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_cli_imports_lazily():
+    # the CLI, e.g. for -v & -lp, imports none of the heavy modules, which are only needed to make documents
+    r = _run("import sys, pylode.cli; print(' '.join(sys.modules))")
+    loaded = r.stdout.split()
+    assert [m for m in HEAVY_MODULES if m in loaded] == []
+
+
+def test_lazy_names():
+    import pylode
+    import pylode.profiles
+    from pylode.profiles.ontdoc import OntDoc
+    from pylode.common import MakeDocco
+
+    assert pylode.OntDoc is pylode.profiles.OntDoc is OntDoc
+    assert pylode.MakeDocco is MakeDocco
+    assert "MakeDocco" in dir(pylode)
+    assert "ontdoc" in pylode.PROFILES
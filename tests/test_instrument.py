@@ -0,0 +1,40 @@
+from pylode.common import MakeDocco
+from pylode.instrument import Instrument
+
+o1 = """
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix : <http://example-ontology.org/> .
+
+    <http://example-ontology.org> a owl:Ontology ; rdfs:label "Instrumented Ontology" .
+    :A a owl:Class ; rdfs:label "A" .
+    :B a owl:Class ; rdfs:label "B" ; rdfs:subClassOf :A .
+    """
+
+
+def test_instrument():
+    m = MakeDocco(data=o1, instrument=True)
+    doc = m.document()
+    report = m.instrument.report()
+
+    assert list(report.keys())[:6] == [
+        "parse", "init_profile", "expand_graph", "extract_namespaces", "get_default_namespace", "extract_model"
+    ]
+    assert report["render"]["calls"] == 1
+    assert report["render"]["templates"] > 0
+    assert report["extract_classes"]["lookups"] > 0
+    assert all(v["peak"] is not None for v in report.values())
+    # nested phases are included in those that contain them
+    assert report["extract_model"]["lookups"] >= report["extract_classes"]["lookups"]
+    assert report["extract_model"]["peak"] >= report["extract_classes"]["peak"]
+
+    # instrumenting doesn't change the document
+    assert doc == MakeDocco(data=o1).document()
+
+
+def test_instrument_without_memory():
+    m = MakeDocco(data=o1, instrument=Instrument(memory=False), outputformat="md")
+    m.document_many(formats=["html", "md"])
+    report = m.instrument.report()
+    assert report["render"]["calls"] == 2
+    assert all(v["peak"] is None for v in report.values())
@@ -1,5 +1,7 @@
+import io
 from pylode.common import MakeDocco
 from pylode.profiles import OntDoc
+from rdflib import Graph, URIRef, RDFS
 
 o1 = """
     @prefix dcterms: <http://purl.org/dc/terms/> .
@@ -40,5 +42,93 @@ def test_ontdoc_expand_graph():
     assert len(od.G) == 9, "Error loading ontology after expansion. Should have 9 triples, got {}".format(len(od.G))
 
 
+def test_ontdoc_link_index():
+    od = OntDoc(MakeDocco(data=o1).G, ("input.ttl", "turtle"))
+    od.generate_document()
+
+    assert od.LINK_INDEX["http://example-ontology.org/testprop"] == ("Test Property", "TestProperty", "op")
+    assert od._get_prop_type("http://example-ontology.org/testprop") == "op"
+    assert od._build_link("http://example-ontology.org/testprop") == \
+        '<a href=#TestProperty>Test Property</a>'
+    assert od._make_fragment_uri("http://example-ontology.org/testprop") == \
+        '<a href="#TestProperty">Test Property</a>'
+
+
+o2 = """
+    @prefix owl: <http://www.w3.org/2002/07/owl#> .
+    @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+    @prefix : <http://example-ontology.org/> .
+
+    <http://example-ontology.org/> a owl:Ontology ; rdfs:label "Collections Ontology" .
+
+    :A a owl:Class . :B a owl:Class . :C a owl:Class .
+
+    :p a owl:ObjectProperty ;
+        rdfs:domain [ owl:unionOf ( :A :B :C ) ] ;
+        rdfs:range [ owl:intersectionOf ( :B :C ) ] .
+    """
+
+
+def test_ontdoc_collections():
+    od = OntDoc(MakeDocco(data=o2).G, ("input.ttl", "turtle"))
+    od._expand_graph()
+    od._extract_namespaces()
+    od._get_default_namespace()
+
+    domain = od.G.value(subject=URIRef("http://example-ontology.org/p"), predicate=RDFS.domain)
+    col_type, members = od._get_collection(domain)
+    assert col_type == "owl:unionOf"
+    assert members == ["http://example-ontology.org/A", "http://example-ontology.org/B", "http://example-ontology.org/C"]
+
+    range_ = od.G.value(subject=URIRef("http://example-ontology.org/p"), predicate=RDFS.range)
+    assert od._get_collection(range_, curie_members=True) == ("owl:intersectionOf", ["B", "C"])
+
+    assert od._get_collection(URIRef("http://example-ontology.org/A")) == (None, [])
+
+
+def test_document_many():
+    m = MakeDocco(data=o1)
+    docs = m.document_many(formats=["html", "md", "adoc"], profiles=["ontdoc", "nmpf"])
+    assert set(docs.keys()) == {(p, f) for p in ["ontdoc", "nmpf"] for f in ["html", "md", "adoc"]}
+    for f in ["html", "md", "adoc"]:
+        assert docs[("ontdoc", f)] == MakeDocco(data=o1, outputformat=f).document()
+
+    # the parsed graph is not changed by documenting it
+    assert len(m.G) == 7
+
+
+def test_ontdoc_model():
+    od = OntDoc(MakeDocco(data=o1).G, ("input.ttl", "turtle"), outputformat="html")
+    model = od.get_model()
+    assert model["PROPERTIES"]["http://example-ontology.org/testprop"]["title"] == "Test Property"
+    # the model is format-neutral: ranges are raw URIs, not links
+    assert model["PROPERTIES"]["http://example-ontology.org/testprop"]["ranges"] == \
+        [URIRef("http://www.w3.org/2001/XMLSchema#string")]
+
+    # a model from one profile instance renders another format without the RDF
+    od2 = OntDoc(Graph(), ("input.ttl", "turtle"), outputformat="md")
+    od2.set_model(model)
+    assert od2.generate_document() == MakeDocco(data=o1, outputformat="md").document()
+
+
+def test_ontdoc_stream():
+    expected = MakeDocco(data=o1).document()
+
+    # the document is generated in pieces, section by section
+    pieces = list(MakeDocco(data=o1).stream())
+    assert len(pieces) > 1
+    assert "".join(pieces) == expected
+
+    # and streamed to a file-like destination
+    out = io.StringIO()
+    MakeDocco(data=o1).document(destination=out)
+    assert out.getvalue() == expected
+
+
 if __name__ == '__main__':
     test_ontdoc_expand_graph()
+    test_ontdoc_link_index()
+    test_ontdoc_collections()
+    test_document_many()
+    test_ontdoc_model()
+    test_ontdoc_stream()
@@ -0,0 +1,88 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import pytest
+from rdflib import Graph
+import pylode.prefixlookup
+from pylode.prefixlookup import PrefixCache, lookup_prefixes
+from pylode.profiles import OntDoc
+
+KNOWN = {"http://example.org/known#": "known"}
+
+
+class PrefixHandler(BaseHTTPRequestHandler):
+    """A stand-in for prefix.cc's reverse lookup"""
+    protocol_version = "HTTP/1.1"
+    lookups = []
+
+    def do_GET(self):
+        ns = parse_qs(urlparse(self.path).query)["uri"][0]
+        PrefixHandler.lookups.append(ns)
+        time.sleep(0.2)
+        if ns in KNOWN:
+            status, body = 200, "{}\t{}".format(KNOWN[ns], ns).encode()
+        else:
+            status, body = 404, b"not found"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def lookup_url():
+    s = ThreadingHTTPServer(("127.0.0.1", 0), PrefixHandler)
+    threading.Thread(target=s.serve_forever, daemon=True).start()
+    PrefixHandler.lookups = []
+    yield "http://127.0.0.1:{}/reverse".format(s.server_address[1])
+    s.shutdown()
+
+
+def test_lookup_prefixes(lookup_url, tmp_path):
+    namespaces = ["http://example.org/known#"] + ["http://example.org/unknown{}/".format(i) for i in range(5)]
+    cache = PrefixCache(str(tmp_path / "prefixes.json"))
+
+    start = time.perf_counter()
+    prefixes = lookup_prefixes(namespaces + namespaces, lookup_url=lookup_url, cache=cache)
+    # concurrent & de-duplicated
+    assert time.perf_counter() - start < 1.0
+    assert sorted(PrefixHandler.lookups) == sorted(namespaces)
+    assert prefixes["http://example.org/known#"] == "known"
+    assert prefixes["http://example.org/unknown0/"] is None
+
+    # the results, including namespaces without prefixes, are remembered in the file
+    PrefixHandler.lookups = []
+    prefixes = lookup_prefixes(namespaces, lookup_url=lookup_url, cache=PrefixCache(str(tmp_path / "prefixes.json")))
+    assert PrefixHandler.lookups == []
+    assert prefixes["http://example.org/known#"] == "known"
+
+    # namespaces without prefixes are looked up again after their TTL
+    expired = PrefixCache(str(tmp_path / "prefixes.json"), not_found_ttl=0)
+    time.sleep(0.01)
+    lookup_prefixes(namespaces, lookup_url=lookup_url, cache=expired)
+    assert sorted(PrefixHandler.lookups) == sorted(namespaces[1:])
+
+
+def test_lookup_unreachable(tmp_path):
+    cache = PrefixCache(str(tmp_path / "prefixes.json"))
+    assert lookup_prefixes(["http://example.org/x#"], lookup_url="http://127.0.0.1:9/reverse", cache=cache) == {}
+    # failures aren't remembered
+    assert cache.get("http://example.org/x#") == (False, None)
+
+
+def test_extract_namespaces_online(lookup_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(pylode.prefixlookup, "DEFAULT_LOOKUP_URL", lookup_url)
+    monkeypatch.setattr(pylode.prefixlookup, "DEFAULT_CACHE_FILE", str(tmp_path / "prefixes.json"))
+    g = Graph().parse(data="""
+        <http://example.org/known#a> <http://example.org/unknown/p> <http://example.org/known#b> .
+        """, format="turtle")
+    od = OntDoc(g, ("input.ttl", "turtle"), get_curies_online=True)
+    od._extract_namespaces()
+
+    assert od.NAMESPACES["known"] == "http://example.org/known#"
+    assert od.NAMESPACES["unknown"] == "http://example.org/unknown/"
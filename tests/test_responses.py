@@ -0,0 +1,73 @@
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from pylode.common import MakeDocco, get_rdf
+from pylode.responses import ResponseCache, make_entry, etag_matches, not_modified_since
+from pylode.workers import document_uri
+
+examples_dir = Path(__file__).parent.parent / "pylode" / "examples"
+
+
+class RdfHandler(BaseHTTPRequestHandler):
+    etag = '"v1"'
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = (examples_dir / "decprov.ttl").read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/turtle")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_conditional_get():
+    server = HTTPServer(("127.0.0.1", 0), RdfHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}/decprov.ttl".format(server.server_address[1])
+    try:
+        data, fmt, etag, _ = get_rdf(url)
+        assert fmt == "turtle" and etag == '"v1"'
+        assert get_rdf(url, etag=etag) is None
+
+        doc, etag, _ = document_uri(url)
+        assert doc == MakeDocco(input_uri=url).document()
+        assert document_uri(url, etag=etag) is None
+    finally:
+        server.shutdown()
+
+
+def test_etag_matches():
+    entry = make_entry("<html></html>")
+    assert etag_matches(entry["etag"], entry["etag"])
+    assert etag_matches('"x", W/' + entry["etag"], entry["etag"])
+    assert etag_matches("*", entry["etag"])
+    assert not etag_matches('"x"', entry["etag"])
+    assert not etag_matches(None, entry["etag"])
+
+    assert not_modified_since(entry["last_modified"], entry["last_modified"])
+    assert not not_modified_since("Thu, 01 Jan 1970 00:00:00 GMT", entry["last_modified"])
+    assert not not_modified_since("yesterday", entry["last_modified"])
+
+
+def test_response_cache(tmp_path):
+    cache = ResponseCache(max_entries=2, cache_dir=str(tmp_path))
+    keys = [ResponseCache.make_key("http://example.org/{}".format(i), "ontdoc", "html") for i in range(3)]
+    for i, k in enumerate(keys):
+        cache.put(k, make_entry("doc {}".format(i)))
+
+    # the least recently used entry has left memory but is still on disk
+    assert keys[0] not in cache._entries
+    assert cache.get(keys[0])["body"] == "doc 0"
+
+    # a new server process, with an empty memory tier
+    assert ResponseCache(cache_dir=str(tmp_path)).get(keys[2])["body"] == "doc 2"
+    assert ResponseCache().get(keys[2]) is None
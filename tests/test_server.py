@@ -0,0 +1,91 @@
+from concurrent.futures import TimeoutError
+import pytest
+import requests
+
+falcon = pytest.importorskip("falcon")
+pytest.importorskip("bs4")
+
+from falcon import testing
+from pylode import server
+from pylode.responses import ResponseCache
+from pylode.workers import PoolSaturated, document_uri
+
+URL = "http://example.org/ont.ttl"
+
+
+class StubPool:
+    """Stands in for server.POOL: returns, or raises, each of results in turn instead of documenting anything"""
+    timeout = 60
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def run(self, fn, *args, **kwargs):
+        self.calls.append((fn, args, kwargs))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "RESPONSES", ResponseCache())
+    return testing.TestClient(server.api)
+
+
+def _get(client, headers=None):
+    return client.simulate_get("/pylode", params={"url": URL, "format": "md"}, headers=headers)
+
+
+def test_document_and_not_modified(client, monkeypatch):
+    pool = StubPool(("# Doc", '"up1"', None))
+    monkeypatch.setattr(server, "POOL", pool)
+
+    r = _get(client)
+    assert r.status == falcon.HTTP_200
+    assert r.text == "# Doc"
+    assert pool.calls[0][0] is document_uri
+
+    # served from the cache, without documenting again, & not at all if the client's copy is current
+    assert _get(client, {"If-None-Match": r.headers["ETag"]}).status == falcon.HTTP_304
+    assert _get(client, {"If-Modified-Since": r.headers["Last-Modified"]}).status == falcon.HTTP_304
+    assert _get(client, {"If-None-Match": '"other"'}).text == "# Doc"
+    assert len(pool.calls) == 1
+
+
+def test_errors(client, monkeypatch):
+    monkeypatch.setattr(server, "POOL", StubPool(
+        PoolSaturated(),
+        TimeoutError(),
+        requests.ConnectionError("refused"),
+    ))
+
+    r = _get(client)
+    assert r.status == falcon.HTTP_503
+    assert r.headers["Retry-After"] == "5"
+    assert _get(client).status == falcon.HTTP_504
+    assert _get(client).status == falcon.HTTP_502
+
+
+def test_revalidation(client, monkeypatch):
+    # every cached response is revalidated upstream
+    monkeypatch.setattr(server, "MAX_AGE", -1)
+    pool = StubPool(
+        ("# Doc", '"up1"', None),
+        None,  # unchanged upstream
+        requests.ConnectionError("refused"),  # upstream down: the stale response is served
+        ("# Doc 2", '"up2"', None),
+    )
+    monkeypatch.setattr(server, "POOL", pool)
+
+    etag = _get(client).headers["ETag"]
+    assert _get(client).text == "# Doc"
+    assert pool.calls[1][2]["etag"] == '"up1"'
+    r = _get(client)
+    assert r.status == falcon.HTTP_200
+    assert r.text == "# Doc"
+    r = _get(client)
+    assert r.text == "# Doc 2"
+    assert r.headers["ETag"] != etag
@@ -0,0 +1,63 @@
+import os
+import pytest
+from pathlib import Path
+from pylode.common import MakeDocco
+from pylode import templating
+from pylode.templating import TEMPLATES, TemplateRegistry
+
+examples_dir = Path(__file__).parent.parent / "pylode" / "examples"
+
+
+def test_templates_shared_across_profiles():
+    assert TEMPLATES.get_template("class.html", "ontdoc") is TEMPLATES.get_template("class.html", "ontdoc")
+    assert TEMPLATES.get_environment("ontdoc") is not TEMPLATES.get_environment("vocpub")
+
+
+def test_compile_count_independent_of_ontology_size(monkeypatch):
+    # a registry without the on-disk bytecode cache or precompiled templates, so every template is compiled here
+    registry = TemplateRegistry(precompiled_dir=None, use_bytecode_cache=False)
+    monkeypatch.setattr(templating, "TEMPLATES", registry)
+    MakeDocco(input_data_file=str(examples_dir / "decprov.ttl")).document()
+    small_compiles = registry.compile_count
+    assert small_compiles > 0
+
+    # agrif.ttl has many more Classes & Properties than decprov.ttl but uses the same templates
+    MakeDocco(input_data_file=str(examples_dir / "agrif.ttl")).document()
+    assert registry.compile_count == small_compiles
+
+
+def test_precompiled_templates(tmp_path):
+    TemplateRegistry().precompile_templates(str(tmp_path))
+    assert (tmp_path / "ontdoc").is_dir()
+    assert (tmp_path / "_root").is_dir()
+
+    r = TemplateRegistry(precompiled_dir=str(tmp_path), use_bytecode_cache=False)
+    html = r.get_template("agent.html").render(name="Nicholas J. Car", url="http://orcid.org/0000-0002-8742-7730")
+    assert "Nicholas J. Car" in html
+    assert r.compile_count == 0
+
+
+def test_precompiled_templates_fall_back_to_source(tmp_path):
+    templates_dir = tmp_path / "templates"
+    (templates_dir / "ontdoc").mkdir(parents=True)
+    (templates_dir / "ontdoc" / "a.html").write_text("A {{ x }}")
+    TemplateRegistry(templates_dir=str(templates_dir)).precompile_templates(str(tmp_path / "compiled"))
+
+    # a template edited since it was precompiled, & one added, are compiled from source
+    (templates_dir / "ontdoc" / "a.html").write_text("A2 {{ x }}")
+    mtime = os.path.getmtime(templates_dir / "ontdoc" / "a.html") + 10
+    os.utime(templates_dir / "ontdoc" / "a.html", (mtime, mtime))
+    (templates_dir / "ontdoc" / "b.html").write_text("B {{ x }}")
+
+    r = TemplateRegistry(
+        templates_dir=str(templates_dir), precompiled_dir=str(tmp_path / "compiled"), use_bytecode_cache=False
+    )
+    assert r.get_template("a.html", "ontdoc").render(x=1) == "A2 1"
+    assert r.get_template("b.html", "ontdoc").render(x=1) == "B 1"
+    assert r.compile_count == 2
+
+
+if __name__ == "__main__":
+    test_templates_shared_across_profiles()
+    with pytest.MonkeyPatch.context() as mp:
+        test_compile_count_independent_of_ontology_size(mp)
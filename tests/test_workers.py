@@ -0,0 +1,43 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+import pytest
+from pylode.workers import DocumentPool, PoolSaturated
+
+
+def test_pool_run():
+    pool = DocumentPool(workers=2, queue_size=0, processes=False)
+    assert pool.run(sum, [1, 2, 3]) == 6
+    pool.shutdown()
+
+
+def test_pool_back_pressure():
+    release = threading.Event()
+    pool = DocumentPool(workers=1, queue_size=1, processes=False)
+    futures = [pool.submit(release.wait) for _ in range(2)]  # one running, one queued
+
+    with pytest.raises(PoolSaturated):
+        pool.submit(release.wait)
+
+    release.set()
+    for f in futures:
+        f.result()
+    # places are freed as documents finish
+    assert pool.run(sum, [1]) == 1
+    pool.shutdown()
+
+
+def test_pool_timeout():
+    pool = DocumentPool(workers=1, queue_size=0, timeout=0.1, processes=False)
+    with pytest.raises(TimeoutError):
+        pool.run(time.sleep, 0.5)
+    # the timed out task still holds its worker
+    with pytest.raises(PoolSaturated):
+        pool.submit(sum, [1])
+    pool.shutdown()
+
+
+def test_pool_processes():
+    pool = DocumentPool(workers=1)
+    assert pool.run(sum, [1, 2]) == 3
+    pool.shutdown()